@@ -0,0 +1,240 @@
+"""
+虚拟滚动的文章列表，只把可见的几十行放进 Listbox，
+摘要、月份和搜索文本在文章加入时计算一次，数万篇文章时刷新、筛选和跳转仍然流畅
+"""
+import tkinter as tk
+import tkinter.font as tkfont
+from tkinter import ttk
+
+from .data_processor import article_month, plain_text_from_html, preview_text
+
+# 筛选输入停止后多久开始筛选（毫秒）
+FILTER_DELAY_MS = 200
+
+
+class VirtualArticleList(ttk.Frame):
+    """带筛选和按月跳转的文章列表
+
+    lines/months/search 与加入的文章一一对应；view 为当前显示的文章序号，
+    top 为第一行可见的文章在 view 中的位置
+    """
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.lines = []
+        self.months = []
+        self.search = []
+        self.month_counts = {}
+        self.view = []
+        self.query = ""
+        self.top = 0
+        self.rows = 1
+        self.selected = None
+        self._filter_job = None
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        tool_frame = ttk.Frame(self)
+        tool_frame.pack(fill=tk.X, pady=(0, 5))
+
+        ttk.Label(tool_frame, text="筛选:").pack(side=tk.LEFT)
+        self.filter_var = tk.StringVar()
+        self.filter_var.trace_add("write", lambda *args: self.schedule_filter())
+        filter_entry = ttk.Entry(tool_frame, textvariable=self.filter_var, width=20)
+        filter_entry.pack(side=tk.LEFT, padx=5)
+        filter_entry.bind("<Return>", lambda event: self.apply_filter())
+
+        ttk.Label(tool_frame, text="跳转到月份:").pack(side=tk.LEFT, padx=(10, 0))
+        self.month_var = tk.StringVar()
+        self.month_box = ttk.Combobox(tool_frame, textvariable=self.month_var, width=9)
+        self.month_box.pack(side=tk.LEFT, padx=5)
+        self.month_box.bind("<<ComboboxSelected>>", lambda event: self.jump_to_month())
+        self.month_box.bind("<Return>", lambda event: self.jump_to_month())
+
+        self.view_label = ttk.Label(tool_frame, text="")
+        self.view_label.pack(side=tk.RIGHT)
+
+        self.scrollbar = ttk.Scrollbar(self, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.listbox = tk.Listbox(self, exportselection=False, activestyle="none")
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.line_height = max(1, tkfont.Font(font=self.listbox.cget("font")).metrics("linespace"))
+
+        self.listbox.bind("<Configure>", self.on_resize)
+        self.listbox.bind("<<ListboxSelect>>", self.on_select)
+        # Listbox 中只有可见的行，滚动和翻页都需要自己处理
+        self.listbox.bind("<MouseWheel>", self.on_mousewheel)
+        self.listbox.bind("<Button-4>", lambda event: self.scroll(-3))
+        self.listbox.bind("<Button-5>", lambda event: self.scroll(3))
+        for key, amount, unit in (
+            ("<Up>", -1, "units"),
+            ("<Down>", 1, "units"),
+            ("<Prior>", -1, "pages"),
+            ("<Next>", 1, "pages"),
+        ):
+            self.listbox.bind(key, lambda event, a=amount, u=unit: self.scroll(a, u))
+        self.listbox.bind("<Home>", lambda event: self.scroll_to(0))
+        self.listbox.bind("<End>", lambda event: self.scroll_to(len(self.view)))
+
+    def __len__(self):
+        return len(self.lines)
+
+    # 数据
+
+    def clear(self):
+        self.set_articles([])
+
+    def set_articles(self, articles):
+        """替换全部文章"""
+        self.lines = []
+        self.months = []
+        self.search = []
+        self.month_counts = {}
+        self.view = []
+        self.top = 0
+        self.selected = None
+        self.month_box.config(values=())
+        self.append_articles(articles)
+
+    def append_articles(self, articles):
+        """在末尾加入文章，只计算新文章的摘要"""
+        start = len(self.lines)
+        shown = len(self.view)
+        new_month = False
+        month = self.months[-1] if self.months else None
+        for article in articles:
+            text = plain_text_from_html(article.get("text"))
+            time_text = article.get("time") or ""
+            month = article_month(time_text, newer_month=month)
+            self.lines.append(f"{time_text} - {preview_text(text)}")
+            self.months.append(month)
+            self.search.append(f"{time_text}\n{text}".lower())
+            if month not in self.month_counts:
+                self.month_counts[month] = 0
+                new_month = True
+            self.month_counts[month] += 1
+
+        if self.query:
+            self.view.extend(
+                index for index in range(start, len(self.lines)) if self.query in self.search[index]
+            )
+        else:
+            self.view.extend(range(start, len(self.lines)))
+
+        if new_month:
+            self.month_box.config(values=sorted(self.month_counts, reverse=True))
+        # 新行在可见范围之外时只需更新滚动条
+        if shown < self.top + self.rows:
+            self.render()
+        else:
+            self.update_scrollbar()
+
+    # 筛选与跳转
+
+    def schedule_filter(self):
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+        self._filter_job = self.after(FILTER_DELAY_MS, self.apply_filter)
+
+    def apply_filter(self):
+        """按时间或正文筛选，不区分大小写"""
+        if self._filter_job is not None:
+            self.after_cancel(self._filter_job)
+            self._filter_job = None
+
+        query = self.filter_var.get().strip().lower()
+        if query == self.query:
+            return
+        self.query = query
+
+        selected = self.view[self.selected] if self.selected is not None else None
+        if query:
+            self.view = [index for index, text in enumerate(self.search) if query in text]
+        else:
+            self.view = list(range(len(self.lines)))
+
+        self.top = 0
+        self.selected = None
+        if selected is not None:
+            # 选中的文章仍在结果中时保持选中并滚动到该文章
+            for position, index in enumerate(self.view):
+                if index == selected:
+                    self.selected = position
+                    self.top = max(0, min(position, len(self.view) - self.rows))
+                    break
+        self.render()
+
+    def jump_to_month(self):
+        """滚动到指定月份的第一篇文章，没有该月份时跳到之前最近的月份"""
+        month = self.month_var.get().strip()
+        if not month:
+            return
+        # 文章按从新到旧排列，月份字符串可以直接比较大小
+        for position, index in enumerate(self.view):
+            if self.months[index] <= month:
+                self.scroll_to(position)
+                return
+        self.scroll_to(len(self.view))
+
+    # 滚动与显示
+
+    def yview(self, *args):
+        """滚动条的回调"""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.scroll_to(int(float(args[1]) * len(self.view)))
+        elif args[0] == "scroll":
+            self.scroll(int(args[1]), args[2])
+
+    def scroll(self, amount, unit="units"):
+        step = self.rows if unit == "pages" else 1
+        self.scroll_to(self.top + amount * step)
+        return "break"
+
+    def scroll_to(self, position):
+        top = max(0, min(position, len(self.view) - self.rows))
+        if top != self.top:
+            self.top = top
+            self.render()
+        return "break"
+
+    def on_mousewheel(self, event):
+        return self.scroll(-3 if event.delta > 0 else 3)
+
+    def on_resize(self, event):
+        border = 2 * (int(self.listbox.cget("borderwidth")) + int(self.listbox.cget("highlightthickness")))
+        rows = max(1, (event.height - border) // self.line_height)
+        if rows != self.rows:
+            self.rows = rows
+            self.top = max(0, min(self.top, len(self.view) - self.rows))
+            self.render()
+
+    def on_select(self, event):
+        selection = self.listbox.curselection()
+        if selection:
+            self.selected = self.top + selection[0]
+
+    def render(self):
+        """用可见范围内的行替换 Listbox 的内容"""
+        visible = self.view[self.top:self.top + self.rows]
+        self.listbox.delete(0, tk.END)
+        if visible:
+            self.listbox.insert(tk.END, *(self.lines[index] for index in visible))
+        if self.selected is not None and self.top <= self.selected < self.top + len(visible):
+            self.listbox.selection_set(self.selected - self.top)
+        self.update_scrollbar()
+
+    def update_scrollbar(self):
+        total = len(self.view)
+        if total <= self.rows:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.top / total, min(1, (self.top + self.rows) / total))
+
+        if self.query:
+            self.view_label.config(text=f"显示 {total} / {len(self.lines)} 篇")
+        else:
+            self.view_label.config(text="")
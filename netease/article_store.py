@@ -0,0 +1,188 @@
+"""
+本地文章库模块，使用SQLite按用户保存已爬取的文章，支持增量爬取
+"""
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from .browser_manager import get_app_dir
+from .models import Article, json_default
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    completed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS articles (
+    user_id TEXT NOT NULL,
+    article_id TEXT NOT NULL,
+    time TEXT,
+    text TEXT,
+    song TEXT,
+    images TEXT,
+    run_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (user_id, article_id)
+);
+CREATE INDEX IF NOT EXISTS idx_articles_order
+    ON articles (user_id, run_id DESC, position);
+"""
+
+# 累计写入多少篇文章后提交一次事务
+COMMIT_INTERVAL = 200
+
+
+def default_store_path():
+    """默认文章库路径，与浏览器目录一样放在应用程序目录下"""
+    return get_app_dir() / "netease_backup.db"
+
+
+class ArticleStore:
+    """按用户和文章ID保存文章的本地库
+
+    每次爬取记为一次 run，文章按 (run_id 倒序, 爬取顺序) 排列，
+    增量爬取得到的新文章总排在以往文章之前；爬取中再次看到的旧文章移到本次 run 中，
+    补齐更早的文章时顺序仍然正确。爬到动态列表末尾的 run 记为完整爬取
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else default_store_path()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+        self.conn.commit()
+
+    def _migrate(self):
+        """为旧版本创建的库补上新增的列"""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(runs)")}
+        if "completed" not in columns:
+            # 旧版本的爬取无法确定是否完整，视为未完成
+            self.conn.execute(
+                "ALTER TABLE runs ADD COLUMN completed INTEGER NOT NULL DEFAULT 0"
+            )
+
+    def begin_run(self, user_id):
+        """开始一次爬取，返回 run_id"""
+        with self._lock:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (user_id, started_at) VALUES (?, ?)",
+                (str(user_id), time.time()),
+            )
+            self.conn.commit()
+            return cursor.lastrowid
+
+    def end_run(self, run_id, completed=False):
+        """结束一次爬取并提交尚未写入的文章
+
+        completed 表示这次爬取到了动态列表末尾（或追上了以前完整爬取的文章），
+        手动终止或出错的爬取不算完整
+        """
+        with self._lock:
+            self.conn.execute(
+                "UPDATE runs SET finished_at = ?, completed = ? WHERE run_id = ?",
+                (time.time(), int(completed), run_id),
+            )
+            self.conn.commit()
+            self._pending = 0
+
+    def has_completed_run(self, user_id):
+        """该用户是否有过完整的爬取"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM runs WHERE user_id = ? AND completed = 1 LIMIT 1",
+                (str(user_id),),
+            ).fetchone()
+        return row is not None
+
+    def contains(self, user_id, article_id):
+        """文章是否已保存"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM articles WHERE user_id = ? AND article_id = ?",
+                (str(user_id), article_id),
+            ).fetchone()
+        return row is not None
+
+    def add(self, user_id, article, run_id, position):
+        """保存一篇文章，已存在时忽略，返回是否为新写入"""
+        with self._lock:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO articles "
+                "(user_id, article_id, time, text, song, images, run_id, position) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    str(user_id),
+                    article["id"],
+                    article["time"],
+                    article["text"],
+                    json.dumps(article.get("song"), ensure_ascii=False, default=json_default),
+                    json.dumps(list(article.get("images") or []), ensure_ascii=False),
+                    run_id,
+                    position,
+                ),
+            )
+            self._count_write()
+            return cursor.rowcount > 0
+
+    def move(self, user_id, article_id, run_id, position):
+        """把已保存的文章移到本次爬取中的位置"""
+        with self._lock:
+            self.conn.execute(
+                "UPDATE articles SET run_id = ?, position = ? "
+                "WHERE user_id = ? AND article_id = ?",
+                (run_id, position, str(user_id), article_id),
+            )
+            self._count_write()
+
+    def _count_write(self):
+        """累计写入次数，达到 COMMIT_INTERVAL 时提交，调用时需持有锁"""
+        self._pending += 1
+        if self._pending >= COMMIT_INTERVAL:
+            self.conn.commit()
+            self._pending = 0
+
+    def load(self, user_id, before_run=None):
+        """按时间从新到旧读取用户的文章，before_run 限定只读取更早的爬取"""
+        query = (
+            "SELECT article_id, time, text, song, images FROM articles "
+            "WHERE user_id = ?"
+        )
+        params = [str(user_id)]
+        if before_run is not None:
+            query += " AND run_id < ?"
+            params.append(before_run)
+        query += " ORDER BY run_id DESC, position ASC"
+
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+
+        return [
+            Article(
+                article_id,
+                time_text,
+                text,
+                json.loads(song) if song else None,
+                json.loads(images) if images else (),
+            )
+            for article_id, time_text, text, song, images in rows
+        ]
+
+    def count(self, user_id):
+        """用户已保存的文章数"""
+        with self._lock:
+            (total,) = self.conn.execute(
+                "SELECT COUNT(*) FROM articles WHERE user_id = ?", (str(user_id),)
+            ).fetchone()
+        return total
+
+    def close(self):
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
@@ -0,0 +1,453 @@
+"""
+浏览器安装模块，分块并行下载 Chromium 压缩包，支持断点续传和校验，
+下载的同时解压已经完整到达的文件
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import stat
+import time
+import zipfile
+from collections import deque
+from pathlib import Path
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# 下载的默认设置，可通过 settings 参数覆盖
+INSTALLER_DEFAULTS = {
+    "blockSize": 4 * 1024 * 1024,  # 每个 Range 请求下载的字节数
+    "connections": 4,  # 同时下载的块数
+    "retries": 4,  # 单个块的最大尝试次数
+    "timeout": 60,  # 单个块的超时秒数
+}
+
+PART_SUFFIX = ".part"
+STATE_SUFFIX = ".state.json"
+STATE_VERSION = 1
+
+READ_CHUNK_SIZE = 256 * 1024
+# 两次进度回调的最小间隔（秒）
+PROGRESS_INTERVAL = 0.2
+
+
+class DownloadError(Exception):
+    """下载失败"""
+
+
+class ChecksumError(DownloadError):
+    """下载完成但校验失败，已下载的内容不能继续使用"""
+
+
+def get_installer_setting(settings, key):
+    """读取下载设置，未设置时使用默认值"""
+    value = (settings or {}).get(key)
+    return INSTALLER_DEFAULTS[key] if value is None else value
+
+
+def parse_content_range(value):
+    """解析 Content-Range 头，返回 (起始, 结束, 总大小)，无法解析时返回None"""
+    try:
+        unit, _, spec = value.partition(" ")
+        byte_range, _, total = spec.partition("/")
+        start, _, end = byte_range.partition("-")
+        if unit != "bytes":
+            return None
+        return int(start), int(end), int(total)
+    except (AttributeError, ValueError):
+        return None
+
+
+class ArchiveDownload:
+    """一个压缩包的分块下载
+
+    文件按 blockSize 分块，多个连接按顺序领取块并用 Range 请求下载，写入预先分配好大小的
+    .part 文件；已完成的块记录在状态文件中，中断后再次下载只请求缺少的块。
+    最后一块最先下载，ZIP 的中央目录在文件末尾，拿到后即可开始边下边解压；
+    sha256 随着连续完成的前缀逐步计算，下载结束时即可校验
+    """
+
+    def __init__(self, url, path, settings=None, expected_sha256=None, progress_callback=None):
+        self.url = url
+        self.path = Path(path)
+        self.part_path = self.path.with_name(self.path.name + PART_SUFFIX)
+        self.state_path = self.path.with_name(self.path.name + STATE_SUFFIX)
+        self.block_size = max(64 * 1024, int(get_installer_setting(settings, "blockSize")))
+        self.connections = max(1, int(get_installer_setting(settings, "connections")))
+        self.retries = max(1, int(get_installer_setting(settings, "retries")))
+        self.timeout = get_installer_setting(settings, "timeout")
+        self.expected_sha256 = expected_sha256.lower() if expected_sha256 else None
+        self.progress_callback = progress_callback
+
+        self.size = None
+        self.validator = None
+        self.done = set()
+        self.downloaded = 0
+        # 连续完成并已计算哈希的前缀长度
+        self.contiguous = 0
+        self._hash = hashlib.sha256()
+        self.sha256 = None
+        # 有块完成时通知等待的解压任务
+        self.changed = asyncio.Event()
+        # 哈希必须按顺序计算，多个块同时完成时依次推进
+        self._hash_lock = asyncio.Lock()
+        self._last_progress = 0.0
+
+    @property
+    def block_count(self):
+        return (self.size + self.block_size - 1) // self.block_size
+
+    def block_range(self, index):
+        start = index * self.block_size
+        return start, min(self.size, start + self.block_size) - 1
+
+    def has_range(self, start, end):
+        """[start, end) 范围内的字节是否都已下载"""
+        if end <= start:
+            return True
+        first = start // self.block_size
+        last = (end - 1) // self.block_size
+        return all(index in self.done for index in range(first, last + 1))
+
+    @property
+    def complete(self):
+        return self.size is not None and len(self.done) == self.block_count
+
+    # 状态文件
+
+    def _load_state(self):
+        """读取与本次下载匹配的状态，返回已完成的块"""
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if (
+                state.get("version") != STATE_VERSION
+                or state.get("url") != self.url
+                or state.get("size") != self.size
+                or state.get("blockSize") != self.block_size
+                or state.get("validator") != self.validator
+                or self.part_path.stat().st_size != self.size
+            ):
+                return set()
+            return {index for index in state.get("done", []) if 0 <= index < self.block_count}
+        except (OSError, ValueError, AttributeError):
+            return set()
+
+    def _save_state(self):
+        tmp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": STATE_VERSION,
+                    "url": self.url,
+                    "size": self.size,
+                    "blockSize": self.block_size,
+                    "validator": self.validator,
+                    "done": sorted(self.done),
+                },
+                f,
+            )
+        tmp_path.replace(self.state_path)
+
+    def discard(self):
+        """删除未完成的文件和状态"""
+        for path in (self.part_path, self.state_path):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    # 下载
+
+    async def run(self, session):
+        """下载到 .part 文件并校验，返回文件的 sha256，之后调用 finish 得到目标文件"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        ranged = await self._probe(session)
+
+        if ranged:
+            self.done = self._load_state()
+            if self.done:
+                logger.info(f"继续未完成的下载，已有 {len(self.done)}/{self.block_count} 块")
+            else:
+                with open(self.part_path, "wb") as f:
+                    f.truncate(self.size)
+                self._save_state()
+            self.downloaded = sum(
+                self.block_range(index)[1] - self.block_range(index)[0] + 1 for index in self.done
+            )
+            await self._advance_hash()
+            await self._download_blocks(session)
+        else:
+            logger.info("服务器不支持分块下载，使用单个连接下载")
+            await self._download_whole(session)
+
+        if not self.size:
+            raise DownloadError("下载的文件为空")
+        await self._advance_hash()
+        await self._report_progress(force=True)
+        self.sha256 = self._hash.hexdigest()
+        if self.expected_sha256 and self.sha256 != self.expected_sha256:
+            self.discard()
+            raise ChecksumError(f"校验失败: sha256 为 {self.sha256}，应为 {self.expected_sha256}")
+
+        return self.sha256
+
+    def finish(self):
+        """把下载完成的 .part 文件重命名为目标文件"""
+        self.part_path.replace(self.path)
+        try:
+            self.state_path.unlink()
+        except OSError:
+            pass
+        return self.path
+
+    async def _probe(self, session):
+        """请求第一个字节，确定文件大小以及服务器是否支持 Range"""
+        async with session.get(self.url, headers={"Range": "bytes=0-0"}) as response:
+            response.raise_for_status()
+            self.validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+            content_range = parse_content_range(response.headers.get("Content-Range"))
+            if response.status == 206 and content_range:
+                self.size = content_range[2]
+                return self.size > 0
+
+            length = response.headers.get("Content-Length")
+            self.size = int(length) if length else None
+            return False
+
+    async def _download_blocks(self, session):
+        # 最后一块先下载，其余按顺序，使连续前缀尽快推进
+        pending = [index for index in range(self.block_count) if index not in self.done]
+        if pending and pending[-1] == self.block_count - 1:
+            pending.insert(0, pending.pop())
+        queue = deque(pending)
+
+        async def worker():
+            while queue:
+                await self._download_block(session, queue.popleft())
+
+        await asyncio.gather(*(worker() for _ in range(min(self.connections, len(queue)) or 1)))
+
+    async def _download_block(self, session, index):
+        start, end = self.block_range(index)
+        for attempt in range(1, self.retries + 1):
+            written = 0
+            try:
+                async with session.get(
+                    self.url,
+                    headers={"Range": f"bytes={start}-{end}"},
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                ) as response:
+                    content_range = parse_content_range(response.headers.get("Content-Range"))
+                    if response.status != 206 or not content_range or content_range[0] != start:
+                        raise DownloadError(f"服务器返回了错误的范围: {response.status}")
+
+                    with open(self.part_path, "r+b") as f:
+                        f.seek(start)
+                        async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+                            f.write(chunk)
+                            written += len(chunk)
+                            self.downloaded += len(chunk)
+                            await self._report_progress()
+
+                if written != end - start + 1:
+                    raise DownloadError(f"第 {index} 块长度不符: {written}")
+                break
+            except (aiohttp.ClientError, asyncio.TimeoutError, DownloadError) as e:
+                self.downloaded -= written
+                if attempt == self.retries:
+                    raise DownloadError(f"下载第 {index} 块失败: {e}") from e
+                logger.warning(f"下载第 {index} 块出错 (第{attempt}次): {e}")
+                await asyncio.sleep(2 ** (attempt - 1))
+
+        self.done.add(index)
+        self._save_state()
+        await self._advance_hash()
+        self.changed.set()
+
+    async def _download_whole(self, session):
+        """不支持 Range 时用单个连接从头下载，经过块边界时同样标记完成"""
+        self.done = set()
+        self.downloaded = 0
+        written = 0
+        async with session.get(self.url) as response:
+            response.raise_for_status()
+            with open(self.part_path, "wb") as f:
+                async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+                    f.write(chunk)
+                    written += len(chunk)
+                    self.downloaded = written
+                    if self.size:
+                        # 解压任务读取的是已写入磁盘的内容
+                        f.flush()
+                        finished = written // self.block_size
+                        if finished > len(self.done):
+                            self.done.update(range(finished))
+                            self.changed.set()
+                    await self._report_progress()
+
+        if self.size is not None and written != self.size:
+            raise DownloadError(f"下载不完整: {written}/{self.size}")
+        self.size = written
+        self.done = set(range(self.block_count))
+        self.changed.set()
+
+    async def _advance_hash(self):
+        """对新增的连续前缀计算哈希"""
+        async with self._hash_lock:
+            start = self.contiguous
+            end = start
+            while end < self.size and (end // self.block_size) in self.done:
+                end = self.block_range(end // self.block_size)[1] + 1
+            if end > start:
+                await asyncio.to_thread(self._hash_range, start, end)
+                self.contiguous = end
+
+    def _hash_range(self, start, end):
+        with open(self.part_path, "rb") as f:
+            f.seek(start)
+            remaining = end - start
+            while remaining > 0:
+                chunk = f.read(min(READ_CHUNK_SIZE, remaining))
+                if not chunk:
+                    raise DownloadError("读取下载文件失败")
+                self._hash.update(chunk)
+                remaining -= len(chunk)
+
+    async def _report_progress(self, force=False):
+        if not self.progress_callback or not self.size:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_progress < PROGRESS_INTERVAL:
+            return
+        self._last_progress = now
+        await self.progress_callback(
+            self.downloaded / self.size * 100, self.downloaded, self.size
+        )
+
+
+def safe_member_path(dest_dir, name):
+    """压缩包内文件的解压路径，拒绝绝对路径和跳出目标目录的路径"""
+    relative = Path(name.replace("\\", "/"))
+    if relative.is_absolute() or ".." in relative.parts or relative.drive:
+        raise DownloadError(f"压缩包中的路径不安全: {name}")
+    return Path(dest_dir) / relative
+
+
+def extract_member(archive, info, dest_dir):
+    """解压一个文件，保留 Unix 执行权限和符号链接（macOS 的 Chromium.app 中有符号链接）"""
+    target = safe_member_path(dest_dir, info.filename)
+    mode = info.external_attr >> 16 if info.create_system == 3 else 0
+
+    if info.is_dir():
+        target.mkdir(parents=True, exist_ok=True)
+        return
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if stat.S_ISLNK(mode):
+        link_target = archive.read(info).decode("utf-8")
+        if target.is_symlink() or target.exists():
+            target.unlink()
+        try:
+            os.symlink(link_target, target)
+            return
+        except (OSError, NotImplementedError):
+            # 不支持符号链接时退回为普通文件
+            pass
+
+    # ZipExtFile 读到结尾时校验 CRC-32
+    with archive.open(info) as src, open(target, "wb") as dst:
+        shutil.copyfileobj(src, dst, READ_CHUNK_SIZE)
+    if mode & 0o777:
+        os.chmod(target, mode & 0o777)
+
+
+def extract_archive(archive_path, dest_dir):
+    """解压整个压缩包"""
+    with zipfile.ZipFile(archive_path) as archive:
+        for info in archive.infolist():
+            extract_member(archive, info, dest_dir)
+
+
+async def _wait_for_range(download, start, end):
+    while not download.has_range(start, end):
+        download.changed.clear()
+        if download.has_range(start, end):
+            break
+        await download.changed.wait()
+
+
+async def extract_while_downloading(download, dest_dir):
+    """下载进行中解压已经完整到达的文件，按文件在压缩包中的位置依次解压"""
+    # 等待文件大小确定、最先下载的最后一块（含中央目录）完成
+    while download.size is None:
+        download.changed.clear()
+        await download.changed.wait()
+    await _wait_for_range(download, download.block_range(download.block_count - 1)[0], download.size)
+
+    # 下载任务通过其他句柄写入文件，这里必须用无缓冲的句柄读取：带缓冲的句柄读到一个文件末尾时
+    # 会越过块边界把尚未下载的内容读进缓冲，块到达后解压下一个文件仍会读到缓冲中的旧内容
+    with open(download.part_path, "rb", buffering=0) as part_file:
+        try:
+            archive = zipfile.ZipFile(part_file)
+        except zipfile.BadZipFile:
+            # 中央目录超出了最后一块，等全部下载完再读取
+            await _wait_for_range(download, 0, download.size)
+            archive = zipfile.ZipFile(part_file)
+
+        with archive:
+            infos = sorted(archive.infolist(), key=lambda info: info.header_offset)
+            # 每个文件的数据到下一个文件的本地头为止，最后一个到中央目录为止
+            ends = [info.header_offset for info in infos[1:]] + [archive.start_dir]
+            for info, end in zip(infos, ends):
+                await _wait_for_range(download, info.header_offset, end)
+                await asyncio.to_thread(extract_member, archive, info, dest_dir)
+
+
+async def install_archive(
+    url, archive_path, dest_dir, settings=None, expected_sha256=None, progress_callback=None
+):
+    """下载压缩包并解压到 dest_dir，返回压缩包的 sha256
+
+    网络错误时保留已下载的块，再次调用时继续下载；校验失败或压缩包损坏时从头下载
+    """
+    dest_dir = Path(dest_dir)
+    if dest_dir.exists():
+        shutil.rmtree(dest_dir)
+    dest_dir.mkdir(parents=True)
+
+    download = ArchiveDownload(
+        url,
+        archive_path,
+        settings=settings,
+        expected_sha256=expected_sha256,
+        progress_callback=progress_callback,
+    )
+    connector = aiohttp.TCPConnector(limit_per_host=download.connections)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        tasks = [
+            asyncio.ensure_future(download.run(session)),
+            asyncio.ensure_future(extract_while_downloading(download, dest_dir)),
+        ]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+            sha256, _ = await asyncio.gather(*tasks)
+        except BaseException as e:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            shutil.rmtree(dest_dir, ignore_errors=True)
+            if isinstance(e, (zipfile.BadZipFile, ChecksumError)):
+                download.discard()
+            raise
+
+    # 解压完成后压缩包不再需要
+    download.discard()
+    return sha256
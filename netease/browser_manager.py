@@ -1,16 +1,95 @@
 """
 浏览器管理模块，智能处理开发环境和打包环境的浏览器
 """
+import importlib.util
+import json
+import logging
 import os
+import re
 import sys
-import zipfile
 import platform
 import aiohttp
 from pathlib import Path
 import shutil
 import subprocess
-import traceback
-import time
+
+from .browser_installer import ArchiveDownload, extract_archive, install_archive
+
+logger = logging.getLogger(__name__)
+
+# 浏览器查找结果的缓存文件，保存在本地浏览器目录中
+DISCOVERY_MANIFEST_NAME = "discovery.json"
+DISCOVERY_VERSION = 1
+
+# 浏览器种类：完整的 Chromium，以及 Playwright 为无头模式单独构建的 chromium-headless-shell，
+# 后者只能无头运行，但下载更小、启动更快、占用内存更少
+CHROMIUM = "chromium"
+HEADLESS_SHELL = "chromium-headless-shell"
+
+# Playwright 目录中各种类浏览器的目录名
+PLAYWRIGHT_DIR_PATTERNS = {
+    CHROMIUM: re.compile(r"^chromium-(\d+)$"),
+    HEADLESS_SHELL: re.compile(r"^chromium_headless_shell-(\d+)$"),
+}
+
+# 各平台可执行文件在浏览器目录中的常见位置，先直接检查这些路径，找不到再遍历目录
+EXECUTABLE_LAYOUTS = {
+    CHROMIUM: {
+        "windows": ("chrome.exe", "chrome-win/chrome.exe", "chrome-win64/chrome.exe"),
+        "darwin": (
+            "Chromium.app/Contents/MacOS/Chromium",
+            "chrome-mac/Chromium.app/Contents/MacOS/Chromium",
+            "chrome-mac-arm64/Chromium.app/Contents/MacOS/Chromium",
+        ),
+        "linux": ("chrome", "chrome-linux/chrome", "chrome-linux64/chrome"),
+    },
+    HEADLESS_SHELL: {
+        "windows": (
+            "headless_shell.exe",
+            "chrome-win/headless_shell.exe",
+            "chrome-headless-shell-win64/chrome-headless-shell.exe",
+        ),
+        "darwin": (
+            "headless_shell",
+            "chrome-mac/headless_shell",
+            "chrome-headless-shell-mac-arm64/chrome-headless-shell",
+            "chrome-headless-shell-mac-x64/chrome-headless-shell",
+        ),
+        "linux": (
+            "headless_shell",
+            "chrome-linux/headless_shell",
+            "chrome-headless-shell-linux64/chrome-headless-shell",
+        ),
+    },
+}
+
+def get_app_dir():
+    """获取应用程序目录，打包环境为可执行文件所在目录，开发环境为当前目录"""
+    if getattr(sys, 'frozen', False):
+        return Path(sys.executable).parent
+    return Path.cwd()
+
+def playwright_revision(browser_name="chromium"):
+    """已安装的 Playwright 版本对应的浏览器修订号，无法读取时返回None"""
+    try:
+        spec = importlib.util.find_spec("playwright")
+        if not spec or not spec.submodule_search_locations:
+            return None
+        browsers_json = (
+            Path(list(spec.submodule_search_locations)[0]) / "driver" / "package" / "browsers.json"
+        )
+        with open(browsers_json, "r", encoding="utf-8") as f:
+            browsers = json.load(f).get("browsers", [])
+    except (OSError, ValueError, ImportError):
+        return None
+
+    for browser in browsers:
+        if browser.get("name") == browser_name:
+            try:
+                return int(browser.get("revision"))
+            except (TypeError, ValueError):
+                return None
+    return None
 
 class BrowserManager:
     def __init__(self, debug_callback=None):
@@ -20,14 +99,12 @@ class BrowserManager:
         self.is_frozen = getattr(sys, 'frozen', False)
         
         # 获取应用程序目录
-        if self.is_frozen:
-            self.app_dir = Path(sys.executable).parent
-        else:
-            self.app_dir = Path.cwd()
+        self.app_dir = get_app_dir()
         
         # 设置浏览器目录
         self.local_browser_dir = self.app_dir / "browsers"
         self.chromium_dir = self.local_browser_dir / "chromium"
+        self.headless_shell_dir = self.local_browser_dir / HEADLESS_SHELL
         
         # 操作系统相关设置
         self.platform = platform.system().lower()
@@ -42,6 +119,9 @@ class BrowserManager:
         self.playwright_browsers_path = self._get_playwright_browsers_path()
         
         self.executable_path = None
+        self.headless_shell_path = None
+        # 浏览器查找结果的缓存，见 find_browser
+        self.manifest_path = self.local_browser_dir / DISCOVERY_MANIFEST_NAME
         
         # 添加调试日志
         self._debug_log(f"[BrowserManager] 初始化:")
@@ -56,7 +136,7 @@ class BrowserManager:
     
     def _debug_log(self, message):
         """输出调试信息"""
-        print(message)
+        logger.debug(message)
         if self.debug_callback:
             self.debug_callback(message)
     
@@ -66,28 +146,28 @@ class BrowserManager:
         
         # 如果temp目录存在，检查是否有chrome
         if temp_dir.exists():
-            print(f"[BrowserManager] 发现临时目录: {temp_dir}")
+            logger.info(f"[BrowserManager] 发现临时目录: {temp_dir}")
             
             # 查找chrome-win目录
             chrome_win_dir = temp_dir / "chrome-win"
             if chrome_win_dir.exists() and (chrome_win_dir / "chrome.exe").exists():
-                print(f"[BrowserManager] 在临时目录找到chrome: {chrome_win_dir}")
+                logger.info(f"[BrowserManager] 在临时目录找到chrome: {chrome_win_dir}")
                 
                 # 如果chromium目录不存在，移动chrome-win到chromium
                 if not self.chromium_dir.exists():
                     try:
-                        print(f"[BrowserManager] 移动 {chrome_win_dir} -> {self.chromium_dir}")
+                        logger.info(f"[BrowserManager] 移动 {chrome_win_dir} -> {self.chromium_dir}")
                         shutil.move(str(chrome_win_dir), str(self.chromium_dir))
-                        print(f"[BrowserManager] 移动成功")
+                        logger.info(f"[BrowserManager] 移动成功")
                         
                         # 清理空的temp目录
                         if temp_dir.exists() and not list(temp_dir.iterdir()):
                             temp_dir.rmdir()
-                            print(f"[BrowserManager] 删除空的temp目录")
+                            logger.info(f"[BrowserManager] 删除空的temp目录")
                     except Exception as e:
-                        print(f"[BrowserManager] 移动失败: {e}")
+                        logger.warning(f"[BrowserManager] 移动失败: {e}")
                 else:
-                    print(f"[BrowserManager] chromium目录已存在，跳过移动")
+                    logger.info(f"[BrowserManager] chromium目录已存在，跳过移动")
     
     def _get_playwright_browsers_path(self):
         """获取 Playwright 默认浏览器路径"""
@@ -103,250 +183,369 @@ class BrowserManager:
         else:  # Linux
             return Path.home() / '.cache' / 'ms-playwright'
     
-    def find_browser(self):
-        """按优先级查找浏览器"""
-        print(f"[BrowserManager] 开始查找浏览器...")
-        
-        # 优先级1：打包应用的本地浏览器目录
-        if self.is_frozen and self.find_browser_in_dir(self.chromium_dir):
-            print(f"[BrowserManager] 在打包目录找到浏览器: {self.executable_path}")
-            return self.executable_path
+    def browser_dir(self, flavor=CHROMIUM):
+        """本地浏览器目录中存放该种类浏览器的目录"""
+        return self.chromium_dir if flavor == CHROMIUM else self.headless_shell_dir
+
+    def staging_dir(self, flavor=CHROMIUM):
+        """安装时解压该种类浏览器的目录
+
+        边下载边解压，程序中途退出时这里会留下不完整的浏览器，所以查找浏览器时不检查这个目录，
+        解压完成后才移动到 browser_dir；再次安装时清空重新解压
+        """
+        return self.local_browser_dir / f"staging-{flavor}"
+
+    def _get_executable(self, flavor):
+        return self.executable_path if flavor == CHROMIUM else self.headless_shell_path
+
+    def _set_executable(self, flavor, path):
+        if flavor == CHROMIUM:
+            self.executable_path = path
+        else:
+            self.headless_shell_path = path
+
+    def find_browser(self, flavor=CHROMIUM):
+        """查找浏览器，优先使用缓存的查找结果
+
+        缓存记录可执行文件的路径、大小和修改时间，校验只需 stat 可执行文件；
+        文件变化、出现了优先级更高的本地浏览器或 Playwright 目录有变动时重新查找
+        """
+        cached = self._load_discovery(flavor)
+        if cached:
+            self._set_executable(flavor, cached)
+            return cached
+
+        found = self._discover_browser(flavor)
+        if found:
+            self._save_discovery(flavor, *found)
+            return self._get_executable(flavor)
+
+        self.invalidate_discovery(flavor)
+        return None
+
+    def _discover_browser(self, flavor=CHROMIUM):
+        """按优先级查找浏览器，返回 (来源, 修订号)，未找到时返回None"""
+        logger.info(f"[BrowserManager] 开始查找浏览器 ({flavor})...")
         
-        # 优先级2：本地浏览器目录（所有环境）
-        if self.find_browser_in_dir(self.chromium_dir):
-            print(f"[BrowserManager] 在本地目录找到浏览器: {self.executable_path}")
-            return self.executable_path
+        # 优先级1：本地浏览器目录（打包应用的浏览器也在这里）
+        if self.find_browser_in_dir(self.browser_dir(flavor), flavor):
+            logger.info(f"[BrowserManager] 在本地目录找到浏览器: {self._get_executable(flavor)}")
+            return "local", None
         
-        # 优先级3：检查temp目录（可能解压未完成）
+        # 优先级2：检查temp目录（旧版本在这里完整解压后再移动，移动可能未完成）
         temp_dir = self.local_browser_dir / "temp"
-        if temp_dir.exists():
+        if flavor == CHROMIUM and temp_dir.exists():
             for item in temp_dir.iterdir():
-                if item.is_dir() and self.find_browser_in_dir(item):
-                    print(f"[BrowserManager] 在临时目录找到浏览器: {self.executable_path}")
-                    return self.executable_path
+                if item.is_dir() and self.find_browser_in_dir(item, flavor):
+                    logger.info(f"[BrowserManager] 在临时目录找到浏览器: {self._get_executable(flavor)}")
+                    return "temp", None
         
-        # 优先级4：Playwright 默认安装的浏览器（仅开发环境）
+        # 优先级3：Playwright 默认安装的浏览器（仅开发环境）
         if not self.is_frozen and self.playwright_browsers_path.exists():
-            print(f"[BrowserManager] 搜索Playwright目录: {self.playwright_browsers_path}")
-            for chromium_dir in self.playwright_browsers_path.glob("chromium-*"):
-                if self.find_browser_in_dir(chromium_dir):
-                    print(f"[BrowserManager] 在Playwright目录找到浏览器: {self.executable_path}")
-                    return self.executable_path
+            logger.info(f"[BrowserManager] 搜索Playwright目录: {self.playwright_browsers_path}")
+            for revision, chromium_dir in self.playwright_chromium_dirs(flavor):
+                if self.find_browser_in_dir(chromium_dir, flavor):
+                    logger.info(f"[BrowserManager] 在Playwright目录找到浏览器: {self._get_executable(flavor)}")
+                    return "playwright", revision
         
-        print(f"[BrowserManager] 未找到浏览器")
+        logger.info(f"[BrowserManager] 未找到浏览器 ({flavor})")
         return None
+
+    def playwright_chromium_dirs(self, flavor=CHROMIUM):
+        """Playwright 目录中的 chromium-<修订号> 目录，按优先顺序返回 (修订号, 目录)
+
+        与已安装的 Playwright 版本匹配的修订号优先，其余按修订号从新到旧；
+        flavor 为 HEADLESS_SHELL 时返回 chromium_headless_shell-<修订号> 目录
+        """
+        expected = playwright_revision(flavor)
+        pattern = PLAYWRIGHT_DIR_PATTERNS[flavor]
+        dirs = []
+        for item in self.playwright_browsers_path.iterdir():
+            match = pattern.match(item.name)
+            if match and item.is_dir():
+                dirs.append((int(match.group(1)), item))
+        dirs.sort(key=lambda entry: (entry[0] == expected, entry[0]), reverse=True)
+        return dirs
+
+    def _discovery_context(self):
+        """影响查找结果的环境，变化时缓存失效"""
+        return {
+            "platform": self.platform,
+            "frozen": self.is_frozen,
+            "browsersPath": str(self.playwright_browsers_path),
+        }
+
+    def _manifest_path(self, flavor):
+        if flavor == CHROMIUM:
+            return self.manifest_path
+        return self.local_browser_dir / f"discovery-{flavor}.json"
+
+    def _load_discovery(self, flavor=CHROMIUM):
+        """读取并校验缓存的查找结果，有效时返回可执行文件路径"""
+        try:
+            with open(self._manifest_path(flavor), "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") != DISCOVERY_VERSION:
+                return None
+            if manifest.get("context") != self._discovery_context():
+                return None
+
+            executable = Path(manifest["executable"])
+            stat = executable.stat()
+            if stat.st_size != manifest["size"] or stat.st_mtime_ns != manifest["mtime"]:
+                return None
+
+            source = manifest.get("source")
+            # 之后下载到本地目录的浏览器优先
+            if source != "local" and self.browser_dir(flavor).exists():
+                return None
+            # Playwright 安装或删除了浏览器，重新选择修订号
+            if source == "playwright":
+                if self.playwright_browsers_path.stat().st_mtime_ns != manifest.get("browsersMtime"):
+                    return None
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+        logger.debug(f"[BrowserManager] 使用缓存的浏览器路径: {executable}")
+        return executable
+
+    def _save_discovery(self, flavor, source, revision):
+        executable = self._get_executable(flavor)
+        try:
+            stat = executable.stat()
+        except OSError:
+            return
+        manifest = {
+            "version": DISCOVERY_VERSION,
+            "context": self._discovery_context(),
+            "executable": str(executable),
+            "source": source,
+            "revision": revision,
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+        }
+        try:
+            if source == "playwright":
+                manifest["browsersMtime"] = self.playwright_browsers_path.stat().st_mtime_ns
+            self.local_browser_dir.mkdir(parents=True, exist_ok=True)
+            manifest_path = self._manifest_path(flavor)
+            tmp_path = manifest_path.with_name(manifest_path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=2)
+            tmp_path.replace(manifest_path)
+        except OSError as e:
+            # 应用目录只读时每次重新查找
+            logger.debug(f"[BrowserManager] 无法保存浏览器查找结果: {e}")
+
+    def invalidate_discovery(self, flavor=None):
+        """删除缓存的查找结果，安装或删除浏览器后调用，flavor 为None时删除所有种类的"""
+        for name in (flavor,) if flavor else (CHROMIUM, HEADLESS_SHELL):
+            try:
+                self._manifest_path(name).unlink()
+            except OSError:
+                pass
     
-    def find_browser_in_dir(self, directory):
+    def find_browser_in_dir(self, directory, flavor=CHROMIUM):
         """在指定目录中查找浏览器可执行文件"""
         if not directory or not directory.exists():
-            print(f"[BrowserManager] 目录不存在: {directory}")
+            logger.debug(f"[BrowserManager] 目录不存在: {directory}")
             return False
         
-        print(f"[BrowserManager] 在目录中查找: {directory}")
+        logger.debug(f"[BrowserManager] 在目录中查找: {directory}")
         
-        # Windows
-        if self.platform == "windows":
-            # 直接检查chrome.exe
-            chrome_exe = directory / "chrome.exe"
-            if chrome_exe.exists():
-                self.executable_path = chrome_exe
-                print(f"[BrowserManager] 找到可执行文件: {self.executable_path}")
+        # 先检查常见位置，避免遍历包含数千个文件的浏览器目录
+        layouts = EXECUTABLE_LAYOUTS[flavor]
+        layouts = layouts.get(self.platform, layouts["linux"])
+        for relative_path in layouts:
+            exe_path = directory / relative_path
+            if self._is_executable(exe_path):
+                self._set_executable(flavor, exe_path)
+                logger.debug(f"[BrowserManager] 找到可执行文件: {exe_path}")
                 return True
-            
-            # 递归搜索
-            for root, _, files in os.walk(directory):
-                if self.executable_name in files:
-                    self.executable_path = Path(root) / self.executable_name
-                    print(f"[BrowserManager] 找到可执行文件: {self.executable_path}")
-                    return True
         
-        # macOS
-        elif self.platform == "darwin":
-            app_path = directory / "Chromium.app"
-            if app_path.exists():
-                self.executable_path = directory / self.executable_name
-                if os.path.exists(self.executable_path):
-                    print(f"[BrowserManager] 找到可执行文件: {self.executable_path}")
-                    return True
+        # macOS 的 Chromium 在 .app 包中，只使用固定位置
+        if self.platform == "darwin" and flavor == CHROMIUM:
+            return False
         
-        # Linux
-        else:
-            for root, _, files in os.walk(directory):
-                if self.executable_name in files:
-                    exe_path = Path(root) / self.executable_name
-                    if os.access(exe_path, os.X_OK):  # 检查是否可执行
-                        self.executable_path = exe_path
-                        print(f"[BrowserManager] 找到可执行文件: {self.executable_path}")
-                        return True
+        # 递归搜索
+        names = {Path(relative_path).name for relative_path in layouts}
+        for root, _, files in os.walk(directory):
+            for name in names.intersection(files):
+                exe_path = Path(root) / name
+                if self._is_executable(exe_path):
+                    self._set_executable(flavor, exe_path)
+                    logger.debug(f"[BrowserManager] 找到可执行文件: {exe_path}")
+                    return True
         
         return False
+
+    def _is_executable(self, path):
+        if not path.is_file():
+            return False
+        # Windows 不检查执行权限
+        return self.platform == "windows" or os.access(path, os.X_OK)
     
-    def is_browser_installed(self):
+    def is_browser_installed(self, headless_shell=False):
         """检查是否有可用的浏览器"""
-        return self.find_browser() is not None
+        return self.get_executable_path(headless_shell) is not None
     
-    def get_executable_path(self):
-        """获取浏览器可执行文件路径"""
+    def get_executable_path(self, headless_shell=False):
+        """获取浏览器可执行文件路径
+
+        headless_shell 为真时优先使用 chromium-headless-shell，没有时使用完整的 Chromium
+        """
+        if headless_shell:
+            shell_path = self.find_browser(HEADLESS_SHELL)
+            if shell_path:
+                return str(shell_path)
         browser_path = self.find_browser()
         return str(browser_path) if browser_path else None
     
-    def get_download_url(self):
-        """获取 Chromium 下载 URL"""
-        # Playwright 使用的 Chromium 版本
+    def get_download_url(self, flavor=CHROMIUM):
+        """获取 Chromium 下载 URL，该平台没有此种类浏览器时返回None"""
+        # Playwright 使用的 Chromium 版本，chromium-headless-shell 与之使用相同的修订号
         revision = "1148"  # 对应 Playwright 1.52.0
         
         base_url = "https://playwright.azureedge.net/builds/chromium"
         
         if self.platform == "windows":
             if platform.machine().endswith('64'):
-                return f"{base_url}/{revision}/chromium-win64.zip"
+                suffix = "win64"
+            elif flavor == HEADLESS_SHELL:
+                # 没有32位 Windows 的 chromium-headless-shell
+                return None
             else:
-                return f"{base_url}/{revision}/chromium-win32.zip"
+                suffix = "win32"
         elif self.platform == "darwin":
-            if platform.machine() == "arm64":
-                return f"{base_url}/{revision}/chromium-mac-arm64.zip"
-            else:
-                return f"{base_url}/{revision}/chromium-mac.zip"
+            suffix = "mac-arm64" if platform.machine() == "arm64" else "mac"
         else:  # Linux
-            return f"{base_url}/{revision}/chromium-linux.zip"
+            suffix = "linux"
+        return f"{base_url}/{revision}/{flavor}-{suffix}.zip"
     
-    async def download_browser(self, progress_callback=None):
-        """下载浏览器到本地目录"""
+    async def download_browser(self, progress_callback=None, flavor=CHROMIUM):
+        """下载浏览器压缩包到本地目录，支持断点续传"""
+        url = self.get_download_url(flavor)
+        zip_path = self.local_browser_dir / f"{flavor}.zip"
+        logger.info(f"[BrowserManager] 开始下载浏览器: {url}")
+
+        download = ArchiveDownload(url, zip_path, progress_callback=progress_callback)
         try:
-            url = self.get_download_url()
-            self.local_browser_dir.mkdir(parents=True, exist_ok=True)
-            
-            zip_path = self.local_browser_dir / "chromium.zip"
-            
-            print(f"[BrowserManager] 开始下载浏览器: {url}")
-            
             async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    response.raise_for_status()
-                    
-                    total_size = int(response.headers.get('Content-Length', 0))
-                    downloaded = 0
-                    
-                    with open(zip_path, 'wb') as file:
-                        async for chunk in response.content.iter_chunked(8192):
-                            file.write(chunk)
-                            downloaded += len(chunk)
-                            
-                            if progress_callback and total_size > 0:
-                                progress = (downloaded / total_size) * 100
-                                await progress_callback(progress, downloaded, total_size)
-            
-            print(f"[BrowserManager] 下载完成: {zip_path}")
-            return zip_path
-            
+                await download.run(session)
         except Exception as e:
-            print(f"[BrowserManager] 下载失败: {e}")
-            traceback.print_exc()
-            if zip_path.exists():
-                zip_path.unlink()
-            raise e
+            logger.exception(f"[BrowserManager] 下载失败: {e}")
+            raise
+
+        download.finish()
+        logger.info(f"[BrowserManager] 下载完成: {zip_path}")
+        return zip_path
     
-    def extract_browser(self, zip_path):
-        """解压浏览器"""
+    def extract_browser(self, zip_path, flavor=CHROMIUM):
+        """解压已下载的浏览器压缩包并安装"""
         try:
-            print(f"[BrowserManager] 开始解压: {zip_path}")
+            logger.info(f"[BrowserManager] 开始解压: {zip_path}")
             
             # 确保zip文件存在
             if not zip_path.exists():
                 raise Exception(f"ZIP文件不存在: {zip_path}")
             
-            # 创建临时目录
-            temp_dir = self.local_browser_dir / "temp"
-            if temp_dir.exists():
-                print(f"[BrowserManager] 清理旧的临时目录")
-                shutil.rmtree(temp_dir)
-            temp_dir.mkdir(exist_ok=True)
-            
-            # 解压文件
-            with zipfile.ZipFile(zip_path, 'r') as zip_file:
-                print(f"[BrowserManager] 解压到临时目录: {temp_dir}")
-                zip_file.extractall(temp_dir)
+            staging_dir = self.staging_dir(flavor)
+            if staging_dir.exists():
+                logger.info("[BrowserManager] 清理旧的解压目录")
+                shutil.rmtree(staging_dir)
+            extract_archive(zip_path, staging_dir)
             
-            # 延迟一下确保文件句柄释放
-            time.sleep(0.5)
-            
-            # 尝试删除zip文件
             try:
                 zip_path.unlink()
-                print(f"[BrowserManager] 删除zip文件成功")
-            except Exception as e:
-                print(f"[BrowserManager] 删除zip文件失败: {e}")
+            except OSError as e:
+                logger.warning(f"[BrowserManager] 删除zip文件失败: {e}")
             
-            # 找到解压出的chrome目录
-            extracted_items = list(temp_dir.iterdir())
-            print(f"[BrowserManager] 解压出的项目: {[item.name for item in extracted_items]}")
-            
-            # 查找包含chrome.exe的目录
-            chrome_dir = None
-            for item in extracted_items:
-                if item.is_dir():
-                    # 检查是否包含chrome.exe
-                    if (item / "chrome.exe").exists():
-                        chrome_dir = item
-                        break
-                    # 递归检查子目录
-                    for subdir in item.iterdir():
-                        if subdir.is_dir() and (subdir / "chrome.exe").exists():
-                            chrome_dir = subdir
-                            break
-            
-            if not chrome_dir:
-                raise Exception("未找到chrome.exe")
-            
-            print(f"[BrowserManager] 找到Chrome目录: {chrome_dir}")
-            
-            # 如果chromium目录存在，先删除
-            if self.chromium_dir.exists():
-                print(f"[BrowserManager] 删除旧的chromium目录")
-                shutil.rmtree(self.chromium_dir)
-            
-            # 移动chrome目录到chromium目录
-            print(f"[BrowserManager] 移动 {chrome_dir} -> {self.chromium_dir}")
-            shutil.move(str(chrome_dir), str(self.chromium_dir))
-            
-            # 清理临时目录
-            if temp_dir.exists():
-                try:
-                    shutil.rmtree(temp_dir)
-                    print(f"[BrowserManager] 清理临时目录成功")
-                except Exception as e:
-                    print(f"[BrowserManager] 清理临时目录失败: {e}")
-            
-            # 验证安装
-            if self.find_browser_in_dir(self.chromium_dir):
-                print(f"[BrowserManager] 浏览器安装成功: {self.executable_path}")
-                return True
-            else:
-                raise Exception("浏览器安装验证失败")
-                
+            return self.install_extracted(staging_dir, flavor)
         except Exception as e:
-            print(f"[BrowserManager] 解压失败: {e}")
-            traceback.print_exc()
+            logger.exception(f"[BrowserManager] 解压失败: {e}")
             raise e
+
+    def install_extracted(self, staging_dir, flavor=CHROMIUM):
+        """把解压完成的浏览器移动到本地浏览器目录"""
+        # 按平台的可执行文件名查找，而不是只找 chrome.exe
+        if not self.find_browser_in_dir(staging_dir, flavor):
+            raise Exception(f"解压结果中未找到 {flavor} 的可执行文件")
+
+        # 可执行文件所在的浏览器根目录，如 chrome-linux、chrome-win
+        executable = self._get_executable(flavor)
+        executable_name = self.executable_name if flavor == CHROMIUM else executable.name
+        browser_dir = executable
+        for _ in Path(executable_name).parts:
+            browser_dir = browser_dir.parent
+        logger.info(f"[BrowserManager] 找到Chrome目录: {browser_dir}")
+        
+        # 如果目标目录存在，先删除
+        target_dir = self.browser_dir(flavor)
+        if target_dir.exists():
+            logger.info(f"[BrowserManager] 删除旧的{target_dir.name}目录")
+            shutil.rmtree(target_dir)
+        
+        logger.info(f"[BrowserManager] 移动 {browser_dir} -> {target_dir}")
+        shutil.move(str(browser_dir), str(target_dir))
+        
+        # 清理解压目录
+        if staging_dir.exists():
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        
+        # 验证安装
+        self.invalidate_discovery(flavor)
+        if self.find_browser_in_dir(target_dir, flavor):
+            logger.info(f"[BrowserManager] 浏览器安装成功: {self._get_executable(flavor)}")
+            return True
+        raise Exception("浏览器安装验证失败")
+
+    async def install_browser(self, flavor=CHROMIUM, progress_callback=None):
+        """下载并安装一种浏览器
+
+        分块并行下载，下载的同时解压已到达的文件；中断后再次调用时继续下载
+        """
+        url = self.get_download_url(flavor)
+        if not url:
+            raise Exception(f"当前平台没有 {flavor}")
+        staging_dir = self.staging_dir(flavor)
+        logger.info(f"[BrowserManager] 开始下载浏览器: {url}")
+        sha256 = await install_archive(
+            url,
+            self.local_browser_dir / f"{flavor}.zip",
+            staging_dir,
+            progress_callback=progress_callback,
+        )
+        logger.info(f"[BrowserManager] 下载并解压完成，sha256: {sha256}")
+        return self.install_extracted(staging_dir, flavor)
     
-    async def ensure_browser(self, progress_callback=None):
-        """确保浏览器可用，如果不存在则下载"""
+    async def ensure_browser(self, progress_callback=None, headless_shell=False):
+        """确保浏览器可用，如果不存在则下载
+
+        headless_shell 为真时（只用于无头爬取）下载更小的 chromium-headless-shell，
+        当前平台没有或安装失败时下载完整的 Chromium
+        """
         # 首先检查并修复临时目录
         self._fix_temp_directories()
         
-        if self.is_browser_installed():
-            return self.get_executable_path()
+        if self.is_browser_installed(headless_shell):
+            return self.get_executable_path(headless_shell)
         
         # 下载浏览器
         if progress_callback:
             await progress_callback(0, 0, 0)  # 开始下载
         
-        zip_path = await self.download_browser(progress_callback)
-        self.extract_browser(zip_path)
+        if headless_shell and self.get_download_url(HEADLESS_SHELL):
+            try:
+                await self.install_browser(HEADLESS_SHELL, progress_callback)
+            except Exception as e:
+                logger.warning(f"[BrowserManager] 安装 {HEADLESS_SHELL} 失败，改为安装完整的 Chromium: {e}")
+                await self.install_browser(CHROMIUM, progress_callback)
+        else:
+            await self.install_browser(CHROMIUM, progress_callback)
         
         # 再次检查是否安装成功
-        if self.is_browser_installed():
-            return self.get_executable_path()
+        if self.is_browser_installed(headless_shell):
+            return self.get_executable_path(headless_shell)
         
         raise Exception("浏览器安装失败")
     
@@ -365,10 +564,11 @@ class BrowserManager:
             
             if result.returncode == 0:
                 # 重新检查浏览器
+                self.invalidate_discovery()
                 return self.is_browser_installed()
             else:
-                print(f"Playwright 安装失败: {result.stderr}")
+                logger.warning(f"Playwright 安装失败: {result.stderr}")
                 return False
         except Exception as e:
-            print(f"运行 playwright install 失败: {e}")
+            logger.warning(f"运行 playwright install 失败: {e}")
             return False
\ No newline at end of file
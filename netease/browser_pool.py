@@ -0,0 +1,172 @@
+"""
+浏览器池，在后台线程的常驻事件循环中提前启动浏览器并准备好上下文，
+多次爬取复用同一个浏览器进程，点击加载后无需等待浏览器冷启动
+"""
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 浏览器池的默认设置
+POOL_DEFAULTS = {
+    "warmContexts": 1,  # 空闲时保持的预热上下文数
+    "maxUses": 5,  # 上下文爬取这么多次后关闭重建
+    "memoryLimitMB": 512,  # 爬取结束时页面JS堆超过此大小则关闭重建上下文
+}
+
+# 读取页面JS堆大小（Chromium 提供 performance.memory）
+HEAP_SIZE_JS = "() => (performance.memory ? performance.memory.usedJSHeapSize : 0)"
+
+
+class BrowserPool:
+    """管理爬虫浏览器的生命周期
+
+    Playwright 对象只能在创建它的事件循环中使用，所以浏览器的启动、爬取和关闭
+    都提交到同一个后台线程的事件循环中执行；crawler 为界面使用的爬虫，
+    每次爬取前从池中取出一个预热的上下文交给它，爬取结束后收回
+    """
+
+    def __init__(self, crawler, settings=None):
+        settings = {**POOL_DEFAULTS, **(settings or {})}
+        self.crawler = crawler
+        self.warm_contexts = max(0, int(settings["warmContexts"]))
+        self.max_uses = max(1, int(settings["maxUses"]))
+        self.memory_limit = int(settings["memoryLimitMB"]) * 1024 * 1024
+        self._idle = []
+        self._loop = None
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        # 在池的事件循环中创建
+        self._launch_lock = None
+        self._closed = False
+
+    # 后台事件循环
+
+    def _ensure_loop(self):
+        with self._thread_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._run_loop, name="BrowserPool", daemon=True
+                )
+                self._thread.start()
+        return self._loop
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def submit(self, coro):
+        """把协程提交到池的事件循环，返回 concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    # 供其他线程调用的接口
+
+    def prelaunch(self):
+        """在后台启动浏览器并准备上下文，立即返回"""
+        if self._closed:
+            return
+        self.submit(self._warm_up()).add_done_callback(self._log_failure)
+
+    def crawl(self, url, ui):
+        """用预热的上下文爬取，阻塞到爬取结束，在爬虫线程中调用"""
+        return self.submit(self._crawl(url, ui)).result()
+
+    def close(self, timeout=10):
+        """关闭浏览器并停止后台事件循环，可重复调用，只有第一次调用会关闭"""
+        with self._thread_lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self._loop is None or self._loop.is_closed() or not self._thread.is_alive():
+            return
+        try:
+            self.submit(self._shutdown()).result(timeout)
+        except Exception as e:
+            logger.warning(f"关闭浏览器池时出错: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self._loop.close()
+
+    @staticmethod
+    def _log_failure(future):
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning(f"预启动浏览器失败: {future.exception()}")
+
+    # 以下在池的事件循环中运行
+
+    async def _ensure_browser(self, ui=None):
+        """浏览器未启动或已断开时启动浏览器"""
+        if self._launch_lock is None:
+            self._launch_lock = asyncio.Lock()
+
+        async with self._launch_lock:
+            browser = self.crawler.browser
+            if browser is not None and not browser.is_connected():
+                logger.warning("浏览器已断开，重新启动")
+                self._idle.clear()
+                await self.crawler._stop_browser()
+            if self.crawler.browser is None:
+                await self.crawler.launch_browser(ui)
+
+    async def _warm_up(self, ui=None):
+        await self._ensure_browser(ui)
+        while len(self._idle) < self.warm_contexts and not self._closed:
+            self._idle.append(await self.crawler.open_session(ui))
+        logger.info(f"浏览器已就绪，预热上下文 {len(self._idle)} 个")
+
+    async def _acquire(self, ui):
+        await self._ensure_browser(ui)
+        if self._idle:
+            return self._idle.pop()
+        return await self.crawler.open_session(ui)
+
+    async def _heap_size(self, session):
+        try:
+            return await session.page.evaluate(HEAP_SIZE_JS)
+        except Exception:
+            return 0
+
+    async def _release(self, session):
+        """收回上下文，使用次数或内存超出限制时关闭"""
+        session.uses += 1
+        heap_size = await self._heap_size(session)
+        if (
+            self._closed
+            or session.uses >= self.max_uses
+            or heap_size > self.memory_limit
+            or len(self._idle) >= self.warm_contexts
+        ):
+            logger.info(
+                f"关闭浏览器上下文 (已使用 {session.uses} 次, JS堆 {heap_size / 1024 / 1024:.0f}MB)"
+            )
+            await session.close()
+            return
+
+        # 离开用户页面，释放页面占用的内存
+        try:
+            await session.page.goto("about:blank")
+        except Exception:
+            await session.close()
+            return
+        self._idle.append(session)
+
+    async def _crawl(self, url, ui):
+        session = await self._acquire(ui)
+        self.crawler.attach_session(session)
+        try:
+            return await self.crawler.crawl(url, ui)
+        finally:
+            self.crawler.detach_session()
+            await self._release(session)
+            if not self._closed:
+                # 为下次爬取补充预热的上下文
+                self._loop.create_task(self._warm_up()).add_done_callback(self._log_failure)
+
+    async def _shutdown(self):
+        idle, self._idle = self._idle, []
+        for session in idle:
+            await session.close()
+        await self.crawler.close()
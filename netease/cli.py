@@ -0,0 +1,244 @@
+"""
+命令行入口，无需图形界面即可爬取动态并导出
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import sys
+
+from .article_store import ArticleStore
+from .crawl_pool import CrawlPool, CrawlSink
+from .crawler import NetEaseCrawler
+from .exporter import HTML_TEMPLATES, IMAGE_MODES, copy_to_clipboard, export_to_html
+from .log import configure_logging
+from .models import Article, json_default
+from .sharded_export import export_sharded_html
+
+
+def build_parser():
+    """构造命令行参数解析器"""
+    parser = argparse.ArgumentParser(
+        prog="netease_note_backup",
+        description="网易云音乐笔记(个人动态)备份工具命令行版本",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    crawl = subparsers.add_parser("crawl", help="爬取用户动态并逐行输出为JSONL")
+    crawl.add_argument(
+        "--user", dest="users", action="append", required=True,
+        help="用户ID，可重复指定以同时爬取多个用户",
+    )
+    crawl.add_argument("--out", default="-", help="输出的JSONL文件，默认为标准输出")
+    crawl.add_argument(
+        "--mode", choices=("scroll", "api"), default="scroll",
+        help="抓取方式: scroll 滚动页面, api 直接分页请求动态接口",
+    )
+    crawl.add_argument("--concurrency", type=int, default=2, help="同时爬取的用户数")
+    crawl.add_argument(
+        "--no-capture", action="store_true", help="不捕获接口响应，只从页面提取"
+    )
+    crawl.add_argument(
+        "--no-block", action="store_true", help="不拦截图片、字体等资源"
+    )
+    crawl.add_argument(
+        "--full-chromium", action="store_true",
+        help="使用完整的 Chromium，而不是更轻量的 chromium-headless-shell",
+    )
+    crawl.add_argument("--db", help="本地文章库路径，指定后爬取结果会写入库中")
+    crawl.add_argument(
+        "--incremental", action="store_true",
+        help="增量爬取，有过完整爬取时遇到库中已有的文章后停止，并补齐库中的旧文章",
+    )
+    crawl.add_argument("--verbose", action="store_true", help="输出详细进度")
+
+    export = subparsers.add_parser("export", help="将JSONL文件中的动态导出")
+    export_subparsers = export.add_subparsers(dest="format", required=True)
+
+    export_html = export_subparsers.add_parser("html", help="导出为HTML文件")
+    export_html.add_argument("--out", required=True, help="输出的HTML文件")
+    export_html.add_argument(
+        "--template", choices=HTML_TEMPLATES, default="classic",
+        help="HTML模板: classic 直接输出所有动态, viewer 只渲染可见动态的单文件查看器",
+    )
+    _add_html_arguments(export_html)
+
+    export_pages = export_subparsers.add_parser(
+        "pages", help="分页导出为多个HTML页面和索引页，适合大量动态"
+    )
+    export_pages.add_argument(
+        "--out", required=True, help="输出目录，再次导出到同一目录时只重新生成有变化的页面"
+    )
+    export_pages.add_argument("--page-size", type=int, default=500, help="每页的动态数")
+    _add_html_arguments(export_pages)
+
+    export_text = export_subparsers.add_parser("text", help="导出为纯文本")
+    export_text.add_argument("--in", dest="input", required=True, help="JSONL文件")
+    export_text.add_argument("--out", default="-", help="输出的文本文件，默认为标准输出")
+    export_text.add_argument("--user", help="只导出指定用户的动态")
+
+    return parser
+
+
+def _add_html_arguments(parser):
+    """HTML导出和分页导出共用的参数"""
+    parser.add_argument("--in", dest="input", required=True, help="JSONL文件")
+    parser.add_argument("--user", help="只导出指定用户的动态")
+    parser.add_argument("--image-size", type=int, default=100, help="图片大小(px)")
+    parser.add_argument(
+        "--image-mode", choices=IMAGE_MODES, default="base64",
+        help="图片保存方式: base64 内嵌到HTML, assets 保存到HTML旁的assets目录, link 使用原始链接",
+    )
+    parser.add_argument(
+        "--no-base64", action="store_true", help="使用原始图片链接，等同于 --image-mode link"
+    )
+    parser.add_argument(
+        "--no-thumbnails", action="store_true", help="不生成缩略图，列表中直接显示原图"
+    )
+    parser.add_argument(
+        "--thumbnail-format", choices=("webp", "jpeg"), default="webp", help="缩略图格式"
+    )
+    parser.add_argument(
+        "--thumbnail-quality", type=int, default=80, help="缩略图编码质量(1-100)"
+    )
+    parser.add_argument(
+        "--no-originals", action="store_true",
+        help="不保存原图，只下载缩略图，点击图片时打开原图的在线链接",
+    )
+    parser.add_argument("--verbose", action="store_true", help="输出详细进度")
+
+
+def _log(message):
+    """进度信息输出到标准错误，避免混入标准输出的数据"""
+    print(message, file=sys.stderr, flush=True)
+
+
+@contextlib.contextmanager
+def _open_output(path):
+    """打开输出文件，"-" 表示标准输出"""
+    if path == "-":
+        yield sys.stdout
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            yield f
+
+
+def read_articles(path, user_id=None):
+    """从JSONL文件读取文章，可按用户ID过滤，返回 Article 列表"""
+    articles = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            article = json.loads(line)
+            if user_id and str(article.get("user_id")) != str(user_id):
+                continue
+            articles.append(Article.from_value(article))
+    return articles
+
+
+async def run_crawl(args, output):
+    """爬取所有指定用户，每提取到一篇文章立即写入一行JSON"""
+
+    def write_article(sink, article):
+        record = {"user_id": sink.user_id, **article}
+        output.write(json.dumps(record, ensure_ascii=False, default=json_default) + "\n")
+        output.flush()
+
+    def report_status(sink, message):
+        if args.verbose:
+            _log(f"[{sink.user_id}] {message}")
+
+    crawler = NetEaseCrawler()
+    crawler.crawl_mode = args.mode
+    crawler.capture_responses = not args.no_capture
+    crawler.block_resources = not args.no_block
+    crawler.prefer_headless_shell = not args.full_chromium
+    if args.db or args.incremental:
+        crawler.store = ArticleStore(args.db)
+        crawler.incremental = args.incremental
+
+    pool = CrawlPool(
+        crawler,
+        concurrency=args.concurrency,
+        on_article=write_article,
+        on_status=report_status,
+    )
+    try:
+        sinks = await pool.run(args.users)
+    finally:
+        pool.stop()
+        await crawler.close()
+        if crawler.store:
+            crawler.store.close()
+
+    failed = 0
+    for sink in sinks:
+        if sink.error:
+            failed += 1
+            _log(f"[{sink.user_id}] 爬取失败: {sink.error}")
+        else:
+            _log(f"[{sink.user_id}] 共获取 {len(sink.articles)} 篇文章")
+    return 1 if failed else 0
+
+
+def crawl_command(args):
+    with _open_output(args.out) as output:
+        # 爬虫的调试输出写到标准错误，保证标准输出只有JSONL数据
+        with contextlib.redirect_stdout(sys.stderr):
+            return asyncio.run(run_crawl(args, output))
+
+
+def export_command(args):
+    articles = read_articles(args.input, args.user)
+    _log(f"读取到 {len(articles)} 篇文章")
+
+    if args.format == "text":
+        with _open_output(args.out) as output:
+            output.write(copy_to_clipboard(articles) + "\n")
+        return 0
+
+    def report_status(sink, message):
+        if args.verbose:
+            _log(message)
+
+    image_mode = "link" if args.no_base64 else args.image_mode
+    settings = {
+        "imageSize": args.image_size,
+        "imageMode": image_mode,
+        "thumbnails": not args.no_thumbnails,
+        "thumbnailFormat": args.thumbnail_format,
+        "thumbnailQuality": args.thumbnail_quality,
+        "embedOriginals": not args.no_originals,
+    }
+    status = CrawlSink(on_status=report_status)
+    with contextlib.redirect_stdout(sys.stderr):
+        if args.format == "pages":
+            settings["pageSize"] = args.page_size
+            output = asyncio.run(export_sharded_html(articles, args.out, settings, status))
+        else:
+            settings["htmlTemplate"] = args.template
+            output = asyncio.run(export_to_html(articles, args.out, settings, status))
+    _log(f"已导出到 {output}")
+    return 0
+
+
+def main(argv=None):
+    """命令行入口"""
+    args = build_parser().parse_args(argv)
+    # 日志输出到标准错误，未指定 --verbose 时只显示警告和错误
+    configure_logging(logging.INFO if args.verbose else logging.WARNING)
+
+    try:
+        if args.command == "crawl":
+            return crawl_command(args)
+        return export_command(args)
+    except KeyboardInterrupt:
+        _log("已中断")
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
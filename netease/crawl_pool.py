@@ -0,0 +1,94 @@
+"""
+并发爬取模块，在同一个浏览器进程中同时爬取多个用户
+"""
+import asyncio
+import logging
+
+from .event_api import build_user_url
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlSink:
+    """无界面的爬取结果接收器
+
+    实现爬虫所需的 add_update 和 articles 接口，每个用户的爬取各用一个
+    """
+
+    def __init__(self, user_id=None, on_article=None, on_status=None):
+        self.user_id = user_id
+        self.articles = []
+        self.total_articles = None
+        self.status = ""
+        self.error = None
+        self.on_article = on_article
+        self.on_status = on_status
+
+    def add_update(self, update_type, **kwargs):
+        """接收爬虫推送的更新"""
+        if update_type == "new_article":
+            article = kwargs.get("article")
+            if article:
+                self.articles.append(article)
+                if self.on_article:
+                    self.on_article(self, article)
+        elif update_type == "articles":
+            self.articles = list(kwargs.get("data", []))
+        elif update_type == "status":
+            self.status = kwargs.get("message", "")
+            if self.on_status:
+                self.on_status(self, self.status)
+        elif update_type == "total_count":
+            self.total_articles = kwargs.get("count")
+
+
+class CrawlPool:
+    """在共享浏览器上按并发上限同时爬取多个用户
+
+    每个用户使用 NetEaseCrawler.spawn 创建的独立爬虫，拥有各自的上下文、
+    去重集合、终止标志和结果接收器
+    """
+
+    def __init__(self, crawler, concurrency=4, on_article=None, on_status=None):
+        self.crawler = crawler
+        self.concurrency = max(1, concurrency)
+        self.on_article = on_article
+        self.on_status = on_status
+        self.stopped = False
+        self._workers = set()
+
+    async def run(self, user_ids, ui=None):
+        """爬取所有用户，按输入顺序返回每个用户的 CrawlSink"""
+        await self.crawler.launch_browser(ui)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = [self._crawl_user(user_id, semaphore) for user_id in user_ids]
+        return await asyncio.gather(*tasks)
+
+    async def _crawl_user(self, user_id, semaphore):
+        sink = CrawlSink(user_id, on_article=self.on_article, on_status=self.on_status)
+
+        async with semaphore:
+            if self.stopped:
+                sink.error = "已终止"
+                return sink
+
+            worker = self.crawler.spawn()
+            self._workers.add(worker)
+            try:
+                await worker.crawl(build_user_url(user_id), sink)
+            except Exception as e:
+                sink.error = str(e)
+                sink.add_update("status", message=f"爬取失败: {e}")
+                logger.exception(f"[{user_id}] 爬取失败")
+            finally:
+                self._workers.discard(worker)
+                await worker.close()
+
+        return sink
+
+    def stop(self):
+        """终止所有正在进行和尚未开始的爬取"""
+        self.stopped = True
+        for worker in list(self._workers):
+            worker.stop_crawling = True
@@ -1,15 +1,33 @@
 import asyncio
 from playwright.async_api import async_playwright
-import re
 import time
-import base64
 import os
-import io
+import logging
 import sys
 from urllib.parse import urlparse, parse_qs
 from bs4 import BeautifulSoup
-import traceback
 from .browser_manager import BrowserManager
+from .event_api import (
+    build_event_list_request,
+    clean_image_url,
+    content_article_id,
+    event_id_from_href,
+    extract_user_id,
+    is_stable_article_id,
+    is_event_list_url,
+    parse_event_list,
+)
+from .exporter import (
+    convert_image_to_base64 as fetch_image_as_base64,
+    create_image_session,
+    open_image_cache,
+)
+from .id_set import CompactIdSet
+from .models import Article
+from .resource_filter import ResourceBlocker
+from .scroll_scheduler import AdaptiveScrollScheduler
+
+logger = logging.getLogger(__name__)
 
 if getattr(sys, "frozen", False):
     # 禁用 Playwright 的日志输出
@@ -18,64 +36,201 @@ if getattr(sys, "frozen", False):
     os.environ["PLAYWRIGHT_BROWSERS_PATH"] = "0"
 
 
-# 处理打包后的GUI版本没有控制台的问题
-class SafePrint:
-    def __init__(self):
-        self.has_console = hasattr(sys, "stdout") and sys.stdout is not None
-
-    def write(self, data):
-        if self.has_console:
-            try:
-                sys.stdout.write(data)
-            except:
-                pass
-
-    def flush(self):
-        if self.has_console:
-            try:
-                sys.stdout.flush()
-            except:
-                pass
-
-
 # 如果是打包的GUI版本，重定向输出
 if getattr(sys, "frozen", False):
-    # 创建空的文件对象，避免None引起的问题
+    # 写入空设备，避免None引起的问题，也不会像内存缓冲区一样不断增长
     if not sys.stdout:
-        sys.stdout = io.StringIO()
+        sys.stdout = open(os.devnull, "w", encoding="utf-8")
     if not sys.stderr:
-        sys.stderr = io.StringIO()
+        sys.stderr = open(os.devnull, "w", encoding="utf-8")
+
+
+# 已提取节点的标记属性名
+SEEN_MARKER = "data-nb-seen"
+
+# 在iframe内运行：提取所有未标记的.dcntc节点并打上标记，只返回新节点的结构化数据
+EXTRACT_NEW_ARTICLES_JS = """
+(marker) => {
+    const results = [];
+    const nodes = document.querySelectorAll(`.dcntc:not([${marker}])`);
+    for (const elem of nodes) {
+        const timeElem = elem.querySelector('.time');
+        const textElem = elem.querySelector('.text');
+        // 内容尚未渲染完整的节点不打标记，留待下次提取
+        if (!timeElem || !textElem) continue;
+
+        const timeLink = timeElem.querySelector('a');
+        const time = (timeLink || timeElem).textContent.trim();
+        // 时间链接指向动态详情页，其中带有动态ID
+        const href = timeLink ? timeLink.getAttribute('href') || '' : '';
+
+        let song = null;
+        const titleElem = elem.querySelector('.src .scnt .tit a');
+        const artistElem = elem.querySelector('.src .scnt .from a');
+        if (titleElem && artistElem) {
+            song = {
+                title: titleElem.textContent,
+                href: titleElem.getAttribute('href') || '',
+                artist: artistElem.textContent,
+                artistHref: artistElem.getAttribute('href') || '',
+            };
+        }
+
+        let imageElems = Array.from(elem.querySelectorAll('.pics .pic img'));
+        if (imageElems.length === 0) {
+            imageElems = Array.from(elem.querySelectorAll('.cover .lnk img')).slice(0, 1);
+        }
+        const images = imageElems
+            .map(img => img.getAttribute('src'))
+            .filter(src => src);
+
+        elem.setAttribute(marker, '1');
+        results.push({ time, href, text: textElem.innerHTML.trim(), song, images });
+    }
+    return results;
+}
+"""
+
+
+class BrowserSession:
+    """一个浏览器上下文及其页面，可在多次爬取之间复用"""
+
+    __slots__ = ("context", "page", "resource_blocker", "uses")
+
+    def __init__(self, context, page, resource_blocker=None):
+        self.context = context
+        self.page = page
+        self.resource_blocker = resource_blocker
+        # 已用于爬取的次数
+        self.uses = 0
+
+    async def close(self):
+        for target in (self.page, self.context):
+            if target:
+                try:
+                    await target.close()
+                except Exception:
+                    pass
+        self.page = None
+        self.context = None
 
 
 class NetEaseCrawler:
-    def __init__(self):
+    # spawn 创建的爬虫沿用的抓取设置
+    SHARED_SETTINGS = (
+        "incremental_extraction",
+        "capture_responses",
+        "capture_wait_timeout",
+        "crawl_mode",
+        "api_page_delay",
+        "api_max_retries",
+        "block_resources",
+        "store",
+        "incremental",
+        "known_stop_threshold",
+    )
+
+    def __init__(self, browser_manager=None):
+        self.playwright = None
         self.browser = None
+        # 浏览器是否由本爬虫启动，决定关闭时是否一并关闭浏览器
+        self.owns_browser = True
         self.context = None
         self.page = None
         self.is_initialized = False
-        self.processed_ids = set()
+        # 已处理的文章ID，以64位整数保存
+        self.processed_ids = CompactIdSet()
+        # 本次爬取文章的内容ID，用于识别本地库中旧格式ID的重复文章
+        self.content_ids = CompactIdSet()
         self.stop_crawling = False
-        self.browser_manager = BrowserManager()
-
-    def _safe_print(self, message):
-        """安全的打印函数，避免在GUI版本中出现问题"""
-        try:
-            print(message)
-        except:
-            pass
+        # 是否在页面内增量提取文章（关闭则每次整页解析HTML）
+        self.incremental_extraction = True
+        # 是否监听动态列表接口的响应直接解析文章（DOM提取作为回退）
+        self.capture_responses = True
+        # 等待首个动态列表响应的秒数，超时则回退到DOM提取
+        self.capture_wait_timeout = 5
+        # 抓取方式: scroll 滚动页面; api 加载一次页面后直接分页请求动态接口
+        self.crawl_mode = "scroll"
+        # api 模式下每页请求之间的间隔秒数，以及单页失败时的重试次数
+        self.api_page_delay = 0.3
+        self.api_max_retries = 3
+        # 是否拦截图片、字体等爬取用不到的资源，白名单为始终放行的URL正则
+        self.block_resources = True
+        self.resource_allowlist = []
+        self.resource_blocker = None
+        # 本地文章库（ArticleStore），设置后爬到的文章会写入库中
+        self.store = None
+        # 增量爬取：该用户有过完整爬取时，连续遇到这么多篇库中已有的文章后停止，
+        # 并补齐库中的旧文章；没有完整爬取记录时完整爬取
+        self.incremental = False
+        self.known_stop_threshold = 20
+        self._reset_store_run(None)
+        # 本次爬取是否因出错或达到滚动上限而没有爬到动态列表末尾
+        self.crawl_incomplete = False
+        # 转换图片时按需创建的HTTP会话和磁盘图片缓存，关闭爬虫时一并关闭
+        self._image_session = None
+        self._image_cache = None
+        self._reset_capture()
+        self.browser_manager = browser_manager or BrowserManager()
+        # 是否无头运行，无头时优先使用更轻量的 chromium-headless-shell
+        self.headless = True
+        self.prefer_headless_shell = True
+
+    @property
+    def use_headless_shell(self):
+        """启动浏览器时是否优先使用 chromium-headless-shell"""
+        return self.headless and self.prefer_headless_shell
 
     async def initialize(self, ui=None):
         if self.is_initialized:
-            self._safe_print("[Crawler] 浏览器已初始化，跳过")
+            logger.info("[Crawler] 浏览器已初始化，跳过")
+            return
+
+        logger.info("[Crawler] 正在初始化浏览器...")
+
+        # 由 spawn 创建的爬虫共享父爬虫已启动的浏览器
+        if not self.browser:
+            await self.launch_browser(ui)
+
+        try:
+            await self.create_page(ui)
+
+            self.is_initialized = True
+            logger.info("[Crawler] 浏览器初始化完成")
+            if ui:
+                ui.add_update("status", message="浏览器初始化完成")
+
+        except Exception as e:
+            error_msg = f"初始化失败: {str(e)}"
+            logger.exception(f"[Crawler] {error_msg}")
+
+            if ui:
+                ui.add_update("status", message=f"错误: {error_msg}")
+
+            # 清理资源
+            if self.context:
+                try:
+                    await self.context.close()
+                except:
+                    pass
+                self.context = None
+
+            if self.owns_browser:
+                await self._stop_browser()
+
+            raise Exception(f"无法初始化浏览器: {e}")
+
+    async def launch_browser(self, ui=None):
+        """启动 Playwright 和浏览器进程"""
+        if self.browser:
             return
 
-        self._safe_print("[Crawler] 正在初始化浏览器...")
         if ui:
             ui.add_update("status", message="检查浏览器...")
 
         # 获取浏览器路径
-        browser_path = self.browser_manager.get_executable_path()
-        self._safe_print(f"[Crawler] 浏览器路径: {browser_path}")
+        browser_path = self.browser_manager.get_executable_path(self.use_headless_shell)
+        logger.info(f"[Crawler] 浏览器路径: {browser_path}")
 
         if not browser_path:
             error_msg = "未找到浏览器可执行文件"
@@ -92,16 +247,16 @@ class NetEaseCrawler:
 
         try:
             # 启动 Playwright
-            self._safe_print("[Crawler] 启动Playwright...")
+            logger.info("[Crawler] 启动Playwright...")
             if ui:
                 ui.add_update("status", message="启动浏览器框架...")
             self.playwright = await async_playwright().start()
-            self._safe_print("[Crawler] Playwright启动成功")
+            logger.info("[Crawler] Playwright启动成功")
 
             # 创建浏览器实例 - 使用更多调试选项
             launch_options = {
                 "executable_path": browser_path,
-                "headless": True,
+                "headless": self.headless,
                 "args": [
                     "--no-sandbox",
                     "--disable-setuid-sandbox",
@@ -122,83 +277,42 @@ class NetEaseCrawler:
                 "handle_sighup": False,
             }
 
-            self._safe_print(f"[Crawler] 启动参数: {launch_options}")
-            self._safe_print("[Crawler] 启动浏览器...")
+            logger.debug("[Crawler] 启动参数: %s", launch_options)
+            logger.info("[Crawler] 启动浏览器...")
             if ui:
                 ui.add_update("status", message="启动浏览器进程...")
 
             try:
                 self.browser = await self.playwright.chromium.launch(**launch_options)
-                self._safe_print("[Crawler] 浏览器启动成功")
+                logger.info("[Crawler] 浏览器启动成功")
                 if ui:
                     ui.add_update("status", message="浏览器启动成功")
             except Exception as e:
-                self._safe_print(f"[Crawler] 浏览器启动失败: {e}")
+                logger.warning(f"[Crawler] 浏览器启动失败: {e}")
                 if ui:
                     ui.add_update("status", message=f"浏览器启动失败: {str(e)}")
 
                 # 尝试使用默认参数
-                self._safe_print("[Crawler] 尝试使用简化参数...")
+                logger.info("[Crawler] 尝试使用简化参数...")
                 launch_options = {
                     "executable_path": browser_path,
-                    "headless": True,
+                    "headless": self.headless,
                     "args": ["--no-sandbox", "--disable-setuid-sandbox"],
                 }
                 self.browser = await self.playwright.chromium.launch(**launch_options)
-                self._safe_print("[Crawler] 使用简化参数启动成功")
+                logger.info("[Crawler] 使用简化参数启动成功")
                 if ui:
                     ui.add_update("status", message="使用简化参数启动成功")
 
-            # 创建浏览器上下文
-            self._safe_print("[Crawler] 创建浏览器上下文...")
-            if ui:
-                ui.add_update("status", message="创建浏览器上下文...")
-            self.context = await self.browser.new_context(
-                viewport={"width": 1920, "height": 1080},
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/112.0.0.0 Safari/537.36",
-                locale="zh-CN",
-                timezone_id="Asia/Shanghai",
-                accept_downloads=False,
-                bypass_csp=True,
-            )
-            self._safe_print("[Crawler] 上下文创建成功")
-
-            # 创建新页面
-            self._safe_print("[Crawler] 创建新页面...")
-            if ui:
-                ui.add_update("status", message="创建新页面...")
-            self.page = await self.context.new_page()
-            self._safe_print("[Crawler] 页面创建成功")
-
-            # 设置页面超时
-            self.page.set_default_timeout(30000)  # 30秒
-
-            self.is_initialized = True
-            self._safe_print("[Crawler] 浏览器初始化完成")
-            if ui:
-                ui.add_update("status", message="浏览器初始化完成")
-
         except Exception as e:
             error_msg = f"初始化失败: {str(e)}"
-            self._safe_print(f"[Crawler] {error_msg}")
-            if not getattr(sys, "frozen", False):
-                traceback.print_exc()
+            logger.exception(f"[Crawler] {error_msg}")
 
             if ui:
                 ui.add_update("status", message=f"错误: {error_msg}")
 
             # 清理资源
-            if hasattr(self, "browser") and self.browser:
-                try:
-                    await self.browser.close()
-                except:
-                    pass
-
-            if hasattr(self, "playwright") and self.playwright:
-                try:
-                    await self.playwright.stop()
-                except:
-                    pass
+            await self._stop_browser()
 
             # 提供更详细的错误信息
             if "executable doesn't exist" in str(e):
@@ -208,6 +322,95 @@ class NetEaseCrawler:
             else:
                 raise Exception(f"无法初始化浏览器: {e}")
 
+    async def open_session(self, ui=None):
+        """在已启动的浏览器中创建独立的上下文和页面，返回 BrowserSession"""
+        # 创建浏览器上下文
+        logger.info("[Crawler] 创建浏览器上下文...")
+        if ui:
+            ui.add_update("status", message="创建浏览器上下文...")
+        context = await self.browser.new_context(
+            viewport={"width": 1920, "height": 1080},
+            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/112.0.0.0 Safari/537.36",
+            locale="zh-CN",
+            timezone_id="Asia/Shanghai",
+            accept_downloads=False,
+            bypass_csp=True,
+        )
+        logger.info("[Crawler] 上下文创建成功")
+
+        session = BrowserSession(context, None)
+        try:
+            # 拦截无用资源并统计流量
+            if self.block_resources:
+                session.resource_blocker = ResourceBlocker(allowlist=self.resource_allowlist)
+                await session.resource_blocker.install(context)
+                logger.info("[Crawler] 已启用资源拦截")
+
+            # 创建新页面
+            logger.info("[Crawler] 创建新页面...")
+            if ui:
+                ui.add_update("status", message="创建新页面...")
+            session.page = await context.new_page()
+            logger.info("[Crawler] 页面创建成功")
+        except Exception:
+            await session.close()
+            raise
+
+        # 设置页面超时
+        session.page.set_default_timeout(30000)  # 30秒
+        return session
+
+    async def create_page(self, ui=None):
+        """创建上下文和页面并供本爬虫使用"""
+        self.attach_session(await self.open_session(ui))
+
+    def attach_session(self, session):
+        """使用已创建的上下文和页面，之后的爬取无需再初始化浏览器"""
+        self.context = session.context
+        self.page = session.page
+        self.resource_blocker = session.resource_blocker
+        self.is_initialized = True
+
+    def detach_session(self):
+        """交还正在使用的上下文和页面，不关闭它们"""
+        self.context = None
+        self.page = None
+        self.resource_blocker = None
+        self.is_initialized = False
+
+    def spawn(self):
+        """创建一个共享本爬虫浏览器的新爬虫
+
+        新爬虫使用独立的上下文、页面、去重集合和终止标志，可与其他爬虫并发运行；
+        关闭时只关闭自己的上下文，不会关闭共享的浏览器
+        """
+        worker = NetEaseCrawler(browser_manager=self.browser_manager)
+        worker.playwright = self.playwright
+        worker.browser = self.browser
+        worker.owns_browser = False
+
+        for name in self.SHARED_SETTINGS:
+            setattr(worker, name, getattr(self, name))
+        worker.resource_allowlist = list(self.resource_allowlist)
+
+        return worker
+
+    async def _stop_browser(self):
+        """关闭浏览器并停止 Playwright"""
+        if self.browser:
+            try:
+                await self.browser.close()
+            except:
+                pass
+            self.browser = None
+
+        if self.playwright:
+            try:
+                await self.playwright.stop()
+            except:
+                pass
+            self.playwright = None
+
     async def close(self):
         """关闭爬虫并清理所有资源"""
         try:
@@ -230,72 +433,420 @@ class NetEaseCrawler:
                     pass
                 self.context = None
             
-            # 关闭浏览器
-            if self.browser:
-                try:
-                    await self.browser.close()
-                except:
-                    pass
+            # 关闭浏览器，共享的浏览器由创建它的爬虫负责关闭
+            if self.owns_browser:
+                await self._stop_browser()
+                logger.info("浏览器已关闭")
+            else:
                 self.browser = None
-            
-            # 停止 Playwright
-            if hasattr(self, 'playwright') and self.playwright:
-                try:
-                    await self.playwright.stop()
-                except:
-                    pass
                 self.playwright = None
-            
+
+            await self._close_image_fetcher()
             self.is_initialized = False
-            self._safe_print("浏览器已关闭")
             
         except Exception as e:
-            self._safe_print(f"关闭爬虫时出错: {e}")
+            logger.warning(f"关闭爬虫时出错: {e}")
+
+    async def _close_image_fetcher(self):
+        """关闭图片会话，并提交缓存中尚未写入的索引"""
+        if self._image_session:
+            await self._image_session.close()
+            self._image_session = None
+        if self._image_cache:
+            self._image_cache.close()
+        self._image_cache = None
+
+    def _reset_capture(self):
+        """重置接口响应捕获状态"""
+        # pending: 等待首个响应; active: 使用接口数据; off: 使用DOM提取
+        self.capture_state = "off"
+        self.capture_exhausted = False
+        # 最近一次捕获的接口请求头和分页游标，供 api 模式续接
+        self.captured_request_headers = {}
+        self.captured_cursor = None
+        self._capture_ready = None
+        self._capture_handler = None
+
+    def start_response_capture(self, ui):
+        """在页面上挂载响应监听，捕获动态列表接口返回的JSON"""
+        self._reset_capture()
+        if not self.capture_responses:
+            return
+
+        self.capture_state = "pending"
+        self._capture_ready = asyncio.Event()
+
+        async def handler(response):
+            await self.handle_event_response(response, ui)
+
+        self._capture_handler = handler
+        self.page.on("response", handler)
+
+    def stop_response_capture(self):
+        """移除响应监听"""
+        if self._capture_handler and self.page:
+            try:
+                self.page.remove_listener("response", self._capture_handler)
+            except Exception:
+                pass
+        self._capture_handler = None
+
+    async def wait_for_captured_events(self):
+        """等待首个动态列表响应，超时则关闭捕获并回退到DOM提取"""
+        if self.capture_state != "pending":
+            return self.capture_state == "active"
+
+        try:
+            await asyncio.wait_for(
+                self._capture_ready.wait(), timeout=self.capture_wait_timeout
+            )
+        except asyncio.TimeoutError:
+            pass
+
+        if self.capture_state != "active":
+            logger.info("未捕获到动态列表接口响应，回退到DOM提取")
+            self.capture_state = "off"
+            self.stop_response_capture()
+            return False
+
+        logger.info("已捕获动态列表接口响应，直接解析接口数据")
+        return True
+
+    async def handle_event_response(self, response, ui):
+        """解析动态列表接口响应并登记其中的文章"""
+        if self.capture_state == "off" or not is_event_list_url(response.url):
+            return
+
+        try:
+            if response.status != 200:
+                return
+            payload = await response.json()
+        except Exception as e:
+            logger.warning(f"解析动态列表响应失败: {e}")
+            return
+
+        # 等待响应期间可能已经回退到DOM提取
+        if self.capture_state == "off":
+            return
+
+        # 风控等错误也以HTTP 200返回，其中没有文章，不能当作列表已到末尾
+        code = payload.get("code") if isinstance(payload, dict) else None
+        if code != 200:
+            logger.warning(f"动态列表接口返回错误: {code}，回退到DOM提取")
+            if self.capture_state == "active":
+                self.capture_state = "off"
+                self.stop_response_capture()
+            else:
+                # 唤醒 wait_for_captured_events，由它回退到DOM提取
+                self._capture_ready.set()
+            return
+
+        articles, more, cursor = parse_event_list(payload)
+        logger.info(f"捕获到动态列表响应，包含 {len(articles)} 篇文章")
+
+        try:
+            self.captured_request_headers = response.request.headers
+        except Exception:
+            self.captured_request_headers = {}
+        self.captured_cursor = cursor
+
+        for article in articles:
+            self.register_article(
+                article["time"],
+                article["text"],
+                article["song"],
+                article["images"],
+                ui,
+                article_id=article["id"],
+            )
+
+        if not more:
+            self.capture_exhausted = True
+
+        self.capture_state = "active"
+        self._capture_ready.set()
+
+    def traffic_summary(self):
+        """本次爬取的请求数和下载量，未启用资源拦截时为空"""
+        if not self.resource_blocker:
+            return ""
+        return f"，{self.resource_blocker.summary()}"
+
+    def _reset_store_run(self, user_id):
+        """重置与本地文章库相关的单次爬取状态"""
+        self.user_id = user_id
+        self.reached_known = False
+        self._stop_on_known = False
+        self._known_streak = 0
+        self._run_id = None
+        self._run_position = 0
+        self._run_added = 0
+
+    def store_article(self, article):
+        """将文章写入本地库，返回文章是否是库中已有的旧文章
+
+        库中已有的文章移到本次爬取中的位置，使库中的顺序与页面一致
+        """
+        position = self._run_position
+        self._run_position += 1
+        if self.store.contains(self.user_id, article["id"]):
+            self.store.move(self.user_id, article["id"], self._run_id, position)
+            self._known_streak += 1
+            if self._stop_on_known and self._known_streak >= self.known_stop_threshold:
+                if not self.reached_known:
+                    logger.info(
+                        f"连续 {self._known_streak} 篇文章已在本地库中，停止爬取"
+                    )
+                self.reached_known = True
+            return True
+
+        self._known_streak = 0
+        self.store.add(self.user_id, article, self._run_id, position)
+        self._run_added += 1
+        return False
+
+    def merge_stored_articles(self, ui, completed):
+        """增量爬取结束后，把本次没有爬到的库中文章接在爬到的文章之后推送"""
+        stored = self.store.load(self.user_id)
+        merged = 0
+        for article in stored:
+            # 本次爬到的文章已经推送过
+            if article["id"] in self.processed_ids:
+                continue
+            # 旧版本按"时间-正文开头"生成的ID与新ID不同，按内容判断是否重复
+            if not is_stable_article_id(article["id"]) and self.generate_element_id(
+                article["time"], article["text"], article["song"], article["images"]
+            ) in self.content_ids:
+                continue
+            self.processed_ids.add(article["id"])
+            ui.add_update("new_article", article=article)
+            merged += 1
+
+        if not completed:
+            message = f"爬取未完成，新增 {self._run_added} 篇，本地库中另有 {merged} 篇"
+        elif self._stop_on_known:
+            message = f"增量爬取完成，新增 {self._run_added} 篇，本地库中另有 {merged} 篇"
+        else:
+            message = f"完整爬取完成，新增 {self._run_added} 篇，本地库中另有 {merged} 篇"
+        ui.add_update("status", message=message)
 
     async def crawl(self, url, ui):
+        # 文章ID稳定，每次爬取重新去重，跨次爬取的去重由本地库负责
+        self.processed_ids.clear()
+        self.content_ids.clear()
+        self.crawl_incomplete = False
+        if self.resource_blocker:
+            self.resource_blocker.reset()
+
+        if not self.store:
+            return await self._crawl_with_mode(url, ui)
+
+        self._reset_store_run(extract_user_id(url))
+        if not self.user_id:
+            raise ValueError(f"无法从URL中解析用户ID: {url}")
+        # 只有以前完整爬取过，才能确定追上的旧文章之后的文章都已在库中
+        self._stop_on_known = self.incremental and self.store.has_completed_run(self.user_id)
+        if self.incremental and not self._stop_on_known:
+            logger.info("本地库中没有该用户的完整爬取记录，本次完整爬取")
+            ui.add_update("status", message="本地库中没有完整爬取记录，本次完整爬取")
+        self._run_id = self.store.begin_run(self.user_id)
+
+        completed = False
+        try:
+            articles = await self._crawl_with_mode(url, ui)
+            completed = not (self.stop_crawling or self.crawl_incomplete)
+        finally:
+            self.store.end_run(self._run_id, completed)
+
+        if self.incremental and not self.stop_crawling:
+            self.merge_stored_articles(ui, completed)
+        return articles
+
+    async def _crawl_with_mode(self, url, ui):
+        """按 crawl_mode 选择抓取方式"""
+        if self.crawl_mode == "api":
+            return await self.crawl_via_api(url, ui)
+        return await self.crawl_via_scroll(url, ui)
+
+    async def crawl_via_scroll(self, url, ui):
+        """加载用户页面并滚动到底部提取全部文章"""
         await self.initialize(ui)
 
         ui.add_update("status", message="正在初始化浏览器...")
 
-        self._safe_print(f"开始访问URL: {url}")
+        logger.info(f"开始访问URL: {url}")
         ui.add_update("status", message=f"正在加载页面: {url}")
 
+        # 在页面加载前挂载监听，才能捕获首屏的动态列表请求
+        self.start_response_capture(ui)
+
         try:
             # 添加超时和错误处理
             await self.page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            self._safe_print("页面已加载完成")
+            logger.info("页面已加载完成")
             ui.add_update("status", message="页面加载完成，等待内容...")
         except Exception as e:
+            self.stop_response_capture()
             error_msg = f"页面加载失败: {str(e)}"
-            self._safe_print(f"[Crawler] {error_msg}")
+            logger.error(f"[Crawler] {error_msg}")
             ui.add_update("status", message=error_msg)
             raise Exception(error_msg)
 
+        try:
+            return await self._crawl_loaded_page(ui)
+        finally:
+            self.stop_response_capture()
+
+    async def crawl_via_api(self, url, ui):
+        """加载一次用户页面获取Cookie，之后直接分页请求动态接口，无需滚动
+
+        首个接口响应未能捕获时回退到滚动抓取
+        """
+        await self.initialize(ui)
+
+        user_id = extract_user_id(url)
+        if not user_id:
+            raise ValueError(f"无法从URL中解析用户ID: {url}")
+
+        logger.info(f"[API] 开始访问URL: {url}")
+        ui.add_update("status", message=f"正在加载页面: {url}")
+
+        # api 模式依赖首个响应取得Cookie和分页游标，总是开启捕获
+        capture_responses = self.capture_responses
+        self.capture_responses = True
+        try:
+            self.start_response_capture(ui)
+        finally:
+            self.capture_responses = capture_responses
+
+        try:
+            try:
+                await self.page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            except Exception as e:
+                error_msg = f"页面加载失败: {str(e)}"
+                logger.error(f"[API] {error_msg}")
+                ui.add_update("status", message=error_msg)
+                raise Exception(error_msg)
+
+            if not await self.wait_for_captured_events():
+                ui.add_update("status", message="未能直接请求接口，改为滚动抓取...")
+                return await self._crawl_loaded_page(ui)
+        finally:
+            # 之后的分页由本方法主动请求，不再需要监听页面响应
+            self.stop_response_capture()
+
+        await self.fetch_remaining_events(user_id, url, ui)
+
+        if self.stop_crawling:
+            ui.add_update(
+                "status",
+                message=f"爬取已手动终止，共获取 {len(ui.articles)} 篇文章{self.traffic_summary()}",
+            )
+        else:
+            ui.add_update(
+                "status",
+                message=f"爬取完成，共获取 {len(ui.articles)} 篇文章{self.traffic_summary()}",
+            )
+
+        return ui.articles
+
+    async def fetch_remaining_events(self, user_id, referer, ui):
+        """从捕获到的游标开始，通过 APIRequestContext 逐页请求剩余动态"""
+        headers = {"Referer": self.captured_request_headers.get("referer", referer)}
+        cursor = self.captured_cursor
+        page_count = 1
+
+        while not (self.capture_exhausted or self.stop_crawling or self.reached_known):
+            if cursor is None:
+                logger.info("[API] 接口未返回分页游标，停止请求")
+                self.crawl_incomplete = True
+                break
+
+            request_url, params = build_event_list_request(user_id, cursor)
+            payload = await self.request_event_page(request_url, params, headers)
+            if payload is None:
+                ui.add_update(
+                    "status",
+                    message=f"请求动态接口失败，已获取 {len(ui.articles)} 篇文章",
+                )
+                self.crawl_incomplete = True
+                break
+
+            articles, more, cursor = parse_event_list(payload)
+            page_count += 1
+            logger.info(f"[API] 第 {page_count} 页返回 {len(articles)} 篇文章")
+
+            for article in articles:
+                self.register_article(
+                    article["time"],
+                    article["text"],
+                    article["song"],
+                    article["images"],
+                    ui,
+                    article_id=article["id"],
+                )
+
+            ui.add_update(
+                "status",
+                message=f"已请求 {page_count} 页，已获取 {len(ui.articles)} 篇文章",
+            )
+
+            if not more or not articles:
+                self.capture_exhausted = True
+                break
+
+            await asyncio.sleep(self.api_page_delay)
+
+    async def request_event_page(self, request_url, params, headers):
+        """请求一页动态数据，失败时按指数退避重试，最终失败返回None"""
+        for attempt in range(1, self.api_max_retries + 1):
+            try:
+                response = await self.context.request.get(
+                    request_url, params=params, headers=headers, timeout=15000
+                )
+                if response.ok:
+                    payload = await response.json()
+                    if payload.get("code", 200) == 200:
+                        return payload
+                    logger.warning(f"[API] 接口返回错误: {payload.get('code')}")
+                else:
+                    logger.warning(f"[API] 请求失败: {response.status}")
+            except Exception as e:
+                logger.warning(f"[API] 请求出错: {e}")
+
+            if attempt < self.api_max_retries and not self.stop_crawling:
+                await asyncio.sleep(2 ** (attempt - 1))
+
+        return None
+
+    async def _crawl_loaded_page(self, ui):
+        """在已加载的用户页面上提取全部文章"""
+
         # 等待iframe加载
-        self._safe_print("等待iframe加载...")
+        logger.info("等待iframe加载...")
         ui.add_update("status", message="等待iframe加载...")
 
         try:
             iframe = await self.page.wait_for_selector("#g_iframe", timeout=30000)
-            self._safe_print("iframe已找到")
+            logger.info("iframe已找到")
             ui.add_update("status", message="iframe已找到")
         except Exception as e:
             error_msg = f"找不到iframe: {str(e)}"
-            self._safe_print(f"[Crawler] {error_msg}")
+            logger.info(f"[Crawler] {error_msg}")
             ui.add_update("status", message=error_msg)
 
             # 尝试获取页面内容以调试
             page_content = await self.page.content()
-            self._safe_print(f"页面内容长度: {len(page_content)}")
+            logger.debug("页面内容长度: %d", len(page_content))
             if len(page_content) < 1000:
-                self._safe_print(f"页面内容: {page_content[:500]}")
+                logger.debug("页面内容: %s", page_content[:500])
 
             raise ValueError("找不到#g_iframe，页面结构可能已改变")
 
         # 切换到iframe
         iframe = await self.page.query_selector("#g_iframe")
         iframe_content = await iframe.content_frame()
-        self._safe_print("已切换到iframe内容")
+        logger.info("已切换到iframe内容")
         ui.add_update("status", message="已切换到iframe内容")
 
         # 等待一小段时间让页面内容加载
@@ -309,7 +860,7 @@ class NetEaseCrawler:
             if event_count_elem:
                 total_articles_text = await event_count_elem.text_content()
                 total_articles = int(total_articles_text.strip())
-                self._safe_print(f"页面显示文章总数: {total_articles}")
+                logger.info(f"页面显示文章总数: {total_articles}")
                 # 保存总文章数到ui对象，便于后续显示
                 ui.total_articles = total_articles
                 ui.add_update("total_count", count=total_articles)
@@ -317,37 +868,20 @@ class NetEaseCrawler:
                     "status", message=f"用户共有 {total_articles} 篇文章，开始抓取..."
                 )
             else:
-                self._safe_print("找不到文章总数元素，将使用默认方式抓取")
+                logger.info("找不到文章总数元素，将使用默认方式抓取")
                 ui.add_update("status", message="开始抓取文章...")
         except Exception as e:
-            self._safe_print(f"获取文章总数失败: {e}")
+            logger.warning(f"获取文章总数失败: {e}")
             ui.add_update("status", message="获取文章总数失败，继续抓取...")
 
-        # 记录初始文章数量
-        initial_article_count = len(ui.articles)
-
         # 初始扫描并提取所有文章
         ui.add_update(
             "status",
             message=f"开始提取文章... (总计: {total_articles if total_articles else '未知'})",
         )
-        articles = await self.scan_all_articles(iframe_content, ui)
-
-        # 检查第一次扫描是否找到新文章
-        current_article_count = len(ui.articles)
-        if current_article_count > initial_article_count:
-            new_articles = current_article_count - initial_article_count
-            self._safe_print(f"首次扫描发现 {new_articles} 篇文章，暂停5秒...")
-
-            # 使用倒计时显示暂停状态
-            for i in range(5, 0, -1):
-                if self.stop_crawling:
-                    break
-                ui.add_update(
-                    "status",
-                    message=f"首次扫描发现 {new_articles} 篇文章，暂停中: {i}秒... (总计: {total_articles if total_articles else '未知'})",
-                )
-                await asyncio.sleep(1)
+        # 捕获到接口数据时文章已在响应回调中登记，不再扫描DOM
+        if not await self.wait_for_captured_events():
+            await self.scan_all_articles(iframe_content, ui)
 
         # 如果没有终止，继续滚动页面获取所有文章
         if not self.stop_crawling:
@@ -357,12 +891,12 @@ class NetEaseCrawler:
         if self.stop_crawling:
             ui.add_update(
                 "status",
-                message=f"爬取已手动终止，共获取 {len(ui.articles)} 篇文章 (总计: {total_articles if total_articles else '未知'})",
+                message=f"爬取已手动终止，共获取 {len(ui.articles)} 篇文章 (总计: {total_articles if total_articles else '未知'}){self.traffic_summary()}",
             )
         else:
             ui.add_update(
                 "status",
-                message=f"爬取完成，共获取 {len(ui.articles)} 篇文章 (总计: {total_articles if total_articles else '未知'})",
+                message=f"爬取完成，共获取 {len(ui.articles)} 篇文章 (总计: {total_articles if total_articles else '未知'}){self.traffic_summary()}",
             )
 
         return ui.articles
@@ -370,12 +904,11 @@ class NetEaseCrawler:
     async def scroll_until_complete(self, frame, ui, total_articles=None):
         """滚动直到获取所有文章或者超时或者被手动终止"""
         try:
-            # 获取初始高度
-            last_height = await frame.evaluate("document.body.scrollHeight")
-            self._safe_print(f"开始滚动，初始页面高度: {last_height}")
+            scheduler = AdaptiveScrollScheduler()
+            logger.info("开始滚动")
 
             # 记录上次文章数量和上次发现新文章的时间
-            last_article_count = len(ui.articles)
+            last_article_count = len(self.processed_ids)
             last_new_article_time = time.time()
 
             # 最大滚动次数和当前滚动次数
@@ -384,11 +917,22 @@ class NetEaseCrawler:
 
             while current_scroll < max_scrolls and not self.stop_crawling:
                 current_scroll += 1
-                self._safe_print(f"滚动 {current_scroll}...")
+                logger.debug("滚动 %d...", current_scroll)
+
+                # 已经追上本地库中的旧文章，停止滚动
+                if self.reached_known:
+                    ui.add_update("status", message="已追上本地已备份的文章，停止滚动")
+                    break
+
+                # 接口已返回最后一页，停止滚动
+                if self.capture_exhausted:
+                    logger.info("动态列表接口已无更多数据，停止滚动")
+                    ui.add_update("status", message="已加载全部动态，停止滚动")
+                    break
 
                 # 如果已经获取到所有文章，停止滚动
                 if total_articles is not None and len(ui.articles) >= total_articles:
-                    self._safe_print(f"已获取所有 {total_articles} 篇文章，停止滚动")
+                    logger.info(f"已获取所有 {total_articles} 篇文章，停止滚动")
                     ui.add_update(
                         "status",
                         message=f"已获取所有 {total_articles} 篇文章，停止滚动",
@@ -398,7 +942,7 @@ class NetEaseCrawler:
                 # 检查是否超过3分钟没有新文章
                 current_time = time.time()
                 if current_time - last_new_article_time > 180:  # 3分钟 = 180秒
-                    self._safe_print("超过3分钟没有发现新文章，停止滚动")
+                    logger.info("超过3分钟没有发现新文章，停止滚动")
                     ui.add_update("status", message="超过3分钟没有发现新文章，停止滚动")
                     break
 
@@ -407,99 +951,124 @@ class NetEaseCrawler:
                     message=f"滚动加载中 ({current_scroll})... 已获取 {len(ui.articles)} 篇文章 (总计: {total_articles if total_articles else '未知'})",
                 )
 
-                # 滚动到底部
-                await frame.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-
-                # 短暂等待内容加载
-                await asyncio.sleep(0.8)
+                # 滚动到底部并等待新文章出现，等待上限随加载速度自动调整
+                result = await scheduler.step(frame)
+                logger.debug(
+                    "滚动后节点数: %s -> %s, 高度: %s, 耗时: %.2f秒",
+                    result["before"],
+                    result["after"],
+                    result["height"],
+                    result["elapsed"],
+                )
 
                 # 检查是否被终止
                 if self.stop_crawling:
-                    self._safe_print("爬取已被手动终止")
+                    logger.info("爬取已被手动终止")
                     break
 
-                # 获取新高度
-                new_height = await frame.evaluate("document.body.scrollHeight")
-                self._safe_print(f"滚动后新高度: {new_height}")
-
-                # 如果高度没有变化，说明没有更多内容了
-                if new_height == last_height:
-                    self._safe_print("页面高度未变化，可能已到达底部")
-
-                    # 再次检查是否已获取所有文章
-                    if (
-                        total_articles is not None
-                        and len(ui.articles) >= total_articles
-                    ):
-                        self._safe_print(
-                            f"已获取所有 {total_articles} 篇文章，停止滚动"
-                        )
-                        ui.add_update(
-                            "status",
-                            message=f"已获取所有 {total_articles} 篇文章，停止滚动",
-                        )
-                        break
-
-                    # 多等待几次，可能只是暂时没有加载
-                    if current_scroll % 3 == 0:  # 每隔3次滚动检查一下
-                        self._safe_print("尝试再滚动几次...")
+                # 没有新内容出现，可能已到达底部或服务器变慢
+                if not result["grew"] and result["height"] == result["heightBefore"]:
+                    logger.debug("页面未加载新内容，下次等待上限 %.1f秒", scheduler.timeout)
+                    if scheduler.consecutive_misses % 3 == 0:
                         ui.add_update(
                             "status", message="页面似乎已到底部，再尝试几次..."
                         )
 
-                # 滚动后扫描新文章
-                self._safe_print("开始扫描新加载的内容...")
-                ui.add_update(
-                    "status",
-                    message=f"扫描新内容... (总计: {total_articles if total_articles else '未知'})",
-                )
-                await self.scan_all_articles(frame, ui)
+                # 滚动后扫描新文章，捕获接口数据时文章由响应回调登记
+                if self.capture_state != "active":
+                    logger.info("开始扫描新加载的内容...")
+                    await self.scan_all_articles(frame, ui)
 
                 # 检查是否有新文章
-                current_article_count = len(ui.articles)
+                current_article_count = len(self.processed_ids)
                 if current_article_count > last_article_count:
-                    new_articles = current_article_count - last_article_count
-                    self._safe_print(f"发现 {new_articles} 篇新文章，暂停5秒...")
-
-                    # 更新最后发现新文章的时间
+                    logger.info(
+                        f"发现 {current_article_count - last_article_count} 篇新文章"
+                    )
                     last_new_article_time = time.time()
-
-                    # 使用倒计时显示暂停状态
-                    for i in range(5, 0, -1):
-                        if self.stop_crawling:
-                            break
-                        ui.add_update(
-                            "status",
-                            message=f"发现 {new_articles} 篇新文章，暂停中: {i}秒...  (总计: {total_articles if total_articles else '未知'})",
-                        )
-                        await asyncio.sleep(1)
-
                     last_article_count = current_article_count
 
-                last_height = new_height
+                # 服务器变慢时放缓滚动节奏
+                if scheduler.cooldown:
+                    await asyncio.sleep(scheduler.cooldown)
+            else:
+                # 达到最大滚动次数时可能还有没加载的文章
+                if not self.stop_crawling:
+                    logger.info(f"已达到最大滚动次数 {max_scrolls}")
+                    self.crawl_incomplete = True
 
-            self._safe_print("滚动完成")
+            logger.info("滚动完成")
         except Exception as e:
-            self._safe_print(f"滚动加载出错: {e}")
-            if not getattr(sys, "frozen", False):
-                traceback.print_exc()
+            self.crawl_incomplete = True
+            logger.exception(f"滚动加载出错: {e}")
             ui.add_update("status", message=f"滚动加载出错: {str(e)}")
 
     async def scan_all_articles(self, frame, ui):
+        """扫描并提取新文章
+
+        增量模式下在iframe内直接提取未标记过的节点，只把新增文章以JSON形式传回；
+        页面脚本执行失败时回退到整页HTML解析
+        """
+        if self.incremental_extraction:
+            try:
+                return await self.scan_new_articles(frame, ui)
+            except Exception as e:
+                logger.warning(f"增量提取失败，回退到整页解析: {e}")
+
+        return await self.scan_all_articles_html(frame, ui)
+
+    async def scan_new_articles(self, frame, ui):
+        """在iframe内增量提取新追加的文章，每次滚动的开销只与新内容成正比"""
+        raw_articles = await frame.evaluate(EXTRACT_NEW_ARTICLES_JS, SEEN_MARKER)
+        logger.info(f"增量提取到 {len(raw_articles)} 个新dcntc元素")
+
+        articles = []
+
+        for i, raw in enumerate(raw_articles):
+            try:
+                ui.add_update(
+                    "status", message=f"处理文章 {i+1}/{len(raw_articles)}..."
+                )
+
+                song = self.build_song_info(raw.get("song"))
+                images = [
+                    clean_src
+                    for clean_src in (
+                        self.clean_image_url(src) for src in raw.get("images", [])
+                    )
+                    if clean_src
+                ]
+
+                article = self.register_article(
+                    raw.get("time", "").strip(),
+                    raw.get("text", "").strip(),
+                    song,
+                    images,
+                    ui,
+                    article_id=event_id_from_href(raw.get("href")),
+                )
+                if article:
+                    articles.append(article)
+            except Exception as e:
+                logger.exception(f"处理文章 {i+1} 时出错: {e}")
+
+        logger.info(f"本次扫描共提取 {len(articles)} 篇新文章")
+        return articles
+
+    async def scan_all_articles_html(self, frame, ui):
         """一次性扫描并提取所有文章，采用和油猴脚本类似的方法"""
         # 获取整个iframe的HTML内容，一次性处理
         html_content = await frame.content()
-        self._safe_print(f"获取到iframe HTML内容，长度: {len(html_content)}")
+        logger.info(f"获取到iframe HTML内容，长度: {len(html_content)}")
 
         # 使用BeautifulSoup解析HTML
         soup = BeautifulSoup(html_content, "html.parser")
 
         # 查找所有dcntc元素
         dcntc_elements = soup.select(".dcntc")
-        self._safe_print(f"找到 {len(dcntc_elements)} 个dcntc元素")
+        logger.info(f"找到 {len(dcntc_elements)} 个dcntc元素")
 
         articles = []
-        new_count = 0
 
         for i, elem in enumerate(dcntc_elements):
             try:
@@ -515,8 +1084,10 @@ class NetEaseCrawler:
                 time_link = time_elem.select_one("a")
                 if time_link:
                     time_text = time_link.get_text().strip()
+                    event_id = event_id_from_href(time_link.get("href"))
                 else:
                     time_text = time_elem.get_text().strip()
+                    event_id = None
 
                 # 提取文本内容 - 保留HTML
                 text_elem = elem.select_one(".text")
@@ -527,110 +1098,92 @@ class NetEaseCrawler:
                 text_html = "".join(str(c) for c in text_elem.contents)
                 text_html = text_html.strip()
 
-                # 生成文章ID
-                article_id = self.generate_element_id(time_text, text_html)
-
-                # 检查是否已处理过
-                if article_id in self.processed_ids:
+                # 有动态ID时先检查是否已处理过，避免重复提取歌曲和图片
+                if event_id and event_id in self.processed_ids:
                     continue
 
-                # 提取歌曲信息
-                song = self.extract_song_info(elem)
+                article = self.register_article(
+                    time_text,
+                    text_html,
+                    self.extract_song_info(elem),
+                    self.extract_image_urls(elem),
+                    ui,
+                    article_id=event_id,
+                )
+                if article:
+                    articles.append(article)
 
-                # 提取图片URL
-                images = self.extract_image_urls(elem)
+            except Exception as e:
+                logger.exception(f"处理文章 {i+1} 时出错: {e}")
 
-                # 创建文章对象
-                article = {
-                    "id": article_id,
-                    "time": time_text,
-                    "text": text_html,
-                    "song": song,
-                    "images": images,
-                }
+        logger.info(f"本次扫描共提取 {len(articles)} 篇新文章")
+        return articles
 
-                # 添加到处理过的ID集合
-                self.processed_ids.add(article_id)
-                articles.append(article)
-                new_count += 1
+    def register_article(self, time_text, text_html, song, images, ui, article_id=None):
+        """去重并登记一篇文章，新文章会推送到UI，已处理过的返回None"""
+        # 生成文章ID，接口数据和时间链接中带有动态ID，都没有时按内容生成
+        if article_id is None:
+            article_id = self.generate_element_id(time_text, text_html, song, images)
 
-                # 更新UI
-                ui.add_update("new_article", article=article)
-                self._safe_print(f"已处理文章 {i+1}: {time_text}")
+        # 检查是否已处理过
+        if not self.processed_ids.add(article_id):
+            return None
+        if self.store:
+            self.content_ids.add(self.generate_element_id(time_text, text_html, song, images))
 
-            except Exception as e:
-                self._safe_print(f"处理文章 {i+1} 时出错: {e}")
-                if not getattr(sys, "frozen", False):
-                    traceback.print_exc()
+        # 创建文章对象
+        article = Article(article_id, time_text, text_html, song, images)
 
-        self._safe_print(f"本次扫描共提取 {new_count} 篇新文章")
-        return articles
+        # 写入本地库，库中已有的文章也推送，增量爬取结束后只补上本次没有爬到的文章
+        if self.store:
+            self.store_article(article)
+
+        # 更新UI
+        ui.add_update("new_article", article=article)
+        logger.debug("已处理文章: %s", time_text)
+        return article
 
     async def scroll_and_scan(self, frame, ui, max_scrolls=10):
-        """滚动页面并扫描新文章，每次找到新文章后暂停5秒"""
+        """滚动页面并扫描新文章，直到没有新内容或达到最大滚动次数"""
         try:
-            # 获取初始高度
-            last_height = await frame.evaluate("document.body.scrollHeight")
-            self._safe_print(f"开始滚动，初始页面高度: {last_height}")
-
-            # 记录上次文章数量
-            last_article_count = len(ui.articles)
+            scheduler = AdaptiveScrollScheduler()
+            logger.info("开始滚动")
 
             for i in range(max_scrolls):
-                self._safe_print(f"滚动 {i+1}/{max_scrolls}...")
+                logger.debug("滚动 %d/%d...", i + 1, max_scrolls)
                 ui.add_update("status", message=f"滚动加载中 ({i+1}/{max_scrolls})...")
 
-                # 滚动到底部
-                await frame.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-
-                # 短暂等待内容加载
-                await asyncio.sleep(0.8)
-
-                # 获取新高度
-                new_height = await frame.evaluate("document.body.scrollHeight")
-                self._safe_print(f"滚动后新高度: {new_height}")
+                # 滚动到底部并等待新文章出现
+                result = await scheduler.step(frame)
+                logger.debug(
+                    "滚动后节点数: %s -> %s, 耗时: %.2f秒",
+                    result["before"],
+                    result["after"],
+                    result["elapsed"],
+                )
 
-                # 如果高度没有变化，说明没有更多内容了
-                if new_height == last_height:
-                    self._safe_print("页面高度未变化，停止滚动")
+                # 如果没有新内容，说明没有更多内容了
+                if not result["grew"] and result["height"] == result["heightBefore"]:
+                    logger.info("页面未加载新内容，停止滚动")
                     ui.add_update("status", message="已到达页面底部，没有更多内容")
                     break
 
                 # 滚动后扫描新文章
-                self._safe_print("开始扫描新加载的内容...")
+                logger.info("开始扫描新加载的内容...")
                 ui.add_update("status", message="扫描新内容...")
                 await self.scan_all_articles(frame, ui)
 
-                # 检查是否有新文章
-                current_article_count = len(ui.articles)
-                if current_article_count > last_article_count:
-                    new_articles = current_article_count - last_article_count
-                    self._safe_print(f"发现 {new_articles} 篇新文章，暂停5秒...")
+                if scheduler.cooldown:
+                    await asyncio.sleep(scheduler.cooldown)
 
-                    # 使用倒计时显示暂停状态
-                    for i in range(5, 0, -1):
-                        ui.add_update(
-                            "status",
-                            message=f"发现 {new_articles} 篇新文章，暂停中: {i}秒...",
-                        )
-                        await asyncio.sleep(1)
-
-                    last_article_count = current_article_count
-
-                last_height = new_height
-
-            self._safe_print("滚动完成")
+            logger.info("滚动完成")
         except Exception as e:
-            self._safe_print(f"滚动加载出错: {e}")
-            if not getattr(sys, "frozen", False):
-                traceback.print_exc()
+            logger.exception(f"滚动加载出错: {e}")
             ui.add_update("status", message=f"滚动加载出错: {str(e)}")
 
-    def generate_element_id(self, time, text):
-        """生成文章的唯一ID"""
-        # 使用时间和文本的前30个字符
-        text_part = re.sub(r"\s+", "", text[:30])
-        return f"{time}-{text_part}"
+    def generate_element_id(self, time, text, song=None, images=()):
+        """没有动态ID时根据内容生成文章ID"""
+        return content_article_id(time, text, song, images)
 
     def extract_song_info(self, elem):
         """从BeautifulSoup元素中提取歌曲信息"""
@@ -650,29 +1203,38 @@ class NetEaseCrawler:
             if not title_element:
                 return None
 
-            title = title_element.get_text().strip()
-            song_href = title_element.get("href", "")
-            song_url = f"https://music.163.com{song_href}" if song_href else ""
-
             # 提取歌手信息
             artist_element = scnt_element.select_one(".from a")
             if not artist_element:
                 return None
 
-            artist = artist_element.get_text().strip()
-            artist_href = artist_element.get("href", "")
-            artist_url = f"https://music.163.com{artist_href}" if artist_href else ""
-
-            return {
-                "title": title,
-                "url": song_url,
-                "artist": artist,
-                "artistUrl": artist_url,
-            }
+            return self.build_song_info(
+                {
+                    "title": title_element.get_text(),
+                    "href": title_element.get("href", ""),
+                    "artist": artist_element.get_text(),
+                    "artistHref": artist_element.get("href", ""),
+                }
+            )
         except Exception as e:
-            self._safe_print(f"提取歌曲信息出错: {e}")
+            logger.warning(f"提取歌曲信息出错: {e}")
             return None
 
+    def build_song_info(self, raw_song):
+        """将提取到的原始歌曲字段整理为歌曲信息字典"""
+        if not raw_song:
+            return None
+
+        song_href = raw_song.get("href") or ""
+        artist_href = raw_song.get("artistHref") or ""
+
+        return {
+            "title": (raw_song.get("title") or "").strip(),
+            "url": f"https://music.163.com{song_href}" if song_href else "",
+            "artist": (raw_song.get("artist") or "").strip(),
+            "artistUrl": f"https://music.163.com{artist_href}" if artist_href else "",
+        }
+
     def extract_image_urls(self, elem):
         """从BeautifulSoup元素中提取图片URL"""
         try:
@@ -686,61 +1248,33 @@ class NetEaseCrawler:
                     src = img.get("src")
                     if src:
                         # 处理URL
-                        clean_src = src.split("?")[0].replace("http:", "https:")
+                        clean_src = self.clean_image_url(src)
                         if clean_src:
                             image_urls.append(clean_src)
-                            self._safe_print(f"找到图片: {clean_src}")
+                            logger.debug("找到图片: %s", clean_src)
             else:
                 # 如果找不到缩略图，尝试查找封面图
                 cover_img = elem.select_one(".cover .lnk img")
                 if cover_img and cover_img.get("src"):
-                    src = cover_img.get("src")
-                    clean_src = src.split("?")[0].replace("http:", "https:")
+                    clean_src = self.clean_image_url(cover_img.get("src"))
                     if clean_src:
                         image_urls.append(clean_src)
-                        self._safe_print(f"找到封面图: {clean_src}")
+                        logger.debug("找到封面图: %s", clean_src)
 
             return image_urls
         except Exception as e:
-            self._safe_print(f"提取图片URL出错: {e}")
+            logger.warning(f"提取图片URL出错: {e}")
             return []
 
-    async def convert_image_to_base64(self, url):
-        """将图片URL转换为base64格式"""
-        if not url:
-            return ""
+    def clean_image_url(self, src):
+        """去掉图片URL的查询参数并统一使用https"""
+        return clean_image_url(src)
 
-        try:
-            # 确保URL使用https协议
-            secure_url = url.replace("http:", "https:")
-
-            # 打开新页面下载图片，避免影响主页面
-            page = await self.context.new_page()
-            try:
-                # 设置10秒超时
-                response = await asyncio.wait_for(page.goto(secure_url), timeout=10)
-                if response.status == 200:
-                    image_data = await response.body()
-                    # 转换为base64
-                    base64_data = base64.b64encode(image_data).decode("utf-8")
-                    # 获取MIME类型
-                    content_type = response.headers.get("content-type", "image/jpeg")
-                    return f"data:{content_type};base64,{base64_data}"
-                else:
-                    self._safe_print(f"获取图片失败: {response.status} {secure_url}")
-                    return ""
-            except asyncio.TimeoutError:
-                self._safe_print(f"获取图片超时: {secure_url}")
-                return ""
-            except Exception as e:
-                self._safe_print(f"获取图片出错: {e}")
-                if not getattr(sys, "frozen", False):
-                    traceback.print_exc()
-                return ""
-            finally:
-                await page.close()
-        except Exception as e:
-            self._safe_print(f"转换图片为base64时出错: {e}, URL: {url}")
-            if not getattr(sys, "frozen", False):
-                traceback.print_exc()
-            return ""
+    async def convert_image_to_base64(self, url):
+        """将图片URL转换为base64格式，下载、重试和磁盘缓存与导出共用同一套逻辑"""
+        if self._image_session is None:
+            self._image_cache = open_image_cache({})
+            self._image_session = create_image_session({})
+        return await fetch_image_as_base64(
+            url, self._image_session, cache=self._image_cache
+        )
@@ -1,17 +1,18 @@
 import re
 import html
+from datetime import datetime, timedelta
+
+from .models import Article
 
 def process_articles(articles):
     """处理文章数据，清理HTML内容"""
     processed = []
     
     for article in articles:
-        processed_article = article.copy()
-        
-        # 处理HTML文本，保留<br>标签
-        processed_article['text'] = process_html_text(article['text'])
-        
-        processed.append(processed_article)
+        # 处理HTML文本，保留<br>标签；Article 不可修改，替换正文得到新对象
+        processed.append(
+            Article.from_value(article).replace(text=process_html_text(article['text']))
+        )
     
     return processed
 
@@ -39,4 +40,57 @@ def plain_text_from_html(html_content):
     
     text = html.unescape(text)
     
-    return text
\ No newline at end of file
+    return text
+
+def article_month(time_text, now=None, newer_month=None):
+    """从动态的时间文本推断所属月份，返回 "YYYY-MM"
+
+    页面上今年的动态省略年份，近期的动态显示为"昨天"、"3天前"、"x分钟前"等相对时间。
+    newer_month 为上一篇（更新的）动态所属的月份，省略年份的日期按它推断年份，
+    月份比它大时属于上一年；没有时按当前时间推断
+    """
+    now = now or datetime.now()
+    time_text = time_text or ''
+
+    match = re.search(r'(\d{4})年(\d{1,2})月', time_text)
+    if match:
+        return f"{int(match.group(1)):04d}-{int(match.group(2)):02d}"
+
+    match = re.search(r'(\d{1,2})月\d{1,2}日', time_text)
+    if match:
+        month = int(match.group(1))
+        if newer_month:
+            year, reference = (int(part) for part in newer_month.split('-'))
+        else:
+            year, reference = now.year, now.month
+        if month > reference:
+            year -= 1
+        return f"{year:04d}-{month:02d}"
+
+    days = 0
+    match = re.search(r'(\d+)天前', time_text)
+    if match:
+        days = int(match.group(1))
+    elif '前天' in time_text:
+        days = 2
+    elif '昨天' in time_text:
+        days = 1
+    now = now - timedelta(days=days)
+    return f"{now.year:04d}-{now.month:02d}"
+
+def article_months(time_texts, now=None):
+    """依次推断按从新到旧排列的动态所属的月份，每篇按上一篇的月份推断年份"""
+    now = now or datetime.now()
+    months = []
+    month = None
+    for time_text in time_texts:
+        month = article_month(time_text, now, month)
+        months.append(month)
+    return months
+
+def preview_text(plain_text, max_length=50):
+    """纯文本在列表中显示的单行摘要，换行合并为空格，超出长度时截断"""
+    text = ' '.join(plain_text.split())
+    if len(text) > max_length:
+        return text[:max_length] + '...'
+    return text
@@ -0,0 +1,228 @@
+"""
+动态列表接口数据解析模块，将网易云音乐动态接口返回的JSON转换为文章字典
+"""
+import hashlib
+import html
+import json
+import re
+from datetime import datetime, timedelta, timezone
+from urllib.parse import urlsplit
+
+from .models import Article
+
+# 动态列表接口地址特征，同时匹配 weapi 和 api 两种形式
+EVENT_LIST_URL_PATTERN = re.compile(r"/(?:we)?api/(?:v\d+/)?event/get/\d+")
+
+# 明文动态列表接口，只依赖页面Cookie，无需对参数加密签名
+EVENT_LIST_API_URL = "https://music.163.com/api/event/get/{user_id}"
+
+# 用户动态页面地址
+USER_EVENT_URL = "https://music.163.com/#/user/event?id={user_id}"
+
+# 每次请求的动态数量，与页面滚动加载一致
+EVENT_PAGE_SIZE = 20
+
+# 动态详情链接中的动态ID，如 /event?id=123456&uid=789
+EVENT_HREF_ID_PATTERN = re.compile(r"[?&]id=(\d+)")
+
+# 相对时间，随页面加载时间变化，不能用于生成文章ID
+RELATIVE_TIME_PATTERN = re.compile(r"刚刚|秒前|分钟前|小时前|昨天|前天")
+
+# content_article_id 生成的ID
+CONTENT_ID_PATTERN = re.compile(r"h[0-9a-f]{16}")
+
+# 支持 ?param= 缩放参数的图片服务器
+RESIZABLE_IMAGE_HOST = re.compile(r"(^|\.)music\.126\.net$")
+
+# 网易云音乐页面显示的时间使用北京时间
+BEIJING_TZ = timezone(timedelta(hours=8))
+
+# 动态没有配图时，依次尝试这些分享内容的封面图字段
+COVER_FIELDS = (
+    ("song", "album", "picUrl"),
+    ("album", "picUrl"),
+    ("playlist", "coverImgUrl"),
+    ("mv", "imgurl"),
+    ("video", "coverUrl"),
+    ("program", "coverUrl"),
+)
+
+
+def is_event_list_url(url):
+    """判断URL是否为动态列表接口"""
+    return bool(url) and EVENT_LIST_URL_PATTERN.search(url) is not None
+
+
+def build_user_url(user_id):
+    """构造用户动态页面地址"""
+    return USER_EVENT_URL.format(user_id=user_id)
+
+
+def extract_user_id(url):
+    """从用户主页URL中提取用户ID"""
+    match = re.search(r"[?&]id=(\d+)", url or "")
+    return match.group(1) if match else None
+
+
+def build_event_list_request(user_id, cursor=-1, limit=EVENT_PAGE_SIZE):
+    """构造动态列表接口的请求地址和参数，cursor为上一页返回的lasttime"""
+    url = EVENT_LIST_API_URL.format(user_id=user_id)
+    params = {"time": cursor, "limit": limit, "getcounts": "true"}
+    return url, params
+
+
+def format_event_time(event_time_ms):
+    """将毫秒时间戳格式化为页面使用的中文日期格式"""
+    if not event_time_ms:
+        return ""
+    moment = datetime.fromtimestamp(event_time_ms / 1000, tz=BEIJING_TZ)
+    return f"{moment.year}年{moment.month}月{moment.day}日 {moment:%H:%M}"
+
+
+def clean_image_url(url):
+    """去掉图片URL的查询参数并统一使用https"""
+    if not url:
+        return ""
+    return url.split("?")[0].replace("http:", "https:")
+
+
+def event_id_from_href(href):
+    """从动态时间链接中提取动态ID，与接口数据中的动态ID一致，找不到时返回None"""
+    match = EVENT_HREF_ID_PATTERN.search(href or "")
+    return match.group(1) if match else None
+
+
+def content_article_id(time_text, text_html, song=None, images=()):
+    """拿不到动态ID时，根据内容生成文章ID
+
+    使用完整正文、歌曲和图片，相对时间不参与计算，
+    避免同一分钟内开头相同的两条动态被当作重复，也避免滚动过程中时间文本变化造成重复
+    """
+    stable_time = "" if RELATIVE_TIME_PATTERN.search(time_text or "") else (time_text or "")
+    parts = [stable_time, re.sub(r"\s+", "", text_html or "")]
+    if song:
+        parts.append(song.get("url") or song.get("title") or "")
+    parts.extend(images or ())
+    digest = hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=8)
+    return f"h{digest.hexdigest()}"
+
+
+def is_stable_article_id(article_id):
+    """是否为动态ID或内容ID，旧版本按"时间-正文开头"生成的ID返回False"""
+    article_id = str(article_id)
+    return article_id.isdigit() or bool(CONTENT_ID_PATTERN.fullmatch(article_id))
+
+
+def resized_image_url(url, pixels):
+    """网易云图片服务器按 ?param=宽y高 返回居中裁剪缩放后的图片
+
+    返回 pixels x pixels 的缩略图地址，不是网易云图片服务器的地址时返回空字符串
+    """
+    url = clean_image_url(url)
+    if not url or not RESIZABLE_IMAGE_HOST.search(urlsplit(url).hostname or ""):
+        return ""
+    return f"{url}?param={pixels}y{pixels}"
+
+
+def msg_to_html(msg):
+    """将动态纯文本转换为与页面一致的HTML，换行使用<br>"""
+    if not msg:
+        return ""
+    return html.escape(msg.strip(), quote=False).replace("\n", "<br>")
+
+
+def _dig(data, path):
+    """按字段路径逐层取值，任意一层缺失都返回None"""
+    for key in path:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def _load_event_json(event):
+    """动态的正文保存在json字段中，可能是字符串也可能已经是字典"""
+    raw = event.get("json")
+    if isinstance(raw, dict):
+        return raw
+    if not raw:
+        return {}
+    try:
+        data = json.loads(raw)
+    except (TypeError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def parse_song(event_json):
+    """从动态正文中提取分享的歌曲信息"""
+    song = event_json.get("song")
+    if not isinstance(song, dict) or not song.get("name"):
+        return None
+
+    artists = song.get("artists") or song.get("ar") or []
+    artist = artists[0] if artists and isinstance(artists[0], dict) else {}
+
+    song_id = song.get("id")
+    artist_id = artist.get("id")
+
+    return {
+        "title": song.get("name", "").strip(),
+        "url": f"https://music.163.com/song?id={song_id}" if song_id else "",
+        "artist": (artist.get("name") or "").strip(),
+        "artistUrl": f"https://music.163.com/artist?id={artist_id}" if artist_id else "",
+    }
+
+
+def parse_images(event, event_json):
+    """提取动态配图，没有配图时使用分享内容的封面"""
+    images = []
+    for pic in event.get("pics") or []:
+        if not isinstance(pic, dict):
+            continue
+        url = clean_image_url(pic.get("originUrl") or pic.get("squareUrl"))
+        if url:
+            images.append(url)
+
+    if images:
+        return images
+
+    for path in COVER_FIELDS:
+        cover = clean_image_url(_dig(event_json, path))
+        if cover:
+            return [cover]
+
+    return []
+
+
+def parse_event(event):
+    """将单条动态转换为 Article，无法识别的动态返回None"""
+    if not isinstance(event, dict) or event.get("id") is None:
+        return None
+
+    event_json = _load_event_json(event)
+
+    return Article(
+        str(event["id"]),
+        format_event_time(event.get("eventTime")),
+        msg_to_html(event_json.get("msg")),
+        parse_song(event_json),
+        parse_images(event, event_json),
+    )
+
+
+def parse_event_list(payload):
+    """解析动态列表接口的返回数据
+
+    返回 (文章列表, 是否还有更多, 下一页游标)
+    """
+    if not isinstance(payload, dict):
+        return [], False, None
+
+    articles = []
+    for event in payload.get("events") or []:
+        article = parse_event(event)
+        if article:
+            articles.append(article)
+
+    return articles, bool(payload.get("more")), payload.get("lasttime")
@@ -1,16 +1,75 @@
 import aiohttp
+import asyncio
 import base64
+import hashlib
+import io
+import json
+import logging
+import mimetypes
+import os
+import shutil
+from pathlib import Path
 from .data_processor import plain_text_from_html
+from .event_api import clean_image_url as clean_event_image_url, resized_image_url
+from .image_cache import ImageCache
+from .thumbnails import ThumbnailRenderer, get_thumbnail_setting, thumbnail_pixels
+
+logger = logging.getLogger(__name__)
+
+# 图片下载的默认设置，可通过导出设置覆盖
+DOWNLOAD_DEFAULTS = {
+    "imageConcurrency": 16,  # 同时下载的图片数
+    "imagePerHost": 8,  # 每个图片服务器的最大连接数
+    "imageTimeout": 30,  # 单张图片的超时秒数
+    "imageRetries": 3,  # 单张图片的最大尝试次数
+    "imageCache": True,  # 是否使用磁盘图片缓存
+    "serverResize": True,  # 缩略图由图片服务器按尺寸生成，不下载原图
+}
+
+# 图片导出方式: base64 内嵌到HTML, link 使用原始链接, assets 保存到HTML旁的 assets 目录
+IMAGE_MODE_BASE64 = "base64"
+IMAGE_MODE_LINK = "link"
+IMAGE_MODE_ASSETS = "assets"
+IMAGE_MODES = (IMAGE_MODE_BASE64, IMAGE_MODE_LINK, IMAGE_MODE_ASSETS)
+
+# assets 模式下图片目录名和记录图片URL与文件对应关系的清单文件名
+ASSETS_DIR_NAME = "assets"
+ASSETS_MANIFEST_NAME = "manifest.json"
+
+DEFAULT_TITLE = "网易云音乐动态导出"
+
+# HTML模板: classic 直接输出所有文章, viewer 为按需渲染的单文件查看器
+HTML_TEMPLATE_CLASSIC = "classic"
+HTML_TEMPLATE_VIEWER = "viewer"
+HTML_TEMPLATES = (HTML_TEMPLATE_CLASSIC, HTML_TEMPLATE_VIEWER)
+
+# 每次编码写入的原始字节数，须为3的倍数才能分块拼接base64
+BASE64_CHUNK_SIZE = 3 * 64 * 1024
+
+# 每批预取的图片数为并发数的倍数，导出时内存中最多保留一批图片
+PREFETCH_WINDOW_FACTOR = 4
 
 async def export_to_html(articles, file_path, settings, ui):
-    """将文章导出为HTML文件，显示详细进度"""
+    """将文章导出为HTML文件，边下载图片边写入文件，显示详细进度"""
     ui.add_update('status', message="开始准备导出HTML...")
-    html_content = await generate_html_content(articles, settings, ui)
-    
-    # 写入文件
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
+
+    assets = None
+    if get_image_mode(settings) == IMAGE_MODE_ASSETS:
+        assets = AssetDirectory(Path(file_path).resolve().parent / ASSETS_DIR_NAME)
+
+    if settings.get('htmlTemplate') == HTML_TEMPLATE_VIEWER:
+        # 查看器模板依赖本模块，按需导入
+        from .viewer_export import write_viewer_document as write_document
+    else:
+        write_document = write_html_document
+
+    try:
+        with open(file_path, 'w', encoding='utf-8') as f:
+            await write_document(f, articles, settings, ui, assets)
+    finally:
+        if assets:
+            assets.close()
+
     ui.add_update('status', message=f"已成功导出到 {file_path}")
     return file_path
 
@@ -32,131 +91,677 @@ def copy_to_clipboard(articles):
     result = "\n\n".join(copy_text)
     return result
 
-async def convert_image_to_base64(url, session):
+def clean_image_url(url):
+    """去掉图片URL的查询参数并统一使用https"""
+    return clean_event_image_url(url)
+
+def grid_image_url(url, settings):
+    """列表中显示的图片地址，图片服务器支持缩放时返回按显示尺寸缩放的地址，否则返回空字符串"""
+    if not get_download_setting(settings, 'serverResize'):
+        return ""
+    return resized_image_url(url, thumbnail_pixels(settings))
+
+def separate_grid_images(settings):
+    """列表中是否显示与原图分开的缩略图
+
+    base64 模式下保存原图时，列表直接显示内嵌的原图，不再另外内嵌一份缩略图，
+    每张图片的数据只写一次
+    """
+    return not (
+        get_image_mode(settings) == IMAGE_MODE_BASE64
+        and get_thumbnail_setting(settings, 'embedOriginals')
+    )
+
+def batch_fetch_urls(urls, settings):
+    """一批图片实际要下载的地址，返回下载地址到原图URL的映射
+
+    列表中的缩略图下载服务器按显示尺寸缩放的版本，节省流量和时间；
+    保存原图或图片服务器不支持缩放时下载原图
+    """
+    fetch_urls = {}
+    embed = get_thumbnail_setting(settings, 'embedOriginals')
+    separate = separate_grid_images(settings)
+    for url in urls:
+        if not url:
+            continue
+        grid_url = grid_image_url(url, settings) if separate else ""
+        if grid_url:
+            fetch_urls[grid_url] = url
+        if embed or not grid_url:
+            fetch_urls[url] = url
+    return fetch_urls
+
+def fetches_per_image(settings):
+    """每张图片大约要下载的次数，用于显示下载进度"""
+    if (
+        get_download_setting(settings, 'serverResize')
+        and get_thumbnail_setting(settings, 'embedOriginals')
+        and separate_grid_images(settings)
+    ):
+        return 2
+    return 1
+
+def split_resized(fetched, fetch_urls):
+    """把按下载地址返回的结果分为原图和服务器缩略图，均改为以原图URL为键"""
+    originals = {}
+    resized = {}
+    for fetch_url, value in fetched.items():
+        url = fetch_urls[fetch_url]
+        if fetch_url == url:
+            originals[url] = value
+        else:
+            resized[url] = value
+    return originals, resized
+
+def get_image_mode(settings):
+    """读取图片导出方式，兼容旧的 useBase64Images 设置"""
+    mode = settings.get('imageMode')
+    if mode in IMAGE_MODES:
+        return mode
+    return IMAGE_MODE_BASE64 if settings.get('useBase64Images', True) else IMAGE_MODE_LINK
+
+def get_download_setting(settings, key):
+    """读取图片下载设置，未设置时使用默认值"""
+    return settings.get(key, DOWNLOAD_DEFAULTS[key])
+
+class ImagePayload:
+    """下载好的图片，数据在缓存文件中时只保存路径，需要时再分块读取"""
+
+    __slots__ = ('content_type', 'data', 'path', 'digest')
+
+    def __init__(self, content_type, data=None, path=None, digest=None):
+        self.content_type = content_type
+        self.data = data
+        self.path = path
+        # 图片内容的SHA-256，来自缓存时已知，否则在需要时计算
+        self.digest = digest
+
+    def read(self):
+        """读取全部图片数据"""
+        if self.data is not None:
+            return self.data
+        return self.path.read_bytes()
+
+    def iter_chunks(self, chunk_size):
+        """按块读取图片数据"""
+        if self.data is not None:
+            for start in range(0, len(self.data), chunk_size):
+                yield self.data[start:start + chunk_size]
+            return
+
+        with open(self.path, 'rb') as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def size(self):
+        """图片数据的字节数"""
+        if self.data is not None:
+            return len(self.data)
+        return self.path.stat().st_size
+
+    def sha256(self):
+        """图片内容的SHA-256"""
+        if self.digest is None:
+            h = hashlib.sha256()
+            for chunk in self.iter_chunks(BASE64_CHUNK_SIZE):
+                h.update(chunk)
+            self.digest = h.hexdigest()
+        return self.digest
+
+async def fetch_image(url, session, retries=1, cache=None):
+    """下载图片，失败时按指数退避重试，返回 ImagePayload，失败返回None
+
+    提供缓存时优先使用有效期内的缓存，过期的缓存用条件请求重新验证；
+    使用缓存时返回的图片数据留在缓存文件中，不占用内存
+    """
+    secure_url = url.replace("http:", "https:")
+
+    entry = cache.lookup(secure_url) if cache else None
+    if entry and cache.is_fresh(entry):
+        cache.mark_hit(entry)
+        return ImagePayload(entry.content_type, path=entry.path, digest=entry.digest)
+
+    headers = cache.conditional_headers(entry) if entry else {}
+
+    for attempt in range(1, retries + 1):
+        try:
+            async with session.get(secure_url, headers=headers) as response:
+                if response.status == 304 and entry:
+                    cache.mark_hit(entry, revalidated=True)
+                    return ImagePayload(entry.content_type, path=entry.path, digest=entry.digest)
+
+                if response.status == 200:
+                    image_data = await response.read()
+                    content_type = response.headers.get('Content-Type', 'image/jpeg')
+                    if not cache:
+                        return ImagePayload(content_type, data=image_data)
+
+                    stored = cache.store(
+                        secure_url,
+                        image_data,
+                        content_type,
+                        etag=response.headers.get('ETag'),
+                        last_modified=response.headers.get('Last-Modified'),
+                    )
+                    return ImagePayload(content_type, path=stored.path, digest=stored.digest)
+
+                logger.warning(f"获取图片失败: {response.status} {secure_url}")
+                # 除限流外的客户端错误重试也无济于事
+                if 400 <= response.status < 500 and response.status != 429:
+                    break
+        except Exception as e:
+            logger.warning(f"获取图片出错 (第{attempt}次): {e}, URL: {url}")
+
+        if attempt < retries:
+            await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+
+    # 重新验证失败时退回使用过期的缓存
+    if entry:
+        cache.mark_hit(entry)
+        return ImagePayload(entry.content_type, path=entry.path, digest=entry.digest)
+    return None
+
+async def convert_image_to_base64(url, session, retries=1, cache=None):
     """将图片URL转换为base64格式"""
     if not url:
         return ""
-    
+
     try:
-        # 确保URL使用https协议
-        secure_url = url.replace("http:", "https:")
-        
-        async with session.get(secure_url) as response:
-            if response.status == 200:
-                image_data = await response.read()
-                # 转换为base64
-                base64_data = base64.b64encode(image_data).decode('utf-8')
-                # 获取MIME类型
-                content_type = response.headers.get('Content-Type', 'image/jpeg')
-                return f"data:{content_type};base64,{base64_data}"
-            else:
-                print(f"获取图片失败: {response.status} {secure_url}")
-                return ""
+        payload = await fetch_image(url, session, retries, cache)
+        if not payload:
+            return ""
+        base64_data = base64.b64encode(payload.read()).decode('utf-8')
+        return f"data:{payload.content_type};base64,{base64_data}"
     except Exception as e:
-        print(f"转换图片为base64时出错: {e}, URL: {url}")
+        logger.warning(f"转换图片为base64时出错: {e}, URL: {url}")
         return ""
 
-async def generate_html_content(articles, settings, ui):
-    """生成HTML内容，处理图片为base64格式，显示详细进度"""
-    html = '<!DOCTYPE html>\n<html lang="zh-CN">\n<head>\n'
-    html += '<meta charset="UTF-8">\n'
-    html += '<title>网易云音乐动态导出</title>\n'
-    html += '<style>\n'
-    html += 'body { font-family: Arial, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px; }\n'
-    html += '.article { border-bottom: 1px solid #eee; padding: 20px 0; }\n'
-    html += '.time { color: #888; margin-bottom: 10px; }\n'
-    html += '.text { white-space: pre-wrap; line-height: 1.6; }\n'
-    html += '.song { background-color: #f7f7f7; padding: 10px; margin: 10px 0; border-radius: 5px; }\n'
-    html += '.song a { color: #0c73c2; text-decoration: none; }\n'
-    html += '.song a:hover { text-decoration: underline; }\n'
-    html += '.images { display: flex; flex-wrap: wrap; gap: 10px; margin-top: 10px; }\n'
-    html += f'.images img {{ width: {settings["imageSize"]}px; height: {settings["imageSize"]}px; object-fit: cover; border-radius: 3px; cursor: pointer; }}\n'
-    html += '.lightbox { display: none; position: fixed; top: 0; left: 0; width: 100%; height: 100%; background-color: rgba(0,0,0,0.8); z-index: 1000; justify-content: center; align-items: center; }\n'
-    html += '.lightbox img { max-width: 90%; max-height: 90%; object-fit: contain; }\n'
-    html += '.close-lightbox { position: absolute; top: 20px; right: 20px; color: white; font-size: 30px; cursor: pointer; }\n'
-    html += '</style>\n'
-    html += '<script>\n'
-    html += 'function openLightbox(imgSrc) {\n'
-    html += '  const lightbox = document.getElementById("lightbox");\n'
-    html += '  const lightboxImg = document.getElementById("lightbox-img");\n'
-    html += '  lightboxImg.src = imgSrc;\n'
-    html += '  lightbox.style.display = "flex";\n'
-    html += '}\n'
-    html += 'function closeLightbox() {\n'
-    html += '  document.getElementById("lightbox").style.display = "none";\n'
-    html += '}\n'
-    html += '</script>\n'
-    html += '</head>\n<body>\n'
+def create_image_session(settings):
+    """创建共享连接池的HTTP会话，限制总连接数和每个服务器的连接数"""
+    connector = aiohttp.TCPConnector(
+        limit=get_download_setting(settings, 'imageConcurrency'),
+        limit_per_host=get_download_setting(settings, 'imagePerHost'),
+        keepalive_timeout=30,
+    )
+    timeout = aiohttp.ClientTimeout(total=get_download_setting(settings, 'imageTimeout'))
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
 
-    # 添加灯箱元素
-    html += '<div id="lightbox" class="lightbox" onclick="closeLightbox()">\n'
-    html += '  <span class="close-lightbox">&times;</span>\n'
-    html += '  <img id="lightbox-img" src="" alt="大图">\n'
-    html += '</div>\n'
+def open_image_cache(settings):
+    """按设置打开磁盘图片缓存，无法打开时不使用缓存"""
+    if not get_download_setting(settings, 'imageCache'):
+        return None
+    try:
+        return ImageCache()
+    except Exception as e:
+        logger.warning(f"无法打开图片缓存: {e}")
+        return None
+
+def guess_image_extension(content_type, url):
+    """根据Content-Type推断图片扩展名，推断不出时使用URL中的扩展名"""
+    mime = (content_type or '').split(';')[0].strip().lower()
+    extension = mimetypes.guess_extension(mime) if mime else None
+    if extension == '.jpe':
+        extension = '.jpg'
+    if not extension:
+        extension = os.path.splitext(url.split('?')[0])[1].lower() or '.jpg'
+    return extension
+
+class AssetDirectory:
+    """HTML旁的图片目录，文件以内容哈希命名，相同图片只保存一份
+
+    清单文件记录图片URL对应的文件名，重新导出时已保存的图片无需再次下载
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.root / ASSETS_MANIFEST_NAME
+        self.written = 0
+        self.reused = 0
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError):
+            self.manifest = {}
+
+    def relative_path(self, file_name):
+        """HTML中引用图片使用的相对路径"""
+        return f"{self.root.name}/{file_name}"
+
+    def lookup(self, url):
+        """返回已保存图片的相对路径，文件不存在时返回None"""
+        file_name = self.manifest.get(url)
+        if file_name and (self.root / file_name).exists():
+            self.reused += 1
+            return self.relative_path(file_name)
+        return None
+
+    def save(self, url, payload):
+        """保存图片，相同内容的文件已存在时跳过写入，返回相对路径"""
+        file_name = payload.sha256() + guess_image_extension(payload.content_type, url)
+        path = self.root / file_name
+
+        if path.exists():
+            self.reused += 1
+        else:
+            # 先写临时文件再改名，避免中断时留下不完整的文件
+            tmp_path = path.with_suffix(path.suffix + '.tmp')
+            if payload.path is not None:
+                shutil.copyfile(payload.path, tmp_path)
+            else:
+                tmp_path.write_bytes(payload.data)
+            tmp_path.replace(path)
+            self.written += 1
+
+        self.manifest[url] = file_name
+        return self.relative_path(file_name)
+
+    def thumbnail_name(self, file_name, variant):
+        """原图文件对应的缩略图文件名，由原图内容哈希和缩略图参数决定"""
+        return f"{os.path.splitext(file_name)[0]}_{variant}"
 
-    # 计算总图片数量
-    total_images = 0
+    def lookup_thumbnail(self, src, variant):
+        """返回已生成的缩略图相对路径，不存在时返回None"""
+        file_name = self.thumbnail_name(os.path.basename(src), variant)
+        if (self.root / file_name).exists():
+            return self.relative_path(file_name)
+        return None
+
+    def save_thumbnail(self, src, variant, data):
+        """保存缩略图，返回相对路径"""
+        file_name = self.thumbnail_name(os.path.basename(src), variant)
+        path = self.root / file_name
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        tmp_path.write_bytes(data)
+        tmp_path.replace(path)
+        return self.relative_path(file_name)
+
+    def original_path(self, src):
+        """相对路径对应的原图文件"""
+        return self.root / os.path.basename(src)
+
+    def summary(self):
+        return f"新保存 {self.written} 张, 复用 {self.reused} 张"
+
+    def close(self):
+        """写回清单文件"""
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, ensure_ascii=False)
+        tmp_path.replace(self.manifest_path)
+
+class ImageDownloader:
+    """在共享会话上并发下载图片，跨批次累计进度"""
+
+    def __init__(self, session, settings, ui, total, cache=None):
+        self.session = session
+        self.ui = ui
+        self.total = total
+        self.cache = cache
+        self.retries = get_download_setting(settings, 'imageRetries')
+        self.semaphore = asyncio.Semaphore(get_download_setting(settings, 'imageConcurrency'))
+        self.finished = 0
+
+    async def download(self, urls):
+        """并发下载一批图片，返回 URL 到 ImagePayload 的映射，失败的图片不在结果中"""
+        results = {}
+
+        async def download_one(url):
+            async with self.semaphore:
+                try:
+                    payload = await fetch_image(url, self.session, self.retries, self.cache)
+                except Exception as e:
+                    logger.warning(f"下载图片时出错: {e}, URL: {url}")
+                    payload = None
+            self.finished += 1
+            if payload:
+                results[url] = payload
+                self.ui.add_update('status', message=f"图片 {self.finished}/{self.total} 下载成功")
+            else:
+                self.ui.add_update('status', message=f"图片 {self.finished}/{self.total} 下载失败")
+
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        await asyncio.gather(*(download_one(url) for url in unique_urls))
+        return results
+
+def iter_article_batches(articles, max_images):
+    """按图片数量把文章分批，每批图片数不超过 max_images（单篇超出时自成一批）"""
+    batch = []
+    image_count = 0
     for article in articles:
-        if article.get('images'):
-            total_images += len(article['images'])
-    
-    ui.add_update('status', message=f"共有 {total_images} 张图片需要处理")
-    
-    # 创建HTTP会话
-    async with aiohttp.ClientSession() as session:
-        # 当前处理的图片计数
-        current_image = 0
-        
-        # 处理每篇文章
-        for article_idx, article in enumerate(articles):
-            html += '<div class="article">\n'
-
-            # 时间
-            html += f'<div class="time">{article["time"]}</div>\n'
-
-            # 文本内容 - 直接使用HTML内容，保留<br>标签
-            html += f'<div class="text">{article["text"]}</div>\n'
-
-            # 歌曲信息（如果有）
-            if article.get('song'):
-                song = article['song']
-                html += '<div class="song">\n'
-                html += f'<div><a href="{song["url"]}" target="_blank">{song["title"]}</a></div>\n'
-                html += f'<div>歌手: <a href="{song["artistUrl"]}" target="_blank">{song["artist"]}</a></div>\n'
-                html += '</div>\n'
-
-            # 图片（如果有）
-            if article.get('images') and len(article['images']) > 0:
-                html += '<div class="images">\n'
-                for img_idx, image_url in enumerate(article['images']):
-                    current_image += 1
-                    
-                    # 更新UI状态
-                    ui.add_update('status', message=f"正在处理图片 ({current_image}/{total_images}): 文章 {article_idx+1}, 图片 {img_idx+1}")
-                    
-                    # 清理URL
-                    clean_url = image_url.split('?')[0].replace('http:', 'https:')
-                    
-                    if clean_url:
-                        if settings['useBase64Images']:
-                            # 转换为base64格式
-                            try:
-                                base64_image = await convert_image_to_base64(clean_url, session)
-                                if base64_image:
-                                    html += f'<img src="{base64_image}" alt="图片" loading="lazy" onclick="openLightbox(\'{base64_image}\')" />\n'
-                                    ui.add_update('status', message=f"图片 {current_image}/{total_images} 下载成功")
-                                else:
-                                    ui.add_update('status', message=f"图片 {current_image}/{total_images} 下载失败")
-                            except Exception as e:
-                                ui.add_update('status', message=f"图片 {current_image}/{total_images} 处理出错: {str(e)}")
-                        else:
-                            # 使用原始URL
-                            html += f'<img src="{clean_url}" alt="图片" loading="lazy" onclick="openLightbox(\'{clean_url}\')" onerror="this.style.display=\'none\';" />\n'
-                            ui.add_update('status', message=f"图片 {current_image}/{total_images} 添加完成")
-                
-                html += '</div>\n'
-
-            html += '</div>\n'
-
-    html += '</body>\n</html>'
-    return html
\ No newline at end of file
+        count = len(article.get('images') or [])
+        if batch and image_count + count > max_images:
+            yield batch
+            batch = []
+            image_count = 0
+        batch.append(article)
+        image_count += count
+    if batch:
+        yield batch
+
+def write_html_styles(out, settings):
+    """写入文章列表和灯箱的样式规则"""
+    out.write('body { font-family: Arial, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px; }\n')
+    out.write('.article { border-bottom: 1px solid #eee; padding: 20px 0; }\n')
+    out.write('.time { color: #888; margin-bottom: 10px; }\n')
+    out.write('.text { white-space: pre-wrap; line-height: 1.6; }\n')
+    out.write('.song { background-color: #f7f7f7; padding: 10px; margin: 10px 0; border-radius: 5px; }\n')
+    out.write('.song a { color: #0c73c2; text-decoration: none; }\n')
+    out.write('.song a:hover { text-decoration: underline; }\n')
+    out.write('.images { display: flex; flex-wrap: wrap; gap: 10px; margin-top: 10px; }\n')
+    out.write(f'.images img {{ width: {settings["imageSize"]}px; height: {settings["imageSize"]}px; object-fit: cover; border-radius: 3px; cursor: pointer; }}\n')
+    out.write('.lightbox { display: none; position: fixed; top: 0; left: 0; width: 100%; height: 100%; background-color: rgba(0,0,0,0.8); z-index: 1000; justify-content: center; align-items: center; }\n')
+    out.write('.lightbox img { max-width: 90%; max-height: 90%; object-fit: contain; }\n')
+    out.write('.close-lightbox { position: absolute; top: 20px; right: 20px; color: white; font-size: 30px; cursor: pointer; }\n')
+    out.write('.page-nav { display: flex; justify-content: space-between; padding: 10px 0; border-bottom: 1px solid #eee; }\n')
+    out.write('.page-nav a { color: #0c73c2; text-decoration: none; }\n')
+
+def write_lightbox(out):
+    """写入灯箱元素"""
+    out.write('<div id="lightbox" class="lightbox" onclick="closeLightbox()">\n')
+    out.write('  <span class="close-lightbox">&times;</span>\n')
+    out.write('  <img id="lightbox-img" src="" alt="大图">\n')
+    out.write('</div>\n')
+
+def write_html_header(out, settings, title=None):
+    """写入HTML文档头、样式、灯箱脚本和灯箱元素"""
+    out.write('<!DOCTYPE html>\n<html lang="zh-CN">\n<head>\n')
+    out.write('<meta charset="UTF-8">\n')
+    out.write(f'<title>{title or DEFAULT_TITLE}</title>\n')
+    out.write('<style>\n')
+    write_html_styles(out, settings)
+    out.write('</style>\n')
+    out.write('<script>\n')
+    out.write('function openLightbox(imgSrc) {\n')
+    out.write('  const lightbox = document.getElementById("lightbox");\n')
+    out.write('  const lightboxImg = document.getElementById("lightbox-img");\n')
+    out.write('  lightboxImg.src = imgSrc;\n')
+    out.write('  lightbox.style.display = "flex";\n')
+    out.write('}\n')
+    out.write('function closeLightbox() {\n')
+    out.write('  document.getElementById("lightbox").style.display = "none";\n')
+    out.write('}\n')
+    out.write('</script>\n')
+    out.write('</head>\n<body>\n')
+
+    # 添加灯箱元素
+    write_lightbox(out)
+
+def write_html_footer(out):
+    out.write('</body>\n</html>')
+
+def write_base64_data(out, payload):
+    """分块编码图片并直接写入输出"""
+    out.write(f'data:{payload.content_type};base64,')
+    for chunk in payload.iter_chunks(BASE64_CHUNK_SIZE):
+        out.write(base64.b64encode(chunk).decode('ascii'))
+
+def write_base64_image(out, payload, full=None):
+    """写入内嵌图片，每张图片的数据只写一次
+
+    full 为灯箱中显示的原图，可为 ImagePayload 或链接；为空时灯箱从图片自身的src读取
+    """
+    out.write('<img src="')
+    write_base64_data(out, payload)
+    out.write('"')
+    if isinstance(full, ImagePayload):
+        out.write(' data-full="')
+        write_base64_data(out, full)
+        out.write('"')
+    elif full:
+        out.write(f' data-full="{full}"')
+    out.write(' alt="图片" loading="lazy" onclick="openLightbox(this.dataset.full || this.src)" />\n')
+
+def write_article(out, article, images, settings, thumbnails=None, anchor=None):
+    """写入一篇文章
+
+    images 为图片URL到图片的映射: base64 模式下为 ImagePayload，assets 模式下为相对路径；
+    thumbnails 为同样形式的缩略图映射，有缩略图时列表中显示缩略图，灯箱中显示原图；
+    anchor 为文章元素的id，供其他页面链接定位
+    """
+    thumbnails = thumbnails or {}
+    if anchor:
+        out.write(f'<div class="article" id="{anchor}">\n')
+    else:
+        out.write('<div class="article">\n')
+
+    # 时间
+    out.write(f'<div class="time">{article["time"]}</div>\n')
+
+    # 文本内容 - 直接使用HTML内容，保留<br>标签
+    out.write(f'<div class="text">{article["text"]}</div>\n')
+
+    # 歌曲信息（如果有）
+    if article.get('song'):
+        song = article['song']
+        out.write('<div class="song">\n')
+        out.write(f'<div><a href="{song["url"]}" target="_blank">{song["title"]}</a></div>\n')
+        out.write(f'<div>歌手: <a href="{song["artistUrl"]}" target="_blank">{song["artist"]}</a></div>\n')
+        out.write('</div>\n')
+
+    # 图片（如果有）
+    if article.get('images') and len(article['images']) > 0:
+        mode = get_image_mode(settings)
+        out.write('<div class="images">\n')
+        for image_url in article['images']:
+            # 清理URL
+            clean_url = clean_image_url(image_url)
+            if not clean_url:
+                continue
+
+            # 没有保存原图时灯箱使用原图的在线链接
+            if mode == IMAGE_MODE_BASE64:
+                payload = images.get(clean_url)
+                thumbnail = thumbnails.get(clean_url)
+                # 保存原图时不会有缩略图，每张图片只内嵌一份数据
+                if thumbnail:
+                    write_base64_image(out, thumbnail, full=clean_url)
+                elif payload:
+                    write_base64_image(out, payload)
+            elif mode == IMAGE_MODE_ASSETS:
+                src = images.get(clean_url)
+                thumbnail = thumbnails.get(clean_url)
+                if thumbnail:
+                    out.write(f'<img src="{thumbnail}" data-full="{src or clean_url}" alt="图片" loading="lazy" onclick="openLightbox(this.dataset.full)" />\n')
+                elif src:
+                    out.write(f'<img src="{src}" alt="图片" loading="lazy" onclick="openLightbox(this.src)" />\n')
+            else:
+                # 使用原始URL，支持缩放的图片在列表中显示服务器缩略图
+                grid_url = grid_image_url(clean_url, settings)
+                if grid_url:
+                    out.write(f'<img src="{grid_url}" data-full="{clean_url}" alt="图片" loading="lazy" onclick="openLightbox(this.dataset.full)" onerror="this.style.display=\'none\';" />\n')
+                else:
+                    out.write(f'<img src="{clean_url}" alt="图片" loading="lazy" onclick="openLightbox(this.src)" onerror="this.style.display=\'none\';" />\n')
+
+        out.write('</div>\n')
+
+    out.write('</div>\n')
+
+class ImageExportSession:
+    """一次导出共用的图片下载会话、图片缓存和缩略图进程池，可供多个页面同时使用"""
+
+    def __init__(self, settings, ui, total_images, assets=None):
+        self.settings = settings
+        self.ui = ui
+        self.total_images = total_images
+        self.assets = assets
+        self.mode = get_image_mode(settings)
+        self.cache = None
+        self.renderer = None
+        self.session = None
+        self.downloader = None
+
+    async def __aenter__(self):
+        if self.mode == IMAGE_MODE_ASSETS and self.assets is None:
+            raise ValueError("assets 模式需要指定图片目录")
+
+        self.ui.add_update('status', message=f"共有 {self.total_images} 张图片需要处理")
+        if self.mode != IMAGE_MODE_LINK and self.total_images:
+            self.cache = open_image_cache(self.settings)
+            self.renderer = open_thumbnail_renderer(self.settings)
+            self.session = create_image_session(self.settings)
+            self.downloader = ImageDownloader(
+                self.session,
+                self.settings,
+                self.ui,
+                self.total_images * fetches_per_image(self.settings),
+                self.cache,
+            )
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self.session:
+            await self.session.close()
+        if self.renderer:
+            self.ui.add_update('status', message=f"缩略图: {self.renderer.summary()}")
+            self.renderer.close()
+        if self.cache:
+            self.ui.add_update('status', message=f"图片缓存: {self.cache.summary()}")
+            self.cache.close()
+        if self.assets and self.downloader:
+            self.ui.add_update('status', message=f"图片目录: {self.assets.summary()}")
+
+    @property
+    def window(self):
+        """每批预取的图片数"""
+        return get_download_setting(self.settings, 'imageConcurrency') * PREFETCH_WINDOW_FACTOR
+
+    async def prepare(self, articles):
+        """下载一批文章的图片并生成缩略图，返回 (images, thumbnails) 供 write_article 使用"""
+        if not self.downloader:
+            return {}, {}
+
+        urls = [
+            clean_image_url(image_url)
+            for article in articles
+            for image_url in (article.get('images') or [])
+        ]
+        fetch_urls = batch_fetch_urls(urls, self.settings)
+        if self.mode == IMAGE_MODE_ASSETS:
+            fetched = await save_batch_assets(list(fetch_urls), self.downloader, self.assets)
+        else:
+            fetched = await self.downloader.download(list(fetch_urls))
+        images, resized = split_resized(fetched, fetch_urls)
+
+        # 服务器缩略图已是显示尺寸，直接使用；只为没有服务器缩略图的原图生成缩略图
+        originals = {url: value for url, value in images.items() if url not in resized}
+        if self.mode == IMAGE_MODE_ASSETS:
+            thumbnails = await save_batch_asset_thumbnails(originals, self.assets, self.renderer)
+        else:
+            thumbnails = await render_batch_thumbnails(originals, self.renderer)
+        thumbnails.update(resized)
+        return images, thumbnails
+
+def count_images(articles):
+    return sum(len(article.get('images') or []) for article in articles)
+
+async def write_html_document(
+    out, articles, settings, ui, assets=None, image_session=None, title=None, nav=None, anchors=None
+):
+    """将完整的HTML文档流式写入 out
+
+    图片按批预取后立即写出，内存中最多保留一批图片，与导出规模无关；
+    assets 模式下图片保存到 assets 目录，HTML中只写相对路径。
+    分页导出时多个页面共用 image_session，nav 为写在页面首尾的导航HTML，
+    anchors 为文章序号到元素id的映射
+    """
+    if image_session is None:
+        async with ImageExportSession(settings, ui, count_images(articles), assets) as image_session:
+            await write_html_document(
+                out, articles, settings, ui,
+                image_session=image_session, title=title, nav=nav, anchors=anchors,
+            )
+        return
+
+    anchors = anchors or {}
+    write_html_header(out, settings, title)
+    if nav:
+        out.write(nav)
+
+    position = 0
+    for batch in iter_article_batches(articles, image_session.window):
+        images, thumbnails = await image_session.prepare(batch)
+        for article in batch:
+            write_article(out, article, images, settings, thumbnails, anchors.get(position))
+            position += 1
+
+    if nav:
+        out.write(nav)
+    write_html_footer(out)
+
+async def save_batch_assets(urls, downloader, assets):
+    """把一批图片保存到图片目录，已保存过的图片不再下载，返回URL到相对路径的映射"""
+    images = {}
+    missing = []
+    for url in dict.fromkeys(urls):
+        src = assets.lookup(url)
+        if src:
+            images[url] = src
+            downloader.finished += 1
+        else:
+            missing.append(url)
+
+    payloads = await downloader.download(missing)
+    for url, payload in payloads.items():
+        try:
+            images[url] = assets.save(url, payload)
+        except OSError as e:
+            logger.warning(f"保存图片失败: {e}, URL: {url}")
+    return images
+
+def open_thumbnail_renderer(settings):
+    """按设置创建缩略图生成器，不生成缩略图时返回None"""
+    if not get_thumbnail_setting(settings, 'thumbnails') or not separate_grid_images(settings):
+        return None
+    try:
+        return ThumbnailRenderer(settings)
+    except Exception as e:
+        logger.warning(f"无法生成缩略图: {e}")
+        return None
+
+async def render_batch_thumbnails(images, renderer):
+    """为一批已下载的图片生成缩略图，返回URL到缩略图 ImagePayload 的映射"""
+    if not renderer:
+        return {}
+
+    async def render_one(url, payload):
+        source = payload.path if payload.path is not None else payload.data
+        data = await renderer.render(source, payload.size())
+        return url, data
+
+    results = await asyncio.gather(*(render_one(url, payload) for url, payload in images.items()))
+    return {
+        url: ImagePayload(renderer.content_type, data=data)
+        for url, data in results
+        if data
+    }
+
+async def save_batch_asset_thumbnails(images, assets, renderer):
+    """为图片目录中的原图生成缩略图，已生成过的直接复用，返回URL到缩略图相对路径的映射"""
+    if not renderer:
+        return {}
+
+    variant = renderer.variant
+    # 内容相同的图片共用一个原图文件，缩略图也只生成一次
+    by_src = {}
+    for src in images.values():
+        if src not in by_src:
+            by_src[src] = assets.lookup_thumbnail(src, variant)
+
+    async def render_one(src):
+        path = assets.original_path(src)
+        data = await renderer.render(path, path.stat().st_size)
+        if data:
+            by_src[src] = assets.save_thumbnail(src, variant, data)
+
+    await asyncio.gather(*(render_one(src) for src, thumb in list(by_src.items()) if not thumb))
+    return {url: by_src[src] for url, src in images.items() if by_src.get(src)}
+
+async def generate_html_content(articles, settings, ui):
+    """生成HTML内容字符串，处理图片为base64格式，显示详细进度"""
+    out = io.StringIO()
+    await write_html_document(out, articles, settings, ui)
+    return out.getvalue()
@@ -0,0 +1,95 @@
+"""
+文章ID集合，把ID压缩为64位整数保存在开放寻址的数组中，十万篇以上的文章去重仍然快速且占用内存小
+"""
+import hashlib
+from array import array
+
+_MASK64 = (1 << 64) - 1
+
+# 斐波那契散列的乘数，使连续的动态ID均匀分布到各个槽位
+_GOLDEN = 0x9E3779B97F4A7C15
+
+# 内容哈希使用最高位，与数字动态ID的取值范围分开
+_HASH_FLAG = 1 << 63
+
+
+def id_key(article_id):
+    """文章ID对应的64位整数，数字动态ID直接使用，其他ID取哈希，结果不为0"""
+    article_id = str(article_id)
+    if article_id.isdigit():
+        value = int(article_id)
+        if 0 < value < _HASH_FLAG:
+            return value
+
+    digest = hashlib.blake2b(article_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") | _HASH_FLAG
+
+
+class CompactIdSet:
+    """只支持添加和查询的ID集合，每个ID占用8字节，负载不超过一半时扩容"""
+
+    __slots__ = ("_table", "_bits", "_size")
+
+    def __init__(self, ids=(), capacity=1024):
+        bits = max(4, (max(capacity, 1) * 2 - 1).bit_length())
+        self._allocate(bits)
+        for article_id in ids:
+            self.add(article_id)
+
+    def _allocate(self, bits):
+        self._bits = bits
+        self._table = array("Q", bytes(8 << bits))
+        self._size = 0
+
+    def _probe(self, key):
+        """返回 key 所在的槽位，不存在时返回应插入的空槽位"""
+        table = self._table
+        mask = (1 << self._bits) - 1
+        index = ((key * _GOLDEN) & _MASK64) >> (64 - self._bits)
+        while True:
+            value = table[index]
+            if value == key or value == 0:
+                return index
+            index = (index + 1) & mask
+
+    def _grow(self):
+        old_table = self._table
+        self._allocate(self._bits + 1)
+        for key in old_table:
+            if key:
+                self._table[self._probe(key)] = key
+                self._size += 1
+
+    def add(self, article_id):
+        """添加ID，返回是否为新ID"""
+        key = id_key(article_id)
+        index = self._probe(key)
+        if self._table[index] == key:
+            return False
+
+        if (self._size + 1) * 2 > len(self._table):
+            self._grow()
+            index = self._probe(key)
+
+        self._table[index] = key
+        self._size += 1
+        return True
+
+    def update(self, ids):
+        for article_id in ids:
+            self.add(article_id)
+
+    def __contains__(self, article_id):
+        key = id_key(article_id)
+        return self._table[self._probe(key)] == key
+
+    def __len__(self):
+        return self._size
+
+    def clear(self):
+        self._allocate(4)
+
+    @property
+    def nbytes(self):
+        """哈希表占用的字节数"""
+        return len(self._table) * self._table.itemsize
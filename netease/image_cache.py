@@ -0,0 +1,261 @@
+"""
+图片缓存模块，按内容哈希在磁盘上保存下载过的图片，在多次导出和多次运行之间共享
+"""
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from .browser_manager import get_app_dir
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    content_type TEXT,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_digest ON entries (digest);
+CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at);
+"""
+
+# 默认缓存上限 1GB
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+# 缓存在这段时间内直接使用，超过后向服务器做条件请求重新验证
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+
+# 累计多少次访问记录后提交一次事务
+COMMIT_INTERVAL = 100
+
+
+def default_cache_dir():
+    """默认缓存目录，放在应用程序目录下"""
+    return get_app_dir() / "image_cache"
+
+
+class CacheEntry:
+    """一条缓存记录"""
+
+    __slots__ = (
+        "url",
+        "digest",
+        "content_type",
+        "size",
+        "etag",
+        "last_modified",
+        "fetched_at",
+        "path",
+    )
+
+    def __init__(self, url, digest, content_type, size, etag, last_modified, fetched_at, path):
+        self.url = url
+        self.digest = digest
+        self.content_type = content_type
+        self.size = size
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+        self.path = path
+
+
+class ImageCache:
+    """以清理后的图片URL为键、图片内容的SHA-256为文件名的磁盘缓存
+
+    相同内容的图片只保存一份；总大小超过上限时按最近访问时间淘汰；
+    过期的记录通过 ETag/Last-Modified 条件请求重新验证
+    """
+
+    def __init__(self, root=None, max_bytes=DEFAULT_MAX_BYTES, max_age=DEFAULT_MAX_AGE):
+        self.root = Path(root) if root else default_cache_dir()
+        self.objects_dir = self.root / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.conn = sqlite3.connect(str(self.root / "index.db"), check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+        self.total_bytes = self._compute_total_bytes()
+
+    def _compute_total_bytes(self):
+        (total,) = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM "
+            "(SELECT MAX(size) AS size FROM entries GROUP BY digest)"
+        ).fetchone()
+        return total
+
+    def blob_path(self, digest):
+        """内容哈希对应的文件路径，按前两位分目录"""
+        return self.objects_dir / digest[:2] / digest
+
+    def lookup(self, url):
+        """查找缓存记录，记录存在但文件丢失时视为未缓存"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT digest, content_type, size, etag, last_modified, fetched_at "
+                "FROM entries WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if not row:
+            return None
+
+        digest, content_type, size, etag, last_modified, fetched_at = row
+        path = self.blob_path(digest)
+        if not path.exists():
+            self._delete_url(url)
+            return None
+
+        return CacheEntry(url, digest, content_type, size, etag, last_modified, fetched_at, path)
+
+    def is_fresh(self, entry):
+        """记录是否仍在有效期内，无需重新验证"""
+        return time.time() - entry.fetched_at < self.max_age
+
+    def conditional_headers(self, entry):
+        """用于重新验证的条件请求头"""
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def read(self, entry):
+        """读取缓存的图片数据并记录访问"""
+        data = entry.path.read_bytes()
+        self.mark_hit(entry)
+        return data
+
+    def mark_hit(self, entry, revalidated=False):
+        """记录一次命中，重新验证成功时同时刷新有效期"""
+        now = time.time()
+        with self._lock:
+            if revalidated:
+                self.revalidated += 1
+                self.conn.execute(
+                    "UPDATE entries SET accessed_at = ?, fetched_at = ? WHERE url = ?",
+                    (now, now, entry.url),
+                )
+                entry.fetched_at = now
+            else:
+                self.hits += 1
+                self.conn.execute(
+                    "UPDATE entries SET accessed_at = ? WHERE url = ?", (now, entry.url)
+                )
+            self._maybe_commit()
+
+    def store(self, url, data, content_type, etag=None, last_modified=None):
+        """保存图片数据，返回缓存记录"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(digest)
+
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 先写临时文件再改名，避免中断时留下不完整的文件；
+            # 临时文件名各不相同，多个进程同时写入同一内容时互不干扰
+            with tempfile.NamedTemporaryFile(
+                dir=path.parent, prefix=f"{digest}.", suffix=".tmp", delete=False
+            ) as tmp_file:
+                tmp_file.write(data)
+            try:
+                os.replace(tmp_file.name, path)
+            except OSError:
+                os.unlink(tmp_file.name)
+                raise
+            new_bytes = len(data)
+        else:
+            new_bytes = 0
+
+        now = time.time()
+        with self._lock:
+            self.misses += 1
+            # URL对应的内容变化时，旧内容没有其他引用就删除
+            row = self.conn.execute(
+                "SELECT digest FROM entries WHERE url = ?", (url,)
+            ).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries "
+                "(url, digest, content_type, size, etag, last_modified, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, digest, content_type, len(data), etag, last_modified, now, now),
+            )
+            self.total_bytes += new_bytes
+            if row and row[0] != digest:
+                self._release_blob(row[0])
+            self._maybe_commit()
+
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+        return CacheEntry(url, digest, content_type, len(data), etag, last_modified, now, path)
+
+    def evict(self):
+        """按最近访问时间淘汰记录，直到总大小低于上限的90%"""
+        target = int(self.max_bytes * 0.9)
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT url, digest FROM entries ORDER BY accessed_at ASC"
+            ).fetchall()
+            for url, digest in rows:
+                if self.total_bytes <= target:
+                    break
+                self.conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+                self.evictions += 1
+                self._release_blob(digest)
+            self.conn.commit()
+            self._pending = 0
+
+    def _release_blob(self, digest):
+        """没有记录引用该内容时删除文件，调用时需持有锁"""
+        # 同一内容可能被多个URL引用
+        still_used = self.conn.execute(
+            "SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)
+        ).fetchone()
+        if still_used:
+            return
+
+        path = self.blob_path(digest)
+        try:
+            size = path.stat().st_size
+            path.unlink()
+            self.total_bytes -= size
+        except OSError:
+            pass
+
+    def _delete_url(self, url):
+        with self._lock:
+            self.conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._maybe_commit()
+
+    def _maybe_commit(self):
+        self._pending += 1
+        if self._pending >= COMMIT_INTERVAL:
+            self.conn.commit()
+            self._pending = 0
+
+    def summary(self):
+        """缓存命中统计"""
+        return (
+            f"命中 {self.hits}, 未命中 {self.misses}, 重新验证 {self.revalidated}, "
+            f"淘汰 {self.evictions}, 占用 {self.total_bytes / (1024 * 1024):.1f}MB"
+        )
+
+    def close(self):
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
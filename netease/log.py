@@ -0,0 +1,123 @@
+"""
+日志模块，各模块通过 logging.getLogger(__name__) 记录日志，这里统一配置输出：
+控制台、保存最近日志的环形缓冲区（错误详情使用）以及限速转发到状态栏
+"""
+import collections
+import logging
+import sys
+import time
+
+LOGGER_NAME = "netease"
+LOG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+LOG_DATE_FORMAT = "%H:%M:%S"
+
+# 环形缓冲区保存的日志条数
+RING_BUFFER_SIZE = 1000
+# 两次转发到状态栏的最小间隔（秒）
+STATUS_INTERVAL = 0.2
+
+_ring_buffer = None
+_console_handler = None
+
+
+class RingBufferHandler(logging.Handler):
+    """只保存最近 capacity 条格式化后的日志"""
+
+    def __init__(self, capacity=RING_BUFFER_SIZE):
+        super().__init__()
+        self.records = collections.deque(maxlen=capacity)
+
+    def emit(self, record):
+        try:
+            self.records.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+    def dump(self):
+        """返回缓冲区中的全部日志"""
+        self.acquire()
+        try:
+            return "\n".join(self.records)
+        finally:
+            self.release()
+
+    def clear(self):
+        self.acquire()
+        try:
+            self.records.clear()
+        finally:
+            self.release()
+
+
+class StatusHandler(logging.Handler):
+    """把日志消息转发给 callback（如界面状态栏）
+
+    两次转发至少间隔 interval 秒，期间的消息只保留最新一条，在下次转发或 flush 时送出；
+    警告和错误总是立即转发
+    """
+
+    def __init__(self, callback, interval=STATUS_INTERVAL, level=logging.INFO):
+        super().__init__(level)
+        self.callback = callback
+        self.interval = interval
+        self._last = 0.0
+        self._pending = None
+
+    def emit(self, record):
+        now = time.monotonic()
+        if record.levelno < logging.WARNING and now - self._last < self.interval:
+            self._pending = record
+            return
+        self._pending = None
+        self._last = now
+        self._send(record)
+
+    def _send(self, record):
+        try:
+            self.callback(record.getMessage())
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        """送出被限速保留的最后一条消息"""
+        self.acquire()
+        try:
+            record, self._pending = self._pending, None
+        finally:
+            self.release()
+        if record is not None:
+            self._send(record)
+
+
+def configure_logging(console_level=logging.INFO, debug=False):
+    """配置 netease 日志，可重复调用以修改级别，返回环形缓冲区
+
+    debug 为真时同时记录逐篇文章、逐张图片的调试日志
+    """
+    global _ring_buffer, _console_handler
+
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(logging.DEBUG if debug else logging.INFO)
+
+    if _ring_buffer is None:
+        logger.propagate = False
+        formatter = logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT)
+
+        _ring_buffer = RingBufferHandler()
+        _ring_buffer.setFormatter(formatter)
+        logger.addHandler(_ring_buffer)
+
+        # 打包后的图形界面程序没有控制台，sys.__stderr__ 为 None
+        if sys.__stderr__ is not None:
+            _console_handler = logging.StreamHandler(sys.__stderr__)
+            _console_handler.setFormatter(formatter)
+            logger.addHandler(_console_handler)
+
+    if _console_handler is not None:
+        _console_handler.setLevel(console_level)
+    return _ring_buffer
+
+
+def get_ring_buffer():
+    """返回环形缓冲区，尚未配置日志时先按默认设置配置"""
+    return _ring_buffer or configure_logging()
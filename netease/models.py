@@ -0,0 +1,133 @@
+"""
+文章和歌曲的数据类型，使用 __slots__ 减少内存占用，同时支持按字典方式读取
+"""
+from collections.abc import Mapping
+
+# 图片URL在文章中合并为一个字符串保存，用换行分隔（URL中不会出现换行）
+IMAGE_SEPARATOR = "\n"
+
+
+class _Record(Mapping):
+    """只读的轻量记录，字段通过 __slots__ 保存，可像字典一样按键读取"""
+
+    __slots__ = ()
+    FIELDS = ()
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} 不可修改")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} 不可修改")
+
+    def __repr__(self):
+        fields = ", ".join(f"{key}={self[key]!r}" for key in self.FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+    def __reduce__(self):
+        return (type(self), tuple(self[key] for key in self.FIELDS))
+
+
+class Song(_Record):
+    """动态分享的歌曲"""
+
+    __slots__ = ("title", "url", "artist", "artistUrl")
+    FIELDS = __slots__
+
+    def __init__(self, title="", url="", artist="", artistUrl=""):
+        object.__setattr__(self, "title", title)
+        object.__setattr__(self, "url", url)
+        object.__setattr__(self, "artist", artist)
+        object.__setattr__(self, "artistUrl", artistUrl)
+
+    @classmethod
+    def from_value(cls, value):
+        """由字典或 Song 创建，空值返回None"""
+        if not value:
+            return None
+        if isinstance(value, cls):
+            return value
+        return cls(
+            value.get("title", ""),
+            value.get("url", ""),
+            value.get("artist", ""),
+            value.get("artistUrl", ""),
+        )
+
+    def to_dict(self):
+        return {key: self[key] for key in self.FIELDS}
+
+
+class Article(_Record):
+    """一条动态
+
+    images 读取时返回元组，内部合并为一个字符串保存，
+    大量文章时可省去每篇一个列表和每个URL一个字符串对象的开销
+    """
+
+    __slots__ = ("id", "time", "text", "song", "_images")
+    FIELDS = ("id", "time", "text", "song", "images")
+
+    def __init__(self, id, time, text, song=None, images=()):
+        object.__setattr__(self, "id", id)
+        object.__setattr__(self, "time", time)
+        object.__setattr__(self, "text", text)
+        object.__setattr__(self, "song", Song.from_value(song))
+        object.__setattr__(self, "_images", IMAGE_SEPARATOR.join(images) if images else None)
+
+    @property
+    def images(self):
+        if self._images is None:
+            return ()
+        return tuple(self._images.split(IMAGE_SEPARATOR))
+
+    @property
+    def image_count(self):
+        if self._images is None:
+            return 0
+        return self._images.count(IMAGE_SEPARATOR) + 1
+
+    @classmethod
+    def from_value(cls, value):
+        """由字典或 Article 创建"""
+        if isinstance(value, cls):
+            return value
+        return cls(
+            value["id"],
+            value.get("time", ""),
+            value.get("text", ""),
+            value.get("song"),
+            value.get("images") or (),
+        )
+
+    def replace(self, **changes):
+        """返回修改了部分字段的新文章"""
+        fields = {key: self[key] for key in self.FIELDS}
+        fields.update(changes)
+        return type(self)(**fields)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "time": self.time,
+            "text": self.text,
+            "song": self.song.to_dict() if self.song else None,
+            "images": list(self.images),
+        }
+
+
+def json_default(value):
+    """供 json.dumps 使用，把文章和歌曲转换为字典"""
+    if isinstance(value, (Article, Song)):
+        return value.to_dict()
+    raise TypeError(f"无法序列化 {type(value).__name__}")
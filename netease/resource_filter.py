@@ -0,0 +1,89 @@
+"""
+资源拦截模块，爬取时拦截图片、字体等用不到的资源和第三方统计脚本，并统计流量
+"""
+import re
+
+# 爬虫只读取文本和图片地址，这些类型的资源无需下载
+BLOCKED_RESOURCE_TYPES = ("image", "media", "font")
+
+# 常见的第三方统计和日志上报地址
+BLOCKED_URL_PATTERNS = (
+    r"hm\.baidu\.com",
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"\.cnzz\.com",
+    r"clientlog\d*\.music\.163\.com",
+    r"/weapi/feedback/weblog",
+)
+
+
+class ResourceBlocker:
+    """安装在浏览器上下文上的请求路由，拦截无用资源并统计请求数和下载量"""
+
+    def __init__(
+        self,
+        blocked_types=BLOCKED_RESOURCE_TYPES,
+        blocked_patterns=BLOCKED_URL_PATTERNS,
+        allowlist=(),
+    ):
+        self.blocked_types = set(blocked_types)
+        self.blocked_patterns = [re.compile(p) for p in blocked_patterns]
+        # 白名单中的URL模式总是放行，优先于拦截规则
+        self.allowlist = [re.compile(p) for p in allowlist]
+        self.reset()
+
+    def reset(self):
+        """清空统计数据"""
+        self.request_count = 0
+        self.blocked_count = 0
+        self.bytes_downloaded = 0
+
+    async def install(self, context):
+        """在上下文上注册路由和请求完成事件"""
+        await context.route("**/*", self._handle_route)
+        context.on("requestfinished", self._handle_request_finished)
+
+    def should_block(self, request):
+        """判断请求是否需要拦截"""
+        # 页面跳转总是放行：用户主页和其中 #g_iframe 的文档都是跳转请求，拦截后无法加载动态
+        if request.is_navigation_request():
+            return False
+
+        url = request.url
+        if any(p.search(url) for p in self.allowlist):
+            return False
+
+        if request.resource_type in self.blocked_types:
+            return True
+
+        return any(p.search(url) for p in self.blocked_patterns)
+
+    async def _handle_route(self, route):
+        request = route.request
+        try:
+            if self.should_block(request):
+                self.blocked_count += 1
+                await route.abort("blockedbyclient")
+            else:
+                await route.continue_()
+        except Exception:
+            # 页面关闭等情况下路由可能已失效
+            pass
+
+    async def _handle_request_finished(self, request):
+        self.request_count += 1
+        try:
+            sizes = await request.sizes()
+            self.bytes_downloaded += (
+                sizes.get("responseBodySize", 0) + sizes.get("responseHeadersSize", 0)
+            )
+        except Exception:
+            pass
+
+    def summary(self):
+        """生成流量统计摘要"""
+        return (
+            f"请求 {self.request_count} 个, "
+            f"下载 {self.bytes_downloaded / (1024 * 1024):.2f}MB, "
+            f"拦截 {self.blocked_count} 个"
+        )
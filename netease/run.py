@@ -2,24 +2,23 @@
 网易云音乐动态备份工具启动脚本
 """
 
-import tkinter as tk
+from netease.browser_pool import BrowserPool
 from netease.crawler import NetEaseCrawler
-from netease.ui import NetEaseMusicUI
-import asyncio
+from netease.log import configure_logging
+import logging
 import sys
-import traceback
 import signal
 import atexit
+import multiprocessing
 
+logger = logging.getLogger("netease.run")
 
-def cleanup(crawler):
-    """清理函数"""
+
+def cleanup(browser_pool):
+    """清理函数，在浏览器池的事件循环中关闭浏览器"""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(crawler.close())
-        loop.close()
-    except:
+        browser_pool.close(timeout=5)
+    except Exception:
         pass
 
 
@@ -30,9 +29,21 @@ def signal_handler(signum, frame):
 
 
 def main():
-    """应用程序入口点"""
-    crawler = None
-    
+    """应用程序入口点，带参数运行时使用命令行模式"""
+    # 打包后的程序中导出缩略图的子进程需要此调用
+    multiprocessing.freeze_support()
+
+    if len(sys.argv) > 1:
+        from netease.cli import main as cli_main
+
+        sys.exit(cli_main(sys.argv[1:]))
+
+    configure_logging()
+
+    # 图形界面依赖按需导入，命令行模式无需显示环境
+    import tkinter as tk
+    from netease.ui import NetEaseMusicUI
+
     try:
         # 设置信号处理
         signal.signal(signal.SIGINT, signal_handler)
@@ -44,8 +55,9 @@ def main():
                 sys.__excepthook__(exc_type, exc_value, exc_traceback)
                 return
             
-            print("未捕获的异常:")
-            traceback.print_exception(exc_type, exc_value, exc_traceback)
+            logger.error(
+                "未捕获的异常", exc_info=(exc_type, exc_value, exc_traceback)
+            )
         
         sys.excepthook = handle_exception
         
@@ -56,23 +68,19 @@ def main():
         
         # 创建爬虫实例
         crawler = NetEaseCrawler()
+        browser_pool = BrowserPool(crawler)
         
-        # 注册退出时的清理函数
-        atexit.register(lambda: cleanup(crawler))
+        # 退出时统一在这里关闭浏览器池；关闭窗口时界面已先关闭，重复关闭不会再执行
+        atexit.register(cleanup, browser_pool)
         
-        # 创建UI实例，传入爬虫
-        app = NetEaseMusicUI(root, crawler)
+        # 创建UI实例，传入爬虫和浏览器池
+        app = NetEaseMusicUI(root, crawler, browser_pool)
         
         # 启动主循环
         root.mainloop()
         
     except Exception as e:
-        print(f"应用程序错误: {e}")
-        traceback.print_exc()
-    finally:
-        # 确保关闭爬虫
-        if crawler:
-            cleanup(crawler)
+        logger.exception(f"应用程序错误: {e}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,121 @@
+"""
+自适应滚动调度模块，每次滚动只做一次页面调用：滚动到底部并等待新文章出现
+"""
+import time
+
+# 在iframe内运行：滚动到底部，用 MutationObserver 等待新的文章节点出现或超时
+SCROLL_AND_WAIT_JS = """
+async ({ selector, timeout, settle }) => {
+    const start = performance.now();
+    const before = document.querySelectorAll(selector).length;
+    const heightBefore = document.body.scrollHeight;
+
+    const addsArticle = (node) =>
+        node.nodeType === 1 && (node.matches(selector) || node.querySelector(selector));
+
+    window.scrollTo(0, document.body.scrollHeight);
+
+    const grew = await new Promise((resolve) => {
+        let settleTimer = null;
+        let found = false;
+        const finish = (result) => {
+            observer.disconnect();
+            clearTimeout(deadline);
+            clearTimeout(settleTimer);
+            resolve(result);
+        };
+        // 发现新节点后再等待一小段时间，让同一批内容渲染完整
+        const observer = new MutationObserver((records) => {
+            if (!found) {
+                found = records.some((r) => Array.from(r.addedNodes).some(addsArticle));
+                if (!found) return;
+            }
+            clearTimeout(settleTimer);
+            settleTimer = setTimeout(() => finish(true), settle);
+        });
+        observer.observe(document.body, { childList: true, subtree: true });
+        const deadline = setTimeout(() => finish(found), timeout);
+    });
+
+    return {
+        grew,
+        before,
+        after: document.querySelectorAll(selector).length,
+        heightBefore,
+        height: document.body.scrollHeight,
+        elapsed: performance.now() - start,
+    };
+}
+"""
+
+
+class AdaptiveScrollScheduler:
+    """根据页面加载速度自动调整每次滚动的等待时间
+
+    新内容出现得快时缩短等待上限，连续等不到新内容或服务器变慢时指数退避
+    """
+
+    def __init__(
+        self,
+        selector=".dcntc",
+        initial_timeout=2.0,
+        min_timeout=1.0,
+        max_timeout=12.0,
+        settle=0.15,
+    ):
+        self.selector = selector
+        self.timeout = initial_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.settle = settle
+
+        # 最近一次成功加载耗时的滑动平均和历史最快耗时（秒）
+        self.average_latency = None
+        self.best_latency = None
+        self.consecutive_misses = 0
+        self.steps = 0
+
+    async def step(self, frame):
+        """滚动一次并等待新内容，返回页面侧的结果字典"""
+        self.steps += 1
+        started = time.monotonic()
+        result = await frame.evaluate(
+            SCROLL_AND_WAIT_JS,
+            {
+                "selector": self.selector,
+                "timeout": int(self.timeout * 1000),
+                "settle": int(self.settle * 1000),
+            },
+        )
+        result["elapsed"] = time.monotonic() - started
+        self._adapt(result)
+        return result
+
+    def _adapt(self, result):
+        """根据本次滚动结果调整下一次的等待上限"""
+        if result["grew"]:
+            latency = result["elapsed"]
+            self.consecutive_misses = 0
+            if self.average_latency is None:
+                self.average_latency = latency
+            else:
+                self.average_latency = 0.7 * self.average_latency + 0.3 * latency
+            if self.best_latency is None or latency < self.best_latency:
+                self.best_latency = latency
+
+            # 等待上限取平均耗时的3倍，给偶尔的慢响应留出余量
+            self.timeout = min(
+                self.max_timeout, max(self.min_timeout, self.average_latency * 3)
+            )
+        else:
+            self.consecutive_misses += 1
+            self.timeout = min(self.max_timeout, self.timeout * 2)
+
+    @property
+    def cooldown(self):
+        """两次滚动之间的间隔：服务器明显变慢时按变慢程度放缓节奏"""
+        if not self.average_latency or not self.best_latency:
+            return 0
+        if self.average_latency > self.best_latency * 2:
+            return min(self.max_timeout, self.average_latency)
+        return 0
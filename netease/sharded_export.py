@@ -0,0 +1,284 @@
+"""
+分页导出模块，将大量动态按固定篇数拆分为多个HTML页面，并生成按月份导航的索引页
+"""
+import asyncio
+import hashlib
+import json
+from pathlib import Path
+
+from .data_processor import article_months
+from .exporter import (
+    ASSETS_DIR_NAME,
+    DEFAULT_TITLE,
+    IMAGE_MODE_ASSETS,
+    AssetDirectory,
+    ImageExportSession,
+    count_images,
+    get_image_mode,
+    write_html_document,
+    write_html_footer,
+    write_html_header,
+)
+from .models import json_default
+
+# 分页导出的默认设置，可通过导出设置覆盖
+SHARD_DEFAULTS = {
+    "pageSize": 500,  # 每页的动态数
+    "pageConcurrency": 4,  # 同时生成的页面数
+}
+
+INDEX_FILE_NAME = "index.html"
+MANIFEST_FILE_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# 影响页面内容的导出设置，变化后所有页面都会重新生成
+RENDER_SETTING_KEYS = (
+    "imageSize",
+    "imageMode",
+    "useBase64Images",
+    "thumbnails",
+    "thumbnailFormat",
+    "thumbnailQuality",
+    "thumbnailScale",
+    "embedOriginals",
+    "serverResize",
+)
+
+
+def get_shard_setting(settings, key):
+    """读取分页设置，未设置时使用默认值"""
+    value = settings.get(key)
+    return SHARD_DEFAULTS[key] if value is None else value
+
+
+def page_file_name(number):
+    return f"page-{number:04d}.html"
+
+
+def split_pages(articles, page_size):
+    """按篇数分页，从最早的动态开始编号，新增动态只影响最新的一两页
+
+    articles 按从新到旧排列；返回的页面按编号从旧到新排列，页面内仍按从新到旧排列
+    """
+    pages = []
+    end = len(articles)
+    while end > 0:
+        start = max(0, end - page_size)
+        pages.append(articles[start:end])
+        end = start
+    return pages
+
+
+def month_anchor(month):
+    return f"m-{month}"
+
+
+class ShardPage:
+    """一个分页的文章、导航和内容哈希"""
+
+    def __init__(self, number, articles, page_count, months):
+        self.number = number
+        self.articles = articles
+        self.file_name = page_file_name(number)
+        # 编号大的页面更新，阅读顺序为从新到旧
+        self.newer = page_file_name(number + 1) if number < page_count else None
+        self.older = page_file_name(number - 1) if number > 1 else None
+        # 月份需按全部文章依次推断年份，由调用方传入
+        self.months = months
+
+    def anchors(self):
+        """每个月份第一篇文章的序号到元素id的映射"""
+        anchors = {}
+        seen = set()
+        for position, month in enumerate(self.months):
+            if month not in seen:
+                seen.add(month)
+                anchors[position] = month_anchor(month)
+        return anchors
+
+    def content_hash(self, render_settings):
+        """页面内容的哈希，文章、月份锚点、导航或导出设置变化时改变"""
+        payload = json.dumps(
+            {
+                "articles": self.articles,
+                # 推断出的月份变化时锚点随之变化，需与重新生成的索引链接一致
+                "anchors": self.anchors(),
+                "newer": self.newer,
+                "older": self.older,
+                "settings": render_settings,
+            },
+            ensure_ascii=False,
+            sort_keys=True,
+            default=json_default,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def nav_html(self):
+        """页面首尾的导航链接"""
+        newer = f'<a href="{self.newer}">&laquo; 较新</a>' if self.newer else "<span></span>"
+        older = f'<a href="{self.older}">较早 &raquo;</a>' if self.older else "<span></span>"
+        return (
+            f'<div class="page-nav">{newer}'
+            f'<a href="{INDEX_FILE_NAME}">目录 (第 {self.number} 页)</a>'
+            f"{older}</div>\n"
+        )
+
+
+def load_manifest(root):
+    """读取上次导出的清单，版本不同或无法读取时返回空清单"""
+    try:
+        with open(root / MANIFEST_FILE_NAME, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return {page["file"]: page for page in manifest.get("pages", [])}
+
+
+def write_manifest(root, entries, page_size):
+    tmp_path = root / (MANIFEST_FILE_NAME + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"version": MANIFEST_VERSION, "pageSize": page_size, "pages": entries},
+            f,
+            ensure_ascii=False,
+            indent=2,
+        )
+    tmp_path.replace(root / MANIFEST_FILE_NAME)
+
+
+def write_index(out, pages, settings, total):
+    """写入索引页：按月份和按页的导航"""
+    write_html_header(out, settings, DEFAULT_TITLE)
+    out.write(f"<h1>{DEFAULT_TITLE}</h1>\n")
+    out.write(f"<p>共 {total} 篇动态，{len(pages)} 页</p>\n")
+
+    # 按阅读顺序（从新到旧）记录每个月份第一次出现的页面和篇数
+    months = {}
+    for page in reversed(pages):
+        for month in page.months:
+            if month not in months:
+                months[month] = [page.file_name, 0]
+            months[month][1] += 1
+
+    out.write("<h2>按月份</h2>\n")
+    current_year = None
+    for month, (file_name, count) in months.items():
+        year, month_number = month.split("-")
+        if year != current_year:
+            if current_year is not None:
+                out.write("</div>\n")
+            current_year = year
+            out.write(f'<div class="year"><strong>{year}年</strong> ')
+        out.write(
+            f'<a href="{file_name}#{month_anchor(month)}">{int(month_number)}月</a> ({count}) '
+        )
+    if current_year is not None:
+        out.write("</div>\n")
+
+    out.write("<h2>按页</h2>\n<ul>\n")
+    for page in reversed(pages):
+        newest = page.articles[0].get("time", "")
+        oldest = page.articles[-1].get("time", "")
+        out.write(
+            f'<li><a href="{page.file_name}">第 {page.number} 页</a> '
+            f"{newest} — {oldest} ({len(page.articles)} 篇)</li>\n"
+        )
+    out.write("</ul>\n")
+    write_html_footer(out)
+
+
+async def export_sharded_html(articles, dir_path, settings, ui):
+    """将文章分页导出到目录，生成索引页和清单
+
+    再次导出到同一目录时，只重新生成内容有变化的页面
+    """
+    root = Path(dir_path)
+    root.mkdir(parents=True, exist_ok=True)
+
+    page_size = max(1, int(get_shard_setting(settings, "pageSize")))
+    render_settings = {key: settings.get(key) for key in RENDER_SETTING_KEYS}
+    render_settings["pageSize"] = page_size
+
+    chunks = split_pages(articles, page_size)
+    month_chunks = split_pages(article_months(article.get("time") for article in articles), page_size)
+    pages = [
+        ShardPage(number, chunk, len(chunks), months)
+        for number, (chunk, months) in enumerate(zip(chunks, month_chunks), 1)
+    ]
+
+    previous = load_manifest(root)
+    entries = []
+    pending = []
+    for page in pages:
+        content_hash = page.content_hash(render_settings)
+        entries.append(
+            {
+                "file": page.file_name,
+                "hash": content_hash,
+                "count": len(page.articles),
+                "first": page.articles[0].get("id"),
+                "last": page.articles[-1].get("id"),
+            }
+        )
+        old = previous.get(page.file_name)
+        if not old or old.get("hash") != content_hash or not (root / page.file_name).exists():
+            pending.append(page)
+
+    ui.add_update(
+        "status", message=f"共 {len(pages)} 页，需要生成 {len(pending)} 页，其余页面未变化"
+    )
+
+    assets = None
+    if get_image_mode(settings) == IMAGE_MODE_ASSETS:
+        assets = AssetDirectory(root / ASSETS_DIR_NAME)
+
+    semaphore = asyncio.Semaphore(max(1, int(get_shard_setting(settings, "pageConcurrency"))))
+    finished = 0
+
+    async def generate(page, image_session):
+        nonlocal finished
+        async with semaphore:
+            path = root / page.file_name
+            # 先写临时文件，中断时不会留下不完整的页面
+            tmp_path = path.with_suffix(".html.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                await write_html_document(
+                    f,
+                    page.articles,
+                    settings,
+                    ui,
+                    image_session=image_session,
+                    title=f"{DEFAULT_TITLE} - 第 {page.number} 页",
+                    nav=page.nav_html(),
+                    anchors=page.anchors(),
+                )
+            tmp_path.replace(path)
+        finished += 1
+        ui.add_update("status", message=f"页面 {finished}/{len(pending)} 已生成")
+
+    try:
+        total_images = sum(count_images(page.articles) for page in pending)
+        async with ImageExportSession(settings, ui, total_images, assets) as image_session:
+            await asyncio.gather(*(generate(page, image_session) for page in pending))
+    finally:
+        if assets:
+            assets.close()
+
+    # 删除上次导出中多出的页面
+    current = {page.file_name for page in pages}
+    for file_name in previous:
+        if file_name not in current:
+            try:
+                (root / file_name).unlink()
+            except OSError:
+                pass
+
+    index_path = root / INDEX_FILE_NAME
+    with open(index_path, "w", encoding="utf-8") as f:
+        write_index(f, pages, settings, len(articles))
+    write_manifest(root, entries, page_size)
+
+    ui.add_update("status", message=f"已分页导出到 {index_path}")
+    return str(index_path)
@@ -0,0 +1,137 @@
+"""
+缩略图模块，导出时把原图缩放编码为缩略图，缩放和编码在进程池中进行，不阻塞事件循环
+"""
+import asyncio
+import io
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+# 缩略图的默认设置，可通过导出设置覆盖
+THUMBNAIL_DEFAULTS = {
+    "thumbnails": True,  # 是否生成缩略图
+    "thumbnailFormat": "webp",  # webp 或 jpeg
+    "thumbnailQuality": 80,  # 编码质量 1-100
+    "thumbnailScale": 2,  # 缩略图像素为显示大小的倍数，高分屏上保持清晰
+    "thumbnailWorkers": None,  # 进程数，None 表示按CPU核数
+    "embedOriginals": True,  # 是否下载原图保存到导出结果中，否则灯箱使用原图的在线链接
+}
+
+THUMBNAIL_FORMATS = {
+    "webp": ("WEBP", "image/webp", ".webp"),
+    "jpeg": ("JPEG", "image/jpeg", ".jpg"),
+}
+
+
+def get_thumbnail_setting(settings, key):
+    """读取缩略图设置，未设置时使用默认值"""
+    value = settings.get(key)
+    return THUMBNAIL_DEFAULTS[key] if value is None else value
+
+
+def thumbnail_pixels(settings):
+    """缩略图的像素边长，为显示大小乘以设备像素比"""
+    image_size = int(settings.get("imageSize", 100))
+    return max(1, int(image_size * get_thumbnail_setting(settings, "thumbnailScale")))
+
+
+def render_thumbnail(source, pixels, image_format, quality):
+    """把图片裁剪缩放为 pixels x pixels 的缩略图并编码，在子进程中执行
+
+    source 为图片文件路径或图片数据，返回编码后的数据
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+
+    with Image.open(source) as image:
+        # 动图只取第一帧，按拍摄方向旋转
+        image.seek(0)
+        image = ImageOps.exif_transpose(image)
+
+        # 与页面上的 object-fit: cover 一致，居中裁剪为正方形
+        pixels = min(pixels, image.width, image.height)
+        image = ImageOps.fit(image, (pixels, pixels), Image.LANCZOS)
+
+        if image_format == "JPEG" and image.mode != "RGB":
+            image = image.convert("RGB")
+        elif image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+
+        options = {"quality": quality}
+        if image_format == "WEBP":
+            options["method"] = 4
+        else:
+            options["optimize"] = True
+
+        output = io.BytesIO()
+        image.save(output, image_format, **options)
+        return output.getvalue()
+
+
+class ThumbnailRenderer:
+    """在进程池中生成缩略图，进程池在第一次使用时创建"""
+
+    def __init__(self, settings):
+        self.pixels = thumbnail_pixels(settings)
+        self.quality = int(get_thumbnail_setting(settings, "thumbnailQuality"))
+
+        format_name = str(get_thumbnail_setting(settings, "thumbnailFormat")).lower()
+        if format_name not in THUMBNAIL_FORMATS:
+            raise ValueError(f"不支持的缩略图格式: {format_name}")
+        self.image_format, self.content_type, self.extension = THUMBNAIL_FORMATS[format_name]
+
+        self.workers = get_thumbnail_setting(settings, "thumbnailWorkers") or os.cpu_count() or 1
+        self._executor = None
+        self.rendered = 0
+        self.failed = 0
+
+    @property
+    def variant(self):
+        """区分不同缩略图参数的后缀，参数变化后不会复用旧的缩略图"""
+        return f"{self.pixels}q{self.quality}{self.extension}"
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    async def render(self, source, original_size=None):
+        """生成缩略图，失败或缩略图不比原图小时返回None
+
+        source 为图片文件路径或图片数据
+        """
+        if isinstance(source, os.PathLike):
+            source = os.fspath(source)
+
+        loop = asyncio.get_running_loop()
+        try:
+            data = await loop.run_in_executor(
+                self._get_executor(),
+                render_thumbnail,
+                source,
+                self.pixels,
+                self.image_format,
+                self.quality,
+            )
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"生成缩略图失败: {e}")
+            return None
+
+        if original_size is not None and len(data) >= original_size:
+            return None
+
+        self.rendered += 1
+        return data
+
+    def summary(self):
+        return f"生成 {self.rendered} 张, 失败 {self.failed} 张"
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -1,26 +1,46 @@
 import tkinter as tk
-import sys
+import logging
 from tkinter import ttk, messagebox, filedialog
 import threading
 import asyncio
-import queue
-from .data_processor import process_html_text
-from .exporter import export_to_html, copy_to_clipboard
+from .exporter import (
+    HTML_TEMPLATE_CLASSIC,
+    HTML_TEMPLATE_VIEWER,
+    IMAGE_MODE_ASSETS,
+    IMAGE_MODE_BASE64,
+    IMAGE_MODE_LINK,
+    copy_to_clipboard,
+    export_to_html,
+)
+from .sharded_export import export_sharded_html
 from .browser_manager import BrowserManager
-import traceback
+from .browser_pool import BrowserPool
+from .event_api import build_user_url
+from .article_store import ArticleStore
+from .ui_updates import UpdateBatcher
+from .article_list import VirtualArticleList
+from .log import LOGGER_NAME, StatusHandler, get_ring_buffer
 import webbrowser
 from PIL import Image, ImageTk
-import io
 import os
 
+logger = logging.getLogger(__name__)
+
+# 爬虫线程通知界面线程处理更新的虚拟事件
+UPDATE_EVENT = "<<CrawlerUpdates>>"
+# 兜底检查更新的间隔（毫秒），正常情况下由虚拟事件唤醒
+UPDATE_FALLBACK_MS = 1000
+
 
 class NetEaseMusicUI:
-    def __init__(self, master, crawler):
+    def __init__(self, master, crawler, browser_pool=None):
         self.master = master
         self.crawler = crawler
+        # 浏览器在后台提前启动，多次爬取复用
+        self.browser_pool = browser_pool or BrowserPool(crawler)
         self.articles = []
         self.crawling = False
-        self.update_queue = queue.Queue()
+        self.updates = UpdateBatcher(self.wake_updates)
         self.total_articles = None
         self.browser_manager = BrowserManager()
         
@@ -28,12 +48,17 @@ class NetEaseMusicUI:
         self.crawler_thread = None
 
         # 设置
-        self.settings = {"imageSize": 100, "useBase64Images": True}
+        self.settings = {
+            "imageSize": 100,
+            "imageMode": IMAGE_MODE_BASE64,
+            "thumbnails": True,
+            "embedOriginals": True,
+            "pageSize": 500,
+            "htmlTemplate": HTML_TEMPLATE_CLASSIC,
+            "incremental": False,
+        }
         self.PROJECT_URL = "https://github.com/sansn0/netease-note-backup"
 
-        # 用于存储控制台输出
-        self.console_output = []
-
         # 创建UI组件
         self.create_widgets()
 
@@ -44,7 +69,7 @@ class NetEaseMusicUI:
             if os.path.exists(icon_path):
                 self.master.iconbitmap(icon_path)
         except Exception as e:
-            print(f"无法加载图标: {str(e)}")
+            logger.warning(f"无法加载图标: {str(e)}")
 
         # 设置窗口关闭事件处理
         self.master.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -52,8 +77,9 @@ class NetEaseMusicUI:
         # 检查浏览器状态
         self.check_browser_status()
 
-        # 设置定时器以处理队列中的更新
-        self.process_updates()
+        # 爬虫线程产生更新时通过虚拟事件唤醒界面线程
+        self.master.bind(UPDATE_EVENT, self.process_updates)
+        self.master.after(UPDATE_FALLBACK_MS, self.poll_updates)
         
     
     def on_closing(self):
@@ -77,13 +103,9 @@ class NetEaseMusicUI:
         
         # 清理爬虫资源
         try:
-            # 创建新的事件循环来关闭爬虫
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self.crawler.close())
-            loop.close()
+            self.browser_pool.close(timeout=5)
         except Exception as e:
-            print(f"关闭爬虫时出错: {e}")
+            logger.warning(f"关闭爬虫时出错: {e}")
         
         # 销毁窗口
         self.master.destroy()
@@ -193,6 +215,11 @@ class NetEaseMusicUI:
         )
         self.export_button.pack(side=tk.LEFT, padx=5)
 
+        self.pages_button = ttk.Button(
+            button_frame, text="分页导出", command=self.export_pages
+        )
+        self.pages_button.pack(side=tk.LEFT, padx=5)
+
         # 设置区域
         settings_frame = ttk.LabelFrame(main_frame, text="设置")
         settings_frame.pack(fill=tk.X, pady=10)
@@ -207,24 +234,74 @@ class NetEaseMusicUI:
         self.size_spinbox.insert(0, self.settings["imageSize"])
         self.size_spinbox.pack(side=tk.LEFT, padx=5)
 
-        # Base64选项
-        self.base64_var = tk.BooleanVar(value=self.settings["useBase64Images"])
-        base64_check = ttk.Checkbutton(
-            settings_frame, text="将图片转为base64格式(推荐)", variable=self.base64_var
+        ttk.Label(size_frame, text="分页导出每页篇数:").pack(side=tk.LEFT, padx=(15, 0))
+        self.page_size_spinbox = ttk.Spinbox(
+            size_frame, from_=50, to=5000, increment=50, width=6
+        )
+        self.page_size_spinbox.delete(0, tk.END)
+        self.page_size_spinbox.insert(0, self.settings["pageSize"])
+        self.page_size_spinbox.pack(side=tk.LEFT, padx=5)
+
+        # 图片导出方式
+        mode_frame = ttk.Frame(settings_frame)
+        mode_frame.pack(fill=tk.X, pady=5)
+
+        ttk.Label(mode_frame, text="图片保存方式:").pack(side=tk.LEFT)
+        self.image_mode_var = tk.StringVar(value=self.settings["imageMode"])
+        for text, mode in (
+            ("内嵌base64(单文件)", IMAGE_MODE_BASE64),
+            ("assets目录(打开更快)", IMAGE_MODE_ASSETS),
+            ("原始链接(需联网)", IMAGE_MODE_LINK),
+        ):
+            ttk.Radiobutton(
+                mode_frame, text=text, value=mode, variable=self.image_mode_var
+            ).pack(side=tk.LEFT, padx=5)
+
+        # 缩略图选项
+        self.thumbnails_var = tk.BooleanVar(value=self.settings["thumbnails"])
+        thumbnails_check = ttk.Checkbutton(
+            settings_frame,
+            text="生成缩略图(列表显示缩略图，点击查看原图)",
+            variable=self.thumbnails_var,
+        )
+        thumbnails_check.pack(anchor=tk.W, pady=5)
+
+        # 原图选项
+        self.originals_var = tk.BooleanVar(value=self.settings["embedOriginals"])
+        originals_check = ttk.Checkbutton(
+            settings_frame,
+            text="保存原图(可离线查看原图；不勾选时只下载缩略图，点击图片在线查看原图)",
+            variable=self.originals_var,
+        )
+        originals_check.pack(anchor=tk.W, pady=5)
+
+        # 查看器模板选项
+        self.viewer_var = tk.BooleanVar(
+            value=self.settings["htmlTemplate"] == HTML_TEMPLATE_VIEWER
         )
-        base64_check.pack(anchor=tk.W, pady=5)
+        viewer_check = ttk.Checkbutton(
+            settings_frame,
+            text="导出HTML使用单文件查看器(只渲染可见的动态，适合大量动态)",
+            variable=self.viewer_var,
+        )
+        viewer_check.pack(anchor=tk.W, pady=5)
+
+        # 增量爬取选项
+        self.incremental_var = tk.BooleanVar(value=self.settings["incremental"])
+        incremental_check = ttk.Checkbutton(
+            settings_frame,
+            text="增量爬取(遇到本地已备份的动态后停止)",
+            variable=self.incremental_var,
+        )
+        incremental_check.pack(anchor=tk.W, pady=5)
 
         # 文章列表框
         list_frame = ttk.LabelFrame(main_frame, text="文章列表")
         list_frame.pack(fill=tk.BOTH, expand=True, pady=10)
 
-        # 创建带滚动条的列表框
-        scrollbar = ttk.Scrollbar(list_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-
-        self.article_listbox = tk.Listbox(list_frame, yscrollcommand=scrollbar.set)
-        self.article_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.config(command=self.article_listbox.yview)
+        # 虚拟滚动的列表，只显示可见的行，支持筛选和按月跳转
+        self.article_list = VirtualArticleList(list_frame)
+        self.article_list.pack(fill=tk.BOTH, expand=True)
 
         # 状态栏
         self.status_var = tk.StringVar(value="等待加载...")
@@ -235,14 +312,15 @@ class NetEaseMusicUI:
 
     def check_browser_status(self):
         """检查浏览器状态 - 修改版本"""
-        print("[UI] 检查浏览器状态...")
+        logger.info("[UI] 检查浏览器状态...")
 
         # 强制重新创建 browser_manager 实例以刷新状态
         self.browser_manager = BrowserManager()
 
-        if self.browser_manager.is_browser_installed():
-            browser_path = self.browser_manager.get_executable_path()
-            print(f"[UI] 找到浏览器: {browser_path}")
+        headless_shell = self.crawler.use_headless_shell
+        if self.browser_manager.is_browser_installed(headless_shell):
+            browser_path = self.browser_manager.get_executable_path(headless_shell)
+            logger.info(f"[UI] 找到浏览器: {browser_path}")
 
             # 判断浏览器来源
             if (
@@ -257,8 +335,12 @@ class NetEaseMusicUI:
             self.browser_status_label.config(text=status_text, foreground="green")
             self.download_browser_button.config(state=tk.DISABLED)
             self.load_button.config(state=tk.NORMAL)
+
+            # 在后台启动浏览器，点击加载时无需再等待浏览器启动
+            self.crawler.browser_manager = self.browser_manager
+            self.browser_pool.prelaunch()
         else:
-            print("[UI] 未找到浏览器")
+            logger.info("[UI] 未找到浏览器")
             self.browser_status_label.config(text="✗ 未找到浏览器", foreground="red")
 
             # 根据环境显示不同的按钮文本
@@ -272,7 +354,7 @@ class NetEaseMusicUI:
 
         # 强制更新界面
         self.master.update_idletasks()
-        print("[UI] 浏览器状态检查完成")
+        logger.info("[UI] 浏览器状态检查完成")
 
     def download_browser(self):
         """下载或安装浏览器"""
@@ -344,19 +426,21 @@ class NetEaseMusicUI:
                 )
 
             try:
-                print("[UI] 开始下载浏览器...")
-                await self.browser_manager.ensure_browser(progress_callback)
-                print("[UI] 浏览器下载和安装完成")
+                logger.info("[UI] 开始下载浏览器...")
+                await self.browser_manager.ensure_browser(
+                    progress_callback, headless_shell=self.crawler.use_headless_shell
+                )
+                logger.info("[UI] 浏览器下载和安装完成")
                 # 确保在主线程中执行UI更新
                 self.master.after(0, self.download_complete)
             except Exception as e:
-                print(f"[UI] 下载失败: {e}")
+                logger.warning(f"[UI] 下载失败: {e}")
                 self.master.after(0, lambda: self.download_failed(str(e)))
 
         try:
             loop.run_until_complete(download_with_progress())
         except Exception as e:
-            print(f"[UI] 下载线程异常: {e}")
+            logger.exception(f"[UI] 下载线程异常: {e}")
             self.master.after(0, lambda: self.download_failed(str(e)))
         finally:
             loop.close()
@@ -375,7 +459,7 @@ class NetEaseMusicUI:
 
     def download_complete(self):
         """下载完成 - 添加更多调试信息"""
-        print("[UI] 进入download_complete方法")
+        logger.debug("[UI] 进入download_complete方法")
 
         # 隐藏进度条
         self.download_progress.pack_forget()
@@ -388,24 +472,25 @@ class NetEaseMusicUI:
         self.browser_manager = BrowserManager()
 
         # 检查浏览器是否真的安装成功
-        if self.browser_manager.is_browser_installed():
-            browser_path = self.browser_manager.get_executable_path()
-            print(f"[UI] 浏览器安装成功，路径: {browser_path}")
+        headless_shell = self.crawler.use_headless_shell
+        if self.browser_manager.is_browser_installed(headless_shell):
+            browser_path = self.browser_manager.get_executable_path(headless_shell)
+            logger.info(f"[UI] 浏览器安装成功，路径: {browser_path}")
 
             # 显示成功消息
             messagebox.showinfo("成功", f"浏览器下载并安装完成！\n路径: {browser_path}")
         else:
-            print("[UI] 浏览器安装失败")
+            logger.info("[UI] 浏览器安装失败")
             messagebox.showwarning("警告", "浏览器下载完成但安装可能失败，请重试")
 
         # 强制刷新浏览器状态
-        print("[UI] 刷新浏览器状态...")
+        logger.info("[UI] 刷新浏览器状态...")
         self.check_browser_status()
 
         # 强制更新界面
         self.master.update()
 
-        print("[UI] download_complete完成")
+        logger.debug("[UI] download_complete完成")
 
     def download_failed(self, error):
         """下载失败"""
@@ -429,53 +514,52 @@ class NetEaseMusicUI:
                     # 设置一个标志让线程知道需要立即退出
                     self.force_stop = True
 
-    def process_updates(self):
-        """处理来自爬虫的更新"""
+    def wake_updates(self):
+        """通知界面线程有新的更新，可在任意线程调用"""
         try:
-            while not self.update_queue.empty():
-                update = self.update_queue.get_nowait()
-                update_type = update.get("type")
-
-                if update_type == "articles":
-                    self.articles = update.get("data", [])
-                    self.update_article_display()
-                elif update_type == "status":
-                    message = update.get("message", "")
-                    current_count = len(self.articles)
-
-                    if "已获取" not in message and current_count > 0:
-                        if not message.startswith(("处理文章", "图片", "正在处理")):
-                            message = f"已获取 {current_count} 篇文章 - {message}"
-
-                    if self.total_articles and "总计" not in message:
-                        message += f" (总计: {self.total_articles})"
-
-                    self.status_var.set(message)
-                elif update_type == "new_article":
-                    new_article = update.get("article")
-                    if new_article:
-                        self.articles.append(new_article)
-                        self.count_label.config(
-                            text=f"已检测到 {len(self.articles)} 篇文章"
-                        )
-                        self.article_listbox.insert(
-                            tk.END,
-                            f"{new_article['time']} - {self.get_short_text(new_article['text'])}",
-                        )
-                        self.update_range_inputs()
-                elif update_type == "total_count":
-                    self.total_articles = update.get("count")
-        except queue.Empty:
+            self.master.event_generate(UPDATE_EVENT, when="tail")
+        except (tk.TclError, RuntimeError):
+            # 窗口已关闭或主循环未运行，由兜底定时器处理
             pass
-        finally:
-            self.master.after(200, self.process_updates)
 
-    def get_short_text(self, html_text, max_length=50):
-        """获取文本的简短版本用于显示"""
-        text = process_html_text(html_text)
-        if len(text) > max_length:
-            return text[:max_length] + "..."
-        return text
+    def poll_updates(self):
+        """兜底定时器，防止唤醒事件丢失时更新积压"""
+        self.process_updates()
+        self.master.after(UPDATE_FALLBACK_MS, self.poll_updates)
+
+    def process_updates(self, event=None):
+        """一次性应用爬虫线程积累的更新"""
+        batch = self.updates.drain()
+        if batch is None:
+            return
+
+        if batch.total_count is not None:
+            self.total_articles = batch.total_count
+
+        if batch.articles is not None:
+            self.articles = batch.articles
+            self.update_article_display()
+
+        if batch.new_articles:
+            self.articles.extend(batch.new_articles)
+            self.article_list.append_articles(batch.new_articles)
+            self.count_label.config(text=f"已检测到 {len(self.articles)} 篇文章")
+            self.update_range_inputs()
+
+        message = batch.status
+        current_count = len(self.articles)
+        if message is None:
+            if not batch.new_articles:
+                return
+            message = f"已获取 {current_count} 篇文章"
+        elif "已获取" not in message and current_count > 0:
+            if not message.startswith(("处理文章", "图片", "正在处理")):
+                message = f"已获取 {current_count} 篇文章 - {message}"
+
+        if self.total_articles and "总计" not in message:
+            message += f" (总计: {self.total_articles})"
+
+        self.status_var.set(message)
 
     def update_article_display(self):
         """更新文章显示"""
@@ -483,11 +567,7 @@ class NetEaseMusicUI:
         self.count_label.config(text=f"已检测到 {count} 篇文章")
         self.update_range_inputs()
 
-        self.article_listbox.delete(0, tk.END)
-        for article in self.articles:
-            self.article_listbox.insert(
-                tk.END, f"{article['time']} - {self.get_short_text(article['text'])}"
-            )
+        self.article_list.set_articles(self.articles)
 
     def update_range_inputs(self):
         """更新范围输入框"""
@@ -501,16 +581,8 @@ class NetEaseMusicUI:
             self.end_range.insert(0, str(count))
 
     def add_update(self, update_type, **kwargs):
-        """添加更新到队列"""
-        update = {"type": update_type, **kwargs}
-        self.update_queue.put(update)
-
-        if update_type == "new_article":
-            current_count = len(self.articles) + 1
-            message = f"已获取 {current_count} 篇文章"
-            if self.total_articles:
-                message += f" (总计: {self.total_articles})"
-            self.status_var.set(message)
+        """添加更新，可在任意线程调用，界面线程被唤醒后批量处理"""
+        self.updates.add(update_type, **kwargs)
 
     def start_crawling(self):
         if self.crawling:
@@ -518,7 +590,7 @@ class NetEaseMusicUI:
             return
 
         # 再次检查浏览器
-        if not self.browser_manager.is_browser_installed():
+        if not self.browser_manager.is_browser_installed(self.crawler.use_headless_shell):
             response = messagebox.askquestion(
                 "未找到浏览器", "未检测到浏览器，是否立即下载？", icon="warning"
             )
@@ -532,11 +604,11 @@ class NetEaseMusicUI:
             return
 
         # 构建完整URL
-        url = f"https://music.163.com/#/user/event?id={user_id}"
+        url = build_user_url(user_id)
 
         # 清空之前的结果
         self.articles = []
-        self.article_listbox.delete(0, tk.END)
+        self.article_list.clear()
         self.count_label.config(text="已检测到 0 篇文章")
 
         self.status_var.set("开始加载页面...")
@@ -547,112 +619,64 @@ class NetEaseMusicUI:
         # 重置爬虫的终止标志
         self.crawler.stop_crawling = False
 
+        # 爬取结果写入本地文章库，供之后增量爬取
+        self.settings["incremental"] = self.incremental_var.get()
+        if self.crawler.store is None:
+            try:
+                self.crawler.store = ArticleStore()
+            except Exception as e:
+                logger.warning(f"[UI] 无法打开本地文章库: {e}")
+        self.crawler.incremental = (
+            self.settings["incremental"] and self.crawler.store is not None
+        )
+
         # 启动爬虫线程
         self.crawler_thread = threading.Thread(target=self.run_crawler, args=(url,), daemon=True)
         self.crawler_thread.start()
 
     def run_crawler(self, url):
-        """运行爬虫的独立线程"""
-        # 创建新的事件循环
-        try:
-            # 如果存在旧的事件循环，先关闭它
-            old_loop = asyncio.get_event_loop()
-            if old_loop.is_running():
-                old_loop.close()
-        except:
-            pass
-
-        # 创建新的事件循环
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-        # 创建字符串IO对象来捕获输出
-        string_io = io.StringIO()
+        """运行爬虫的独立线程，爬取在浏览器池的事件循环中进行"""
+        # 爬取期间的日志限速转发到状态栏，错误详情取自最近日志的环形缓冲区
+        ring_buffer = get_ring_buffer()
+        ring_buffer.clear()
+        status_handler = StatusHandler(
+            lambda message: self.add_update("status", message=message)
+        )
+        package_logger = logging.getLogger(LOGGER_NAME)
+        package_logger.addHandler(status_handler)
 
-        class OutputRedirector:
-            def __init__(self, ui, string_io):
-                self.ui = ui
-                self.string_io = string_io
-                self.has_console = hasattr(sys, 'stdout') and sys.stdout is not None
-                self.old_stdout = sys.stdout if self.has_console else None
-                self.old_stderr = sys.stderr if self.has_console else None
-            
-            def write(self, message):
-                if self.string_io:
-                    self.string_io.write(message)
-                if self.has_console and self.old_stdout:
-                    try:
-                        self.old_stdout.write(message)
-                    except:
-                        pass
-                if message.strip():
-                    self.ui.add_update('status', message=message.strip())
-                    self.ui.console_output.append(message.strip())
-            
-            def flush(self):
-                if self.has_console and self.old_stdout:
-                    try:
-                        self.old_stdout.flush()
-                    except:
-                        pass
-            
-            def __enter__(self):
-                if self.has_console:
-                    sys.stdout = self
-                    sys.stderr = self
-                return self
-            
-            def __exit__(self, exc_type, exc_val, exc_tb):
-                if self.has_console:
-                    sys.stdout = self.old_stdout
-                    sys.stderr = self.old_stderr
+        try:
+            logger.info("[UI] 开始运行爬虫...")
+            logger.info(f"[UI] URL: {url}")
 
-        with OutputRedirector(self, string_io):
-            try:
-                # 添加调试信息
-                print("[UI] 开始运行爬虫...")
-                print(f"[UI] URL: {url}")
+            # 运行爬虫
+            self.browser_pool.crawl(url, self)
+            logger.info("[UI] 爬虫运行完成")
 
-                # 运行爬虫
-                loop.run_until_complete(self.crawler.crawl(url, self))
-                print("[UI] 爬虫运行完成")
+        except Exception as e:
+            error_msg = f"爬取失败: {str(e)}"
+            logger.exception(f"[UI] {error_msg}")
 
-            except Exception as e:
-                error_msg = f"爬取失败: {str(e)}"
-                print(f"[UI] {error_msg}")
-                if not getattr(sys, 'frozen', False):
-                    traceback.print_exc()
+            # 获取详细的错误信息
+            error_details = ring_buffer.dump()
 
-                # 获取详细的错误信息
-                error_details = string_io.getvalue()
+            # 更新状态
+            self.add_update("status", message=error_msg)
 
-                # 更新状态
-                self.add_update("status", message=error_msg)
+            # 在主线程中显示错误对话框
+            self.master.after(
+                0, lambda: self.show_error_dialog(error_msg, error_details)
+            )
 
-                # 在主线程中显示错误对话框
-                self.master.after(
-                    0, lambda: self.show_error_dialog(error_msg, error_details)
-                )
+        finally:
+            package_logger.removeHandler(status_handler)
+            status_handler.flush()
 
-            finally:
-                try:
-                    # 安全关闭事件循环
-                    pending = asyncio.all_tasks(loop)
-                    for task in pending:
-                        task.cancel()
-
-                    loop.run_until_complete(
-                        asyncio.gather(*pending, return_exceptions=True)
-                    )
-                    loop.close()
-                except:
-                    pass
-
-                self.crawling = False
-                self.master.after(
-                    0, lambda: self.load_button.config(text="加载", state=tk.NORMAL)
-                )
-                self.master.after(0, lambda: self.stop_button.config(state=tk.DISABLED))
+            self.crawling = False
+            self.master.after(
+                0, lambda: self.load_button.config(text="加载", state=tk.NORMAL)
+            )
+            self.master.after(0, lambda: self.stop_button.config(state=tk.DISABLED))
 
     def show_error_dialog(self, error_msg, error_details):
         """显示详细的错误对话框"""
@@ -704,7 +728,7 @@ class NetEaseMusicUI:
             if not self.crawling:
                 self.status_var.set(f"已设置范围: 1 到 {count}")
             else:
-                print(f"已设置范围: 1 到 {count}")
+                logger.info(f"已设置范围: 1 到 {count}")
 
     def get_selected_articles(self):
         try:
@@ -751,14 +775,24 @@ class NetEaseMusicUI:
             )
             self.master.after(0, lambda: self.status_var.set("复制失败"))
 
+    def read_export_settings(self):
+        """从设置区域读取导出设置"""
+        self.settings["imageSize"] = int(self.size_spinbox.get())
+        self.settings["imageMode"] = self.image_mode_var.get()
+        self.settings["thumbnails"] = self.thumbnails_var.get()
+        self.settings["embedOriginals"] = self.originals_var.get()
+        self.settings["pageSize"] = int(self.page_size_spinbox.get())
+        self.settings["htmlTemplate"] = (
+            HTML_TEMPLATE_VIEWER if self.viewer_var.get() else HTML_TEMPLATE_CLASSIC
+        )
+
     def export_html(self):
         selected_articles = self.get_selected_articles()
 
         if not selected_articles:
             return
 
-        self.settings["imageSize"] = int(self.size_spinbox.get())
-        self.settings["useBase64Images"] = self.base64_var.get()
+        self.read_export_settings()
 
         self.status_var.set("正在处理导出...")
         self.export_button.config(text="处理中...")
@@ -782,7 +816,7 @@ class NetEaseMusicUI:
                 self.master.after(0, lambda: self.export_button.config(text="导出HTML"))
                 return
 
-            if settings["useBase64Images"]:
+            if settings["imageMode"] != IMAGE_MODE_LINK:
                 self.master.after(0, lambda: self.status_var.set("正在准备处理图片..."))
 
             loop = asyncio.new_event_loop()
@@ -803,6 +837,53 @@ class NetEaseMusicUI:
         finally:
             self.master.after(0, lambda: self.export_button.config(text="导出HTML"))
 
+    def export_pages(self):
+        selected_articles = self.get_selected_articles()
+
+        if not selected_articles:
+            return
+
+        try:
+            self.read_export_settings()
+        except ValueError:
+            messagebox.showerror("错误", "请输入有效的每页篇数")
+            return
+
+        self.status_var.set("正在处理分页导出...")
+        self.pages_button.config(text="处理中...")
+
+        threading.Thread(
+            target=self.process_pages_export,
+            args=(selected_articles, dict(self.settings)),
+            daemon=True,
+        ).start()
+
+    def process_pages_export(self, articles, settings):
+        try:
+            dir_path = filedialog.askdirectory(title="选择分页导出的目录")
+
+            if not dir_path:
+                self.master.after(0, lambda: self.status_var.set("导出已取消"))
+                return
+
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+
+            try:
+                loop.run_until_complete(
+                    export_sharded_html(articles, dir_path, settings, self)
+                )
+            finally:
+                loop.close()
+
+        except Exception as e:
+            self.master.after(
+                0, lambda: messagebox.showerror("错误", f"导出失败: {str(e)}")
+            )
+            self.master.after(0, lambda: self.status_var.set(f"导出失败: {str(e)}"))
+        finally:
+            self.master.after(0, lambda: self.pages_button.config(text="分页导出"))
+
     def open_changelog(self):
         """打开更新日志页面"""
         webbrowser.open(self.PROJECT_URL)
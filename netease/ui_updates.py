@@ -0,0 +1,70 @@
+"""
+界面更新的批处理，爬虫线程产生的更新先在这里合并，界面线程每次唤醒时一次性取走
+"""
+import threading
+
+
+class UpdateBatch:
+    """一次取走的更新：新文章按顺序合并，状态消息只保留最新一条"""
+
+    __slots__ = ("articles", "new_articles", "status", "total_count")
+
+    def __init__(self):
+        # 整体替换的文章列表，None 表示没有替换
+        self.articles = None
+        self.new_articles = []
+        self.status = None
+        self.total_count = None
+
+    def is_empty(self):
+        return (
+            self.articles is None
+            and not self.new_articles
+            and self.status is None
+            and self.total_count is None
+        )
+
+
+class UpdateBatcher:
+    """线程安全的更新缓冲区
+
+    add 可在任意线程调用，只在缓冲区由空变为非空时调用一次 wakeup，
+    界面线程被唤醒后通过 drain 取走期间积累的全部更新
+    """
+
+    def __init__(self, wakeup):
+        self._wakeup = wakeup
+        self._lock = threading.Lock()
+        self._batch = UpdateBatch()
+
+    def add(self, update_type, **kwargs):
+        with self._lock:
+            was_empty = self._batch.is_empty()
+            batch = self._batch
+
+            if update_type == "new_article":
+                article = kwargs.get("article")
+                if article is None:
+                    return
+                batch.new_articles.append(article)
+            elif update_type == "articles":
+                batch.articles = list(kwargs.get("data") or [])
+                batch.new_articles = []
+            elif update_type == "status":
+                batch.status = kwargs.get("message", "")
+            elif update_type == "total_count":
+                batch.total_count = kwargs.get("count")
+            else:
+                return
+
+        if was_empty:
+            self._wakeup()
+
+    def drain(self):
+        """取走积累的更新，没有更新时返回None"""
+        with self._lock:
+            if self._batch.is_empty():
+                return None
+            batch = self._batch
+            self._batch = UpdateBatch()
+        return batch
@@ -0,0 +1,264 @@
+"""
+单文件查看器模板，文章和图片以JSON和base64数据块保存在HTML中，浏览器只渲染可见附近的文章
+"""
+import base64
+import json
+
+from .data_processor import article_month
+from .exporter import (
+    BASE64_CHUNK_SIZE,
+    DEFAULT_TITLE,
+    IMAGE_MODE_ASSETS,
+    IMAGE_MODE_BASE64,
+    ImageExportSession,
+    ImagePayload,
+    clean_image_url,
+    count_images,
+    get_image_mode,
+    grid_image_url,
+    iter_article_batches,
+    write_html_footer,
+    write_html_styles,
+    write_lightbox,
+)
+from .models import json_default
+
+# 查看器的样式，文章按块渲染，不可见的块只保留高度
+VIEWER_STYLES = """
+.toolbar { position: sticky; top: 0; background: #fff; padding: 10px 0; border-bottom: 1px solid #eee; z-index: 10; }
+.toolbar select { margin-left: 10px; }
+.chunk { contain: layout paint; }
+"""
+
+# 查看器脚本：解析数据后为每块文章建立占位元素，进入可见范围附近时渲染，远离后回收
+VIEWER_SCRIPT = """
+(function () {
+  var CHUNK_SIZE = 40;
+  var ESTIMATED_HEIGHT = 160;
+  var articles = [];
+  document.querySelectorAll("script.nb-batch").forEach(function (el) {
+    articles = articles.concat(JSON.parse(el.textContent));
+    el.remove();
+  });
+  var months = JSON.parse(document.getElementById("nb-months").textContent);
+  var container = document.getElementById("nb-articles");
+  document.getElementById("nb-count").textContent = "共 " + articles.length + " 篇动态";
+
+  function escapeAttr(value) {
+    return String(value).replace(/&/g, "&amp;").replace(/"/g, "&quot;").replace(/</g, "&lt;");
+  }
+
+  // 数字为数据块编号，字符串为链接或相对路径；数据块在显示时才拼成 data URI
+  function imageSrc(ref) {
+    if (typeof ref === "string") return ref;
+    var block = document.getElementById("b" + ref);
+    return block ? "data:" + block.dataset.type + ";base64," + block.textContent : "";
+  }
+
+  function renderArticle(article, index) {
+    var parts = ['<div class="article" id="a' + index + '">'];
+    parts.push('<div class="time">' + article[0] + "</div>");
+    parts.push('<div class="text">' + article[1] + "</div>");
+    var song = article[2];
+    if (song) {
+      parts.push('<div class="song"><div><a href="' + escapeAttr(song.url) + '" target="_blank">' +
+        song.title + '</a></div><div>歌手: <a href="' + escapeAttr(song.artistUrl) +
+        '" target="_blank">' + song.artist + "</a></div></div>");
+    }
+    var images = article[3];
+    if (images.length) {
+      parts.push('<div class="images">');
+      images.forEach(function (ref, j) {
+        parts.push('<img src="' + escapeAttr(imageSrc(ref[0])) + '" data-i="' + index +
+          '" data-j="' + j + '" alt="图片" loading="lazy" />');
+      });
+      parts.push("</div>");
+    }
+    parts.push("</div>");
+    return parts.join("");
+  }
+
+  function renderChunk(chunk) {
+    if (chunk.dataset.rendered) return;
+    var start = Number(chunk.dataset.start);
+    var end = Math.min(start + CHUNK_SIZE, articles.length);
+    var html = [];
+    for (var i = start; i < end; i++) html.push(renderArticle(articles[i], i));
+    chunk.innerHTML = html.join("");
+    chunk.style.height = "";
+    chunk.dataset.rendered = "1";
+  }
+
+  function recycleChunk(chunk) {
+    if (!chunk.dataset.rendered) return;
+    // 保留实际高度，滚动位置不会跳动
+    chunk.style.height = chunk.offsetHeight + "px";
+    chunk.innerHTML = "";
+    delete chunk.dataset.rendered;
+  }
+
+  var observer = new IntersectionObserver(function (entries) {
+    entries.forEach(function (entry) {
+      if (entry.isIntersecting) renderChunk(entry.target);
+      else recycleChunk(entry.target);
+    });
+  }, { rootMargin: "1500px 0px" });
+
+  var chunks = [];
+  for (var start = 0; start < articles.length; start += CHUNK_SIZE) {
+    var chunk = document.createElement("div");
+    chunk.className = "chunk";
+    chunk.dataset.start = start;
+    chunk.style.height = Math.min(CHUNK_SIZE, articles.length - start) * ESTIMATED_HEIGHT + "px";
+    container.appendChild(chunk);
+    chunks.push(chunk);
+    observer.observe(chunk);
+  }
+
+  var select = document.getElementById("nb-months-select");
+  Object.keys(months).forEach(function (month) {
+    var option = document.createElement("option");
+    option.value = months[month];
+    option.textContent = month;
+    select.appendChild(option);
+  });
+  select.addEventListener("change", function () {
+    if (select.value === "") return;
+    var index = Number(select.value);
+    var chunk = chunks[Math.floor(index / CHUNK_SIZE)];
+    renderChunk(chunk);
+    document.getElementById("a" + index).scrollIntoView();
+  });
+
+  container.addEventListener("click", function (event) {
+    var img = event.target;
+    if (img.tagName !== "IMG" || img.dataset.i === undefined) return;
+    var ref = articles[Number(img.dataset.i)][3][Number(img.dataset.j)];
+    openLightbox(imageSrc(ref[1] === null ? ref[0] : ref[1]));
+  });
+
+  window.openLightbox = function (src) {
+    document.getElementById("lightbox-img").src = src;
+    document.getElementById("lightbox").style.display = "flex";
+  };
+  window.closeLightbox = function () {
+    document.getElementById("lightbox").style.display = "none";
+    // 释放原图占用的内存
+    document.getElementById("lightbox-img").src = "";
+  };
+})();
+"""
+
+
+class PayloadBlocks:
+    """写入图片数据块，同一图片只写一次，返回数据块编号"""
+
+    def __init__(self, out):
+        self.out = out
+        self.ids = {}
+
+    def add(self, key, payload):
+        if key in self.ids:
+            return self.ids[key]
+
+        block_id = len(self.ids)
+        self.ids[key] = block_id
+        self.out.write(
+            f'<script type="application/octet-stream" id="b{block_id}" '
+            f'data-type="{payload.content_type}">'
+        )
+        for chunk in payload.iter_chunks(BASE64_CHUNK_SIZE):
+            self.out.write(base64.b64encode(chunk).decode('ascii'))
+        self.out.write('</script>\n')
+        return block_id
+
+
+def write_json_script(out, value, element_id=None, class_name=None):
+    """把数据写入不执行的 JSON 脚本块，转义 < 避免提前结束脚本"""
+    attributes = 'type="application/json"'
+    if element_id:
+        attributes += f' id="{element_id}"'
+    if class_name:
+        attributes += f' class="{class_name}"'
+    data = json.dumps(
+        value, ensure_ascii=False, separators=(',', ':'), default=json_default
+    ).replace('<', '\\u003c')
+    out.write(f'<script {attributes}>{data}</script>\n')
+
+
+def image_refs(clean_url, images, thumbnails, settings, blocks):
+    """一张图片在查看器数据中的 [列表图, 灯箱原图]，原图与列表图相同时为 null"""
+    mode = get_image_mode(settings)
+    thumbnail = thumbnails.get(clean_url)
+    original = images.get(clean_url)
+
+    if mode == IMAGE_MODE_BASE64:
+        # 保存原图时不会有缩略图，每张图片只内嵌一份数据
+        if thumbnail:
+            return [blocks.add(('thumb', clean_url), thumbnail), clean_url]
+        if isinstance(original, ImagePayload):
+            return [blocks.add(('full', clean_url), original), None]
+        return None
+
+    if mode == IMAGE_MODE_ASSETS:
+        if thumbnail:
+            return [thumbnail, original or clean_url]
+        if original:
+            return [original, None]
+        return None
+
+    grid_url = grid_image_url(clean_url, settings)
+    return [grid_url, clean_url] if grid_url else [clean_url, None]
+
+
+def viewer_record(article, images, thumbnails, settings, blocks):
+    """查看器中一篇文章的紧凑数据: [时间, 正文HTML, 歌曲, 图片列表]"""
+    refs = []
+    for image_url in article.get('images') or []:
+        clean_url = clean_image_url(image_url)
+        if not clean_url:
+            continue
+        ref = image_refs(clean_url, images, thumbnails, settings, blocks)
+        if ref:
+            refs.append(ref)
+    return [article.get('time', ''), article.get('text', ''), article.get('song'), refs]
+
+
+async def write_viewer_document(out, articles, settings, ui, assets=None):
+    """将文章写成单文件查看器
+
+    每批文章的数据写成一个 JSON 块，图片写成 base64 数据块，导出时内存中最多保留一批图片
+    """
+    out.write('<!DOCTYPE html>\n<html lang="zh-CN">\n<head>\n')
+    out.write('<meta charset="UTF-8">\n')
+    out.write(f'<title>{DEFAULT_TITLE}</title>\n')
+    out.write('<style>\n')
+    write_html_styles(out, settings)
+    out.write(VIEWER_STYLES)
+    out.write('</style>\n')
+    out.write('</head>\n<body>\n')
+    write_lightbox(out)
+    out.write(
+        '<div class="toolbar"><span id="nb-count">正在加载...</span>'
+        '<select id="nb-months-select"><option value="">跳转到月份</option></select></div>\n'
+    )
+    out.write('<div id="nb-articles"></div>\n')
+
+    blocks = PayloadBlocks(out)
+    months = {}
+    month = None
+    position = 0
+    async with ImageExportSession(settings, ui, count_images(articles), assets) as image_session:
+        for batch in iter_article_batches(articles, image_session.window):
+            images, thumbnails = await image_session.prepare(batch)
+            records = []
+            for article in batch:
+                records.append(viewer_record(article, images, thumbnails, settings, blocks))
+                month = article_month(article.get('time'), newer_month=month)
+                months.setdefault(month, position)
+                position += 1
+            write_json_script(out, records, class_name='nb-batch')
+
+    write_json_script(out, months, element_id='nb-months')
+    out.write(f'<script>{VIEWER_SCRIPT}</script>\n')
+    write_html_footer(out)
@@ -0,0 +1,112 @@
+"""
+比较文章字典和 Article 对象的内存占用
+
+    python scripts/bench_article_memory.py [文章数]
+
+生成与真实数据形状相近的动态（约三分之一带歌曲，平均两张图片），
+分别用 tracemalloc 统计字典和 Article 两种表示保存全部文章时的内存
+"""
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from netease.models import Article  # noqa: E402
+
+IMAGE_URL = "https://p1.music.126.net/{a}==/{b}.jpg"
+
+
+def make_raw_articles(count, seed=0):
+    """生成测试用的原始字段
+
+    时间、正文和歌曲字符串由两种表示共用；图片URL在构建时才生成，
+    与爬取时每篇文章各自解析出新的URL字符串一致
+    """
+    rng = random.Random(seed)
+    raw = []
+    for i in range(count):
+        song = None
+        if i % 3 == 0:
+            song = (
+                f"歌曲{i}",
+                f"https://music.163.com/song?id={100000 + i}",
+                f"歌手{i % 500}",
+                f"https://music.163.com/artist?id={i % 500}",
+            )
+        images = [
+            (rng.getrandbits(64), rng.getrandbits(60))
+            for _ in range(rng.choice((0, 0, 1, 2, 3, 4, 6)))
+        ]
+        text = "今天的歌很好听<br>" * rng.randint(1, 5)
+        raw.append((str(2000000000 + i), f"2023年{i % 12 + 1}月{i % 28 + 1}日 12:00", text, song, images))
+    return raw
+
+
+def build_dicts(raw):
+    articles = []
+    for article_id, time_text, text, song, images in raw:
+        articles.append(
+            {
+                "id": article_id,
+                "time": time_text,
+                "text": text,
+                "song": dict(zip(("title", "url", "artist", "artistUrl"), song)) if song else None,
+                "images": [IMAGE_URL.format(a=a, b=b) for a, b in images],
+            }
+        )
+    return articles
+
+
+def build_articles(raw):
+    articles = []
+    for article_id, time_text, text, song, images in raw:
+        articles.append(
+            Article(
+                article_id,
+                time_text,
+                text,
+                dict(zip(("title", "url", "artist", "artistUrl"), song)) if song else None,
+                [IMAGE_URL.format(a=a, b=b) for a, b in images],
+            )
+        )
+    return articles
+
+
+def measure(build, raw):
+    """返回 (保留的字节数, 峰值字节数, 耗时秒数, 对象)"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build(raw)
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, peak, elapsed, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    raw = make_raw_articles(count)
+    print(f"文章数: {count}")
+
+    results = {}
+    for name, build in (("dict", build_dicts), ("Article", build_articles)):
+        current, peak, elapsed, articles = measure(build, raw)
+        results[name] = current
+        print(
+            f"{name:>8}: 保留 {current / 1024 / 1024:8.1f}MB, "
+            f"峰值 {peak / 1024 / 1024:8.1f}MB, "
+            f"每篇 {current / count:6.0f}B, 构建 {elapsed:.2f}s"
+        )
+        del articles
+
+    saved = 1 - results["Article"] / results["dict"]
+    print(f"Article 比字典节省 {saved:.0%}（不含两者共用的正文、时间和歌曲字符串）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+比较完整 Chromium 和 chromium-headless-shell 的启动耗时与内存占用
+
+    python scripts/bench_browser_launch.py [启动次数] [每次打开的上下文数]
+
+两种浏览器都按爬虫的方式启动（NetEaseCrawler.launch_browser / open_session），
+每次启动后打开若干上下文并载入一个与动态列表相近的本地页面，统计：
+启动耗时、第一个上下文就绪的耗时、浏览器进程树的内存（Linux 上为PSS，
+其他平台需要安装 psutil，统计的是RSS，多进程共享的内存会重复计算）
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from netease.browser_manager import CHROMIUM, HEADLESS_SHELL, BrowserManager  # noqa: E402
+from netease.crawler import NetEaseCrawler  # noqa: E402
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+PAGE_HTML = "<html><body>{}</body></html>".format(
+    "".join(
+        f'<div class="item"><p>动态 {i} 今天的歌很好听</p><img src="data:,"></div>'
+        for i in range(2000)
+    )
+)
+
+
+def _proc_children():
+    """Linux 上读取 /proc，返回 {父进程: [子进程]}"""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                # 进程名可能包含空格，ppid 在最后一个右括号之后
+                fields = f.read().rsplit(b")", 1)[1].split()
+            children.setdefault(int(fields[1]), []).append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+    return children
+
+
+def _proc_memory(pid):
+    """Linux 上进程的PSS（字节），读不到 smaps_rollup 时退回RSS"""
+    for path, key in ((f"/proc/{pid}/smaps_rollup", "Pss:"), (f"/proc/{pid}/status", "VmRSS:")):
+        try:
+            with open(path, "r") as f:
+                for line in f:
+                    if line.startswith(key):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            continue
+    return 0
+
+
+def browser_memory(executable):
+    """本进程启动的、可执行文件为 executable 的所有进程的内存之和，无法统计时返回None"""
+    executable = os.path.realpath(executable)
+    if not os.path.isdir("/proc"):
+        if psutil is None:
+            return None
+        total = 0
+        for child in psutil.Process().children(recursive=True):
+            try:
+                if os.path.realpath(child.exe()) == executable:
+                    total += child.memory_info().rss
+            except (psutil.Error, OSError):
+                continue
+        return total
+
+    children = _proc_children()
+    total = 0
+    stack = [os.getpid()]
+    while stack:
+        for pid in children.get(stack.pop(), []):
+            stack.append(pid)
+            try:
+                if os.path.realpath(f"/proc/{pid}/exe") == executable:
+                    total += _proc_memory(pid)
+            except OSError:
+                continue
+    return total
+
+
+async def bench_once(manager, use_shell, contexts):
+    crawler = NetEaseCrawler(browser_manager=manager)
+    crawler.prefer_headless_shell = use_shell
+    executable = manager.get_executable_path(use_shell)
+
+    start = time.perf_counter()
+    await crawler.launch_browser()
+    launched = time.perf_counter()
+    sessions = []
+    try:
+        base_memory = browser_memory(executable)
+        for _ in range(contexts):
+            session = await crawler.open_session()
+            await session.page.set_content(PAGE_HTML)
+            sessions.append(session)
+            if len(sessions) == 1:
+                first_page = time.perf_counter()
+        await asyncio.sleep(0.5)
+        memory = browser_memory(executable)
+    finally:
+        for session in sessions:
+            await session.close()
+        await crawler.close()
+
+    return {
+        "launch": launched - start,
+        "first_page": first_page - start,
+        "base_memory": base_memory,
+        "memory": memory,
+    }
+
+
+def _format_memory(values):
+    if any(value is None for value in values):
+        return "无法统计"
+    return f"{statistics.median(values) / 1024 / 1024:.0f}MB"
+
+
+async def run(runs, contexts):
+    manager = BrowserManager()
+    candidates = [("完整 Chromium", CHROMIUM, False), ("headless shell", HEADLESS_SHELL, True)]
+
+    for label, flavor, use_shell in candidates:
+        executable = manager.find_browser(flavor)
+        if not executable:
+            print(f"{label}: 未安装，跳过")
+            continue
+
+        results = [await bench_once(manager, use_shell, contexts) for _ in range(runs)]
+        launch = statistics.median(r["launch"] for r in results)
+        first_page = statistics.median(r["first_page"] for r in results)
+        base_memory = [r["base_memory"] for r in results]
+        memory = [r["memory"] for r in results]
+        if all(value is not None for value in base_memory + memory):
+            per_context = statistics.median(
+                (r["memory"] - r["base_memory"]) / contexts for r in results
+            )
+            per_context_text = f"{per_context / 1024 / 1024:.0f}MB"
+        else:
+            per_context_text = "无法统计"
+
+        print(f"{label}: {executable}")
+        print(
+            f"  启动 {launch * 1000:.0f}ms，首个页面就绪 {first_page * 1000:.0f}ms"
+            f" (中位数，{runs} 次)"
+        )
+        print(
+            f"  内存: 仅浏览器 {_format_memory(base_memory)}，"
+            f"{contexts} 个上下文 {_format_memory(memory)}，每个上下文约 {per_context_text}"
+        )
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    contexts = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    asyncio.run(run(runs, contexts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+用本地HTTP服务器检查浏览器安装模块
+
+    python scripts/check_browser_installer.py
+
+生成一个与 Chromium 压缩包结构相近的测试压缩包（带执行权限的可执行文件、符号链接和
+一些随机内容的大文件），由支持 Range 的本地服务器提供下载，依次检查：
+分块下载与边下边解压、中途断开后继续下载、sha256 校验失败、文件边界靠近块边界、
+服务器不支持 Range
+"""
+import asyncio
+import hashlib
+import os
+import random
+import stat
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from netease.browser_installer import DownloadError, install_archive  # noqa: E402
+
+BLOCK_SIZE = 256 * 1024
+# 不是读缓冲大小整数倍的块大小：块边界在 256KB 之后100字节，读缓冲从 256KB 开始填充时会越过块边界
+UNALIGNED_BLOCK_SIZE = BLOCK_SIZE + 100
+
+
+def make_fixture(path, seed=0):
+    """生成测试压缩包，返回其中的文件内容"""
+    rng = random.Random(seed)
+    files = {
+        "chrome-linux/chrome": b"#!/bin/sh\necho chrome\n",
+        "chrome-linux/locales/zh-CN.pak": rng.randbytes(300 * 1024),
+        "chrome-linux/resources.pak": rng.randbytes(2 * 1024 * 1024),
+        "chrome-linux/libEGL.so": rng.randbytes(700 * 1024),
+    }
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in files.items():
+            info = zipfile.ZipInfo(name)
+            info.create_system = 3
+            mode = 0o755 if name.endswith("chrome") else 0o644
+            info.external_attr = (stat.S_IFREG | mode) << 16
+            # 随机内容压缩后大小基本不变，使文件跨越多个块
+            info.compress_type = zipfile.ZIP_STORED if name.endswith(".pak") else zipfile.ZIP_DEFLATED
+            archive.writestr(info, data)
+
+        link = zipfile.ZipInfo("chrome-linux/chrome-wrapper")
+        link.create_system = 3
+        link.external_attr = (stat.S_IFLNK | 0o777) << 16
+        archive.writestr(link, "chrome")
+    return files
+
+
+def make_boundary_fixture(path, block_size):
+    """生成一个小文件紧挨着块边界（8KB以内）的测试压缩包
+
+    读取小文件时读缓冲会越过块边界，读到第二块中尚未下载的内容；
+    用于检查第二块到达后解压下一个文件时不会使用过期的缓冲
+    """
+    rng = random.Random(1)
+    names = ("chrome-linux/resources.pak", "chrome-linux/small.pak", "chrome-linux/large.pak")
+    # 不压缩，本地头为30字节加文件名；小文件从块边界前1500字节开始，到块边界前50字节结束，
+    # 读到它末尾时从 256KB 处开始的读缓冲会越过块边界
+    small_offset = block_size - 1500
+    files = {
+        names[0]: rng.randbytes(small_offset - 30 - len(names[0])),
+        names[1]: rng.randbytes(1500 - 30 - len(names[1]) - 50),
+        names[2]: rng.randbytes(2 * block_size),
+        "chrome-linux/chrome": b"#!/bin/sh\necho chrome\n",
+    }
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as archive:
+        for name, data in files.items():
+            info = zipfile.ZipInfo(name)
+            info.create_system = 3
+            mode = 0o755 if name.endswith("chrome") else 0o644
+            info.external_attr = (stat.S_IFREG | mode) << 16
+            archive.writestr(info, data)
+    with zipfile.ZipFile(path) as archive:
+        assert archive.getinfo(names[1]).header_offset == small_offset
+        assert archive.getinfo(names[2]).header_offset < block_size
+    return files
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """提供测试压缩包，支持单个 Range；可设置在发送若干字节后断开"""
+
+    data = b""
+    ranges = True
+    # 剩余可成功响应的请求数，用完后响应中途断开，None 表示不限
+    budget = None
+    requests = 0
+    # 每个请求发送前等待的秒数，使后面的块晚于解压到达
+    delay = 0
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        cls = type(self)
+        cls.requests += 1
+        if cls.delay:
+            time.sleep(cls.delay)
+        size = len(cls.data)
+        header = self.headers.get("Range")
+
+        if cls.ranges and header and header.startswith("bytes="):
+            start, _, end = header[6:].partition("-")
+            start = int(start)
+            end = min(int(end) if end else size - 1, size - 1)
+            body = cls.data[start:end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        else:
+            body = cls.data
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", '"fixture"')
+        self.end_headers()
+
+        if cls.budget is not None:
+            if cls.budget <= 0:
+                # 只发送一半后断开连接
+                self.wfile.write(body[: len(body) // 2])
+                self.close_connection = True
+                return
+            cls.budget -= 1
+        self.wfile.write(body)
+
+
+class FixtureServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # 断开连接是测试有意造成的
+        pass
+
+
+def serve():
+    server = FixtureServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/chromium-linux.zip"
+
+
+def check_extracted(dest_dir, files, symlink=True):
+    for name, data in files.items():
+        path = Path(dest_dir) / name
+        assert path.read_bytes() == data, f"内容不符: {name}"
+    chrome = Path(dest_dir) / "chrome-linux" / "chrome"
+    if os.name == "posix":
+        assert os.access(chrome, os.X_OK), "可执行文件缺少执行权限"
+        wrapper = Path(dest_dir) / "chrome-linux" / "chrome-wrapper"
+        assert not symlink or wrapper.is_symlink() and os.readlink(wrapper) == "chrome", "符号链接未还原"
+
+
+async def run_checks(work_dir):
+    fixture = work_dir / "fixture.zip"
+    files = make_fixture(fixture)
+    FixtureHandler.data = fixture.read_bytes()
+    sha256 = hashlib.sha256(FixtureHandler.data).hexdigest()
+    settings = {"blockSize": BLOCK_SIZE, "connections": 4, "retries": 1}
+    server, url = serve()
+
+    try:
+        # 分块下载并边下边解压
+        archive_path = work_dir / "a" / "chromium.zip"
+        result = await install_archive(url, archive_path, work_dir / "a" / "temp", settings, sha256)
+        assert result == sha256
+        check_extracted(work_dir / "a" / "temp", files)
+        assert not archive_path.with_name("chromium.zip.part").exists()
+        print(f"分块下载: 通过 ({FixtureHandler.requests} 个请求)")
+
+        # 中途断开后继续下载：前几个块成功，之后的请求断开
+        archive_path = work_dir / "b" / "chromium.zip"
+        FixtureHandler.requests = 0
+        FixtureHandler.budget = 4
+        try:
+            await install_archive(url, archive_path, work_dir / "b" / "temp", settings, sha256)
+            raise AssertionError("应在断开时失败")
+        except DownloadError:
+            pass
+        first_requests = FixtureHandler.requests
+        FixtureHandler.budget = None
+        FixtureHandler.requests = 0
+        await install_archive(url, archive_path, work_dir / "b" / "temp", settings, sha256)
+        check_extracted(work_dir / "b" / "temp", files)
+        total_blocks = -(-len(FixtureHandler.data) // BLOCK_SIZE)
+        assert FixtureHandler.requests < total_blocks + 1, "继续下载时重新下载了已完成的块"
+        print(
+            f"断点续传: 通过 (第一次 {first_requests} 个请求，"
+            f"继续时 {FixtureHandler.requests} 个请求，共 {total_blocks} 块)"
+        )
+
+        # 校验失败时丢弃下载结果
+        archive_path = work_dir / "c" / "chromium.zip"
+        try:
+            await install_archive(url, archive_path, work_dir / "c" / "temp", settings, "0" * 64)
+            raise AssertionError("应在校验失败时报错")
+        except DownloadError:
+            pass
+        assert not archive_path.with_name("chromium.zip.part").exists()
+        assert not (work_dir / "c" / "temp").exists()
+        print("sha256 校验: 通过")
+
+        # 文件边界靠近块边界，单个连接按顺序下载，第二块晚于第一个文件的解压到达
+        boundary = work_dir / "boundary.zip"
+        boundary_files = make_boundary_fixture(boundary, UNALIGNED_BLOCK_SIZE)
+        FixtureHandler.data = boundary.read_bytes()
+        FixtureHandler.delay = 0.3
+        archive_path = work_dir / "e" / "chromium.zip"
+        await install_archive(
+            url, archive_path, work_dir / "e" / "temp", {**settings, "blockSize": UNALIGNED_BLOCK_SIZE, "connections": 1},
+            hashlib.sha256(FixtureHandler.data).hexdigest(),
+        )
+        check_extracted(work_dir / "e" / "temp", boundary_files, symlink=False)
+        FixtureHandler.data = fixture.read_bytes()
+        FixtureHandler.delay = 0
+        print("文件边界靠近块边界: 通过")
+
+        # 服务器不支持 Range
+        FixtureHandler.ranges = False
+        archive_path = work_dir / "d" / "chromium.zip"
+        await install_archive(url, archive_path, work_dir / "d" / "temp", settings, sha256)
+        check_extracted(work_dir / "d" / "temp", files)
+        print("不支持Range的服务器: 通过")
+    finally:
+        server.shutdown()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as work_dir:
+        asyncio.run(run_checks(Path(work_dir)))
+
+
+if __name__ == "__main__":
+    main()